@@ -6,11 +6,16 @@ soft killswitch, AI cleanup, JD scoring, and link validation.
 
 from typing import TypedDict, List, Annotated
 from langgraph.graph import StateGraph, END
-from langchain_groq import ChatGroq
 import os
 import json
 import logging
 from datetime import datetime
+from utils.json_extract import try_extract_json
+from utils.structured_llm import invoke_structured, NegativeKeywords, CleanupDecisions, decisions_cover
+from utils.llm_cascade import cascade_items, cascade_structured, cascade_invoke, low_confidence
+from utils.llm_batcher import BATCHER_ENABLED, get_batcher, wait_all, context_key
+from utils.llm_client import get_chat_model, Priority
+from utils.tracing import traced_node, annotate
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +32,7 @@ class JobHuntState(TypedDict):
     session_id: str
     resume_text: str
     log_callback: object  # Function to publish logs to RabbitMQ
+    depth: str  # "full" / "reduced" / "minimal" (daily usage budget, see utils/usage_tracker.py)
     
     # NEW: Optimization fields
     user_skills: List[str]  # Skills from partial_profile
@@ -50,12 +56,38 @@ class JobHuntState(TypedDict):
     error: str
 
 
+# Per-depth limits; hunts are downgraded when the user's daily usage budget runs low
+DEPTH_LIMITS = {
+    "full": {"max_keywords": None, "ai_cleanup_jobs": 80, "scored_jobs": 30, "llm_cleanup": True, "llm_scoring": True},
+    "reduced": {"max_keywords": 3, "ai_cleanup_jobs": 40, "scored_jobs": 15, "llm_cleanup": True, "llm_scoring": True},
+    "minimal": {"max_keywords": 2, "ai_cleanup_jobs": 0, "scored_jobs": 15, "llm_cleanup": False, "llm_scoring": False},
+}
+
+
+def _depth_limits(state: JobHuntState) -> dict:
+    return DEPTH_LIMITS.get(state.get("depth") or "full", DEPTH_LIMITS["full"])
 
 
 # ============================================================
 # NODE FUNCTIONS
 # ============================================================
 
+def _parse_synonyms(content: str) -> dict:
+    """Validate the synonyms response: {term: [synonym, ...]}."""
+    synonyms = try_extract_json(content, expect=dict)
+    if not synonyms or not all(isinstance(v, list) for v in synonyms.values()):
+        raise ValueError("Expected a JSON object of synonym lists")
+    return synonyms
+
+
+def _parse_keyword_list(content: str) -> list:
+    """Validate the broad keywords response: 3-12 non-empty strings."""
+    keywords = try_extract_json(content, expect=list)
+    if not keywords or not all(isinstance(k, str) and k.strip() for k in keywords) or not 3 <= len(keywords) <= 12:
+        raise ValueError("Expected a JSON array of 3-12 keywords")
+    return keywords
+
+
 def fetch_user_context_node(state: JobHuntState) -> dict:
     """
     Node 0: Fetch user skills and generate AI-powered filtering keywords.
@@ -91,6 +123,7 @@ def fetch_user_context_node(state: JobHuntState) -> dict:
         
         print(f"[NODE 0] 🔍 Checking cache for role='{role}', resume_hash={resume_hash[:8]}...")
         cached_config = cache.get_config(user_id, role, resume_hash)
+        annotate(cache_hit=bool(cached_config))
         
         if cached_config:
             # Cache hit! Return cached data
@@ -133,11 +166,7 @@ def fetch_user_context_node(state: JobHuntState) -> dict:
     # ===== END CACHE CHECK =====
     
     # 2. Generate negative keywords using AI (cache miss)
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",  # Production-ready, high rate limits
-        temperature=0.1,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
+    llm = get_chat_model("llama-3.3-70b-versatile", temperature=0.1, priority=Priority.HUNT)
     
     # ===== PHASE 1: ENHANCED RESUME FINGERPRINT EXTRACTION =====
     resume_fingerprint = {}
@@ -227,10 +256,8 @@ Return ONLY this JSON (no markdown, no explanation):
             content = response.content.strip()
             
             # Extract JSON
-            import re
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                resume_fingerprint = json.loads(json_match.group(0))
+            resume_fingerprint = try_extract_json(content, expect=dict)
+            if resume_fingerprint is not None:
                 
                 # Validate and fill missing required fields
                 required_defaults = {
@@ -315,45 +342,19 @@ No text before or after the JSON.
 """
     
     try:
-        response = llm.invoke(neg_prompt)
-        content = response.content.strip()
-        
-        import re
-        json_match = re.search(r'\{.*?\}', content, re.DOTALL)
-        if json_match:
-            result = json.loads(json_match.group(0))
-            negative_keywords = result.get("negative_keywords", [])
-            print(f"[NODE 0] Generated {len(negative_keywords)} negative keywords")
-        else:
-            print(f"[NODE 0] No JSON found in response: {content[:200]}")
-            raise ValueError("No JSON in response")
+        # JSON mode + schema validation on 8B; escalates to 70B only if still invalid
+        result = cascade_structured("negative_keywords", neg_prompt, NegativeKeywords)
+        negative_keywords = [k.lower().strip() for k in result.negative_keywords if k.strip()]
+        print(f"[NODE 0] Generated {len(negative_keywords)} negative keywords")
     except Exception as e:
         print(f"[NODE 0] Error generating negative keywords: {e}")
-        
-        # Retry with simpler prompt
-        try:
-            simple_prompt = f"""List 25 job types to avoid for: {', '.join(job_titles) if job_titles else 'Software Developer'}
-
-Return ONLY this JSON: {{"negative_keywords": ["sales", "marketing", ...]}}"""
-            
-            response = llm.invoke(simple_prompt)
-            content = response.content.strip()
-            json_match = re.search(r'\{.*?\}', content, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group(0))
-                negative_keywords = result.get("negative_keywords", [])
-                print(f"[NODE 0] Retry successful: {len(negative_keywords)} negative keywords")
-            else:
-                raise ValueError("Retry failed")
-        except Exception as retry_error:
-            print(f"[NODE 0] Retry also failed: {retry_error}")
-            # Fallback to default keywords
-            negative_keywords = [
-                "sales", "marketing", "telecaller", "bpo", "call center",
-                "customer support", "hr", "recruiter", "account manager",
-                "business development", "insurance", "loan", "credit"
-            ]
-            print(f"[NODE 0] Using default negative keywords")
+        # Fallback to default keywords
+        negative_keywords = [
+            "sales", "marketing", "telecaller", "bpo", "call center",
+            "customer support", "hr", "recruiter", "account manager",
+            "business development", "insurance", "loan", "credit"
+        ]
+        print(f"[NODE 0] Using default negative keywords")
     
     # 3. Generate positive synonyms using AI
     syn_prompt = f"""Generate synonyms for job search matching.
@@ -374,16 +375,8 @@ Use lowercase keys with underscores. No text before or after JSON.
 """
     
     try:
-        response = llm.invoke(syn_prompt)
-        content = response.content.strip()
-        
-        json_match = re.search(r'\{.*?\}', content, re.DOTALL)
-        if json_match:
-            positive_synonyms = json.loads(json_match.group(0))
-            print(f"[NODE 0] Generated synonyms for {len(positive_synonyms)} terms")
-        else:
-            positive_synonyms = {}
-            print(f"[NODE 0] No synonyms generated")
+        positive_synonyms = cascade_invoke("synonyms", syn_prompt, _parse_synonyms)
+        print(f"[NODE 0] Generated synonyms for {len(positive_synonyms)} terms")
     except Exception as e:
         print(f"[NODE 0] Error generating synonyms: {e}")
         positive_synonyms = {}
@@ -546,12 +539,6 @@ def generate_keywords_node(state: JobHuntState) -> dict:
         if log:
             log("info", "🧠 Generating keywords for custom roles...")
         
-        llm = ChatGroq(
-            model="llama-3.3-70b-versatile",  # Best for reasoning tasks
-            temperature=0.1,
-            api_key=os.getenv("GROQ_API_KEY")
-        )
-        
         prompt = f"""Generate optimal job search keywords by combining the candidate's expertise with their target roles.
 
 **Candidate's Expertise (Resume):**
@@ -592,22 +579,12 @@ Return ONLY a JSON array: ["keyword1", "keyword2", ...]
         
         try:
             print(f"[NODE 1] Calling AI to generate broad keywords...")
-            response = llm.invoke(prompt)
-            content = response.content.strip()
-            print(f"[NODE 1] AI response: {content}")
-            
-            # Extract JSON array
-            if content.startswith("["):
-                ai_keywords = json.loads(content)
-            else:
-                # Try to find JSON in response
-                import re
-                match = re.search(r'\[.*?\]', content, re.DOTALL)
-                if match:
-                    ai_keywords = json.loads(match.group(0))
-                else:
-                    # Fallback: use first role
-                    ai_keywords = [roles_to_process[0]]
+            try:
+                # 8B first; escalates to 70B if the array is missing or malformed
+                ai_keywords = cascade_invoke("broad_keywords", prompt, _parse_keyword_list)
+            except ValueError:
+                # Fallback: use first role
+                ai_keywords = [roles_to_process[0]]
             
             final_keywords.update(ai_keywords)
             print(f"[NODE 1] Added AI keywords: {ai_keywords}")
@@ -644,6 +621,11 @@ def build_queries_node(state: JobHuntState) -> dict:
     keywords = state["broad_keywords"]
     criteria = state["criteria"]
     
+    max_keywords = _depth_limits(state)["max_keywords"]
+    if max_keywords and len(keywords) > max_keywords:
+        print(f"[NODE 2] Depth {state.get('depth')}: using {max_keywords}/{len(keywords)} keywords")
+        keywords = keywords[:max_keywords]
+    
     # Get locations (only actual cities, not "remote")
     locations = criteria.get("locations", [])
     if not locations:
@@ -688,43 +670,17 @@ def build_queries_node(state: JobHuntState) -> dict:
     return {"adzuna_queries": queries}
 
 
-def fetch_adzuna_node(state: JobHuntState) -> dict:
+def dedupe_jobs(jobs: List[dict]) -> List[dict]:
     """
-    Node 3: Fetch jobs from Adzuna with rate limit handling.
-    Processes queries in batches to avoid 429 errors.
+    Deduplicate fetched jobs: title+company FIRST, then redirect_url, then id.
+    Keeps the first occurrence of each job (used by Node 3).
     """
-    print(f"\n[NODE 3] fetch_adzuna_node - START")
-    log = state.get("log_callback")
-    if log:
-        log("info", "📡 Fetching jobs from Adzuna (async)...")
-    
-    from utils.async_adzuna import fetch_jobs_async
-    import time
-    
-    queries = state["adzuna_queries"]
-    print(f"[NODE 3] Number of queries: {len(queries)}")
-    print(f"[NODE 3] Using async fetching with conservative rate limiting...")
-    print(f"[NODE 3] Rate limit: 25 req/min | Strategy: 3 concurrent max, 2.5s pacing")
-    
-    # Start timer
-    start_time = time.time()
-    
-    # Fetch all jobs asynchronously
-    all_jobs = fetch_jobs_async(queries)
-    
-    # Calculate elapsed time
-    elapsed = time.time() - start_time
-    print(f"[NODE 3] ✅ Fetched {len(all_jobs)} jobs in {elapsed:.1f}s")
-    if log:
-        log("info", f"✅ Fetched {len(all_jobs)} jobs in {elapsed:.1f}s")
-    
-    # Improved deduplication: Check title+company FIRST, then URL/ID
     seen_combos = set()
     seen_urls = set()
     seen_ids = set()
     unique_jobs = []
     
-    for job in all_jobs:
+    for job in jobs:
         # FIRST: Check title + company combination (most reliable)
         title = job.get("title", "").lower().strip()
         company = job.get("company", {})
@@ -759,6 +715,41 @@ def fetch_adzuna_node(state: JobHuntState) -> dict:
         
         unique_jobs.append(job)
     
+    return unique_jobs
+
+
+def fetch_adzuna_node(state: JobHuntState) -> dict:
+    """
+    Node 3: Fetch jobs from Adzuna with rate limit handling.
+    Processes queries in batches to avoid 429 errors.
+    """
+    print(f"\n[NODE 3] fetch_adzuna_node - START")
+    log = state.get("log_callback")
+    if log:
+        log("info", "📡 Fetching jobs from Adzuna (async)...")
+    
+    from utils.async_adzuna import fetch_jobs_async
+    import time
+    
+    queries = state["adzuna_queries"]
+    print(f"[NODE 3] Number of queries: {len(queries)}")
+    print(f"[NODE 3] Using async fetching with conservative rate limiting...")
+    print(f"[NODE 3] Rate limit: 25 req/min | Strategy: 3 concurrent max, 2.5s pacing")
+    
+    # Start timer
+    start_time = time.time()
+    
+    # Fetch all jobs asynchronously
+    all_jobs = fetch_jobs_async(queries)
+    
+    # Calculate elapsed time
+    elapsed = time.time() - start_time
+    print(f"[NODE 3] ✅ Fetched {len(all_jobs)} jobs in {elapsed:.1f}s")
+    if log:
+        log("info", f"✅ Fetched {len(all_jobs)} jobs in {elapsed:.1f}s")
+    
+    unique_jobs = dedupe_jobs(all_jobs)
+    
     print(f"[NODE 3] Total jobs fetched: {len(all_jobs)}")
     print(f"[NODE 3] Total unique jobs after deduplication: {len(unique_jobs)}")
     if log:
@@ -856,10 +847,15 @@ def relevance_ranker_node(state: JobHuntState) -> dict:
     user_yoe = fingerprint.get("yoe", 0)
     seniority_level = fingerprint.get("seniority_level", "Mid-Level")
     
-    print(f"[NODE 4.5] Scoring {len(jobs)} jobs using fingerprint")
-    print(f"[NODE 4.5] Expert skills: {expert_skills[:5]}")  # Show first 5
-    print(f"[NODE 4.5] Poison keywords: {poison_keywords[:5]}")  # Show first 5
-    print(f"[NODE 4.5] User YoE: {user_yoe}, Seniority: {seniority_level}")
+    logger.info(
+        "relevance_ranker: scoring %d jobs", len(jobs),
+        extra={
+            "expert_skills": expert_skills[:5],
+            "poison_keywords": poison_keywords[:5],
+            "yoe": user_yoe,
+            "seniority": seniority_level,
+        }
+    )
     
     import re
     from datetime import datetime
@@ -920,7 +916,9 @@ def relevance_ranker_node(state: JobHuntState) -> dict:
                 if count >= 2:
                     score -= 60  # Increased from 50
                     poison_detected = True
-                    print(f"[NODE 4.5] ⚠️ Poison detected in '{title[:50]}': {poison} ({count}x)")
+                    logger.debug(
+                        "relevance_ranker: poison %r in %r (%dx)", poison, title[:50], count, extra={"sample": True}
+                    )
                     break
         
         # ===== 4. SENIORITY ALIGNMENT (-50 to +15 points) =====
@@ -937,7 +935,10 @@ def relevance_ranker_node(state: JobHuntState) -> dict:
             elif delta < -1:
                 score -= abs(delta) * 25  # Underqualified (CRITICAL, increased from 20)
                 if abs(delta) >= 2:  # Only log significant mismatches
-                    print(f"[NODE 4.5] ⚠️ YoE mismatch in '{title[:50]}': needs {required_yoe}y, user has {user_yoe}y")
+                    logger.debug(
+                        "relevance_ranker: YoE mismatch in %r: needs %sy, user has %sy",
+                        title[:50], required_yoe, user_yoe, extra={"sample": True}
+                    )
         
         # ===== 5. FRESHNESS BOOST (+15 points) =====
         try:
@@ -957,12 +958,11 @@ def relevance_ranker_node(state: JobHuntState) -> dict:
     jobs.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
     
     # ===== DETAILED LOGGING: TOP 20 SCORES =====
-    print(f"\n[NODE 4.5] 📊 Top 20 Job Scores:")
-    for idx, job in enumerate(jobs[:20], 1):
-        title = job.get("title", "Unknown")[:60]
-        score = job.get("relevance_score", 0)
-        print(f"  {idx:2d}. {title:60s} (Score: {score:3d})")
-    print()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "relevance_ranker: top 20 scores",
+            extra={"top": [(job.get("title", "Unknown")[:60], job.get("relevance_score", 0)) for job in jobs[:20]]}
+        )
     
     # ===== TIERED FILTERING OPTIMIZATION =====
     # 1. Discard jobs with score < 20 (very poor matches)
@@ -970,7 +970,7 @@ def relevance_ranker_node(state: JobHuntState) -> dict:
     discarded_count = len(jobs) - len(jobs_above_threshold)
     
     if discarded_count > 0:
-        print(f"[NODE 4.5] ❌ Discarded {discarded_count} jobs with score < 0")
+        logger.info("relevance_ranker: discarded %d low-scoring jobs", discarded_count)
         if log:
             log("info", f"   Discarded {discarded_count} very low scoring jobs")
     
@@ -981,9 +981,10 @@ def relevance_ranker_node(state: JobHuntState) -> dict:
     if jobs_above_threshold:
         top_score = jobs_above_threshold[0].get("relevance_score", 0)
         avg_score = sum(j.get("relevance_score", 0) for j in jobs_above_threshold) / len(jobs_above_threshold)
-        print(f"[NODE 4.5] Ranked {len(jobs_above_threshold)} jobs (Top: {top_score}, Avg: {avg_score:.1f})")
-        print(f"[NODE 4.5] ✅ Auto-passing top {len(top_5_jobs)} jobs directly to Node 6")
-        print(f"[NODE 4.5] 🤖 Sending {len(remaining_jobs)} middle-scoring jobs to Node 5 for AI review")
+        logger.info(
+            "relevance_ranker: ranked %d jobs (top %s, avg %.1f), auto-passing %d, %d to AI review",
+            len(jobs_above_threshold), top_score, avg_score, len(top_5_jobs), len(remaining_jobs)
+        )
         if log:
             log("info", f"✅ Ranked {len(jobs_above_threshold)} jobs (Top: {top_score}, Avg: {avg_score:.1f})")
             log("info", f"   Auto-passing top {len(top_5_jobs)} jobs, AI reviewing {len(remaining_jobs)} jobs")
@@ -1024,67 +1025,54 @@ def extract_required_yoe_from_desc(desc: str) -> int:
 
 
 
-def ai_cleanup_node(state: JobHuntState) -> dict:
+def _build_cleanup_prompt(entries: list) -> str:
     """
-    Node 5: Use AI to filter out irrelevant jobs.
-    Validates against agent config (jobTitles, locations, salary).
-    """
-    print(f"\n[NODE 5] ai_cleanup_node - START")
-    log = state.get("log_callback")
-    if log:
-        log("info", "🤖 AI filtering irrelevant jobs...")
-    
-    jobs = state["filtered_jobs"]
-    criteria = state["criteria"]
-    
-    if len(jobs) == 0:
-        return {"ai_cleaned_jobs": []}
-    
-    from langchain_groq import ChatGroq
-    import os
-    import json
-    
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",  # More reliable JSON output
-        temperature=0.1,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
-    
-    # Process in batches for speed
-    cleaned = []
-    batch_size = 20  # Increased from 10
-    max_jobs_to_process = min(len(jobs), 80)  # Reduced from 100
-    
-    print(f"[NODE 5] Processing {max_jobs_to_process} jobs in batches of {batch_size}")
-    
-    # Extract agent config criteria
-    job_titles = criteria.get('jobTitles', [])
-    locations = criteria.get('locations', [])
-    salary_range = criteria.get('salaryRange', [])
-    employment_types = criteria.get('employmentTypes', [])
-    
-    for i in range(0, max_jobs_to_process, batch_size):
-        batch = jobs[i:i+batch_size]
-        
-        # Prepare job summaries
-        job_summaries = []
-        for idx, job in enumerate(batch):
-            job_summaries.append({
-                "id": idx,
-                "title": job.get("title"),
-                "company": job.get("company", {}).get("display_name") if isinstance(job.get("company"), dict) else job.get("company"),
-                "location": job.get("location", {}).get("display_name") if isinstance(job.get("location"), dict) else job.get("location"),
-                "salary_min": job.get("salary_min"),
-                "description": job.get("description", "")[:400]
-            })
-        
-        prompt = f"""You are a strict job relevance filter. Review these jobs against the user's search criteria and ONLY keep jobs that match.
+    Build one relevance-filter prompt for (criteria, job) entries.
 
-**User's Search Criteria:**
-- Desired Roles: {', '.join(job_titles) if job_titles else 'Any software role'}
+    Entries may come from several hunts (see utils/llm_batcher.py); each
+    distinct set of criteria is written once and jobs reference it by label.
+    """
+    searches = {}
+    for criteria, _ in entries:
+        searches.setdefault(context_key(criteria), (f"S{len(searches) + 1}", criteria))
+
+    # Prepare job summaries
+    job_summaries = []
+    for idx, (criteria, job) in enumerate(entries):
+        summary = {
+            "id": idx,
+            "title": job.get("title"),
+            "company": job.get("company", {}).get("display_name") if isinstance(job.get("company"), dict) else job.get("company"),
+            "location": job.get("location", {}).get("display_name") if isinstance(job.get("location"), dict) else job.get("location"),
+            "salary_min": job.get("salary_min"),
+            "description": job.get("description", "")[:400]
+        }
+        if len(searches) > 1:
+            summary["search"] = searches[context_key(criteria)][0]
+        job_summaries.append(summary)
+
+    def describe(criteria):
+        # Extract agent config criteria
+        job_titles = criteria.get('jobTitles', [])
+        locations = criteria.get('locations', [])
+        salary_range = criteria.get('salaryRange') or [0, 0]
+        employment_types = criteria.get('employmentTypes', [])
+        return f"""- Desired Roles: {', '.join(job_titles) if job_titles else 'Any software role'}
 - Target Locations: {', '.join(locations) if locations else 'Any location'}
 - Salary Range: {salary_range[0]:,} - {salary_range[1]:,} INR/year (if disclosed)
-- Employment Types: {', '.join(employment_types) if employment_types else 'Any type'}
+- Employment Types: {', '.join(employment_types) if employment_types else 'Any type'}"""
+
+    if len(searches) == 1:
+        criteria_section = f"""**User's Search Criteria:**
+{describe(entries[0][0])}"""
+    else:
+        criteria_section = "**Search Criteria (judge each job ONLY against its \"search\"):**\n" + "\n".join(
+            f"Search {label}:\n{describe(criteria)}" for label, criteria in searches.values()
+        )
+
+    return f"""You are a strict job relevance filter. Review these jobs against the user's search criteria and ONLY keep jobs that match.
+
+{criteria_section}
 
 **Jobs to Review:**
 {json.dumps(job_summaries, indent=2)}
@@ -1104,63 +1092,85 @@ def ai_cleanup_node(state: JobHuntState) -> dict:
    - REJECT if description is clearly for a different domain
 
 **Output Format:**
-Return ONLY a JSON object with IDs of jobs that PASS all criteria.
-{{"relevant_ids": [0, 2, 5]}}
+Return ONLY a JSON object with one decision per job ID, and your confidence (0-1) in it.
+{{"decisions": [{{"id": 0, "keep": true, "confidence": 0.95}}, {{"id": 1, "keep": false, "confidence": 0.6}}]}}
 
 Be VERY strict - when in doubt, REJECT.
 """
-        
-        try:
-            response = llm.invoke(prompt)
-            content = response.content.strip()
-            
-            # Extract JSON with better error handling
-            import re
+
+
+def _run_cleanup(llm, entries: list) -> list:
+    # JSON mode + schema validation; missing/out-of-range IDs are re-asked, not dropped
+    result = invoke_structured(
+        llm, _build_cleanup_prompt(entries), CleanupDecisions,
+        check=decisions_cover(len(entries)),
+        task_name="AI cleanup"
+    )
+    return sorted(result.decisions, key=lambda d: d.id)
+
+
+def _cleanup_entries(entries: list) -> list:
+    """Cascade-judge (criteria, job) entries: 8B first, low-confidence ones re-judged by 70B."""
+    return cascade_items("ai_cleanup", entries, _run_cleanup, lambda d: low_confidence(d.confidence))
+
+
+def ai_cleanup_node(state: JobHuntState) -> dict:
+    """
+    Node 5: Use AI to filter out irrelevant jobs.
+    Validates against agent config (jobTitles, locations, salary).
+    8B model first; only low-confidence decisions go to the 70B model.
+    """
+    print(f"\n[NODE 5] ai_cleanup_node - START")
+    log = state.get("log_callback")
+    if log:
+        log("info", "🤖 AI filtering irrelevant jobs...")
+    
+    jobs = state["filtered_jobs"]
+    criteria = state["criteria"]
+    
+    if len(jobs) == 0:
+        return {"ai_cleaned_jobs": []}
+    
+    # Process in batches for speed
+    cleaned = []
+    batch_size = 20  # Increased from 10
+    limits = _depth_limits(state)
+    max_jobs_to_process = min(len(jobs), limits["ai_cleanup_jobs"])
+    
+    print(f"[NODE 5] Processing {max_jobs_to_process} jobs in batches of {batch_size}")
+    
+    if not limits["llm_cleanup"]:
+        # Over the daily budget: rely on the killswitch + relevance ranker only
+        print(f"[NODE 5] Depth {state.get('depth')}: skipping AI cleanup")
+        cleaned = list(jobs)
+    elif BATCHER_ENABLED:
+        # Shared cross-session batcher: jobs may share a prompt with other hunts
+        batcher = get_batcher(
+            "ai_cleanup", _cleanup_entries, max_items=batch_size,
+            item_text=lambda entry: entry[1].get("description", "")[:400]
+        )
+        results = wait_all(batcher.submit_many([(criteria, job) for job in jobs[:max_jobs_to_process]]))
+        for job, decision in zip(jobs, results):
+            # Keep jobs whose batch failed (safe fallback)
+            if isinstance(decision, Exception) or decision.keep:
+                cleaned.append(job)
+        failed = sum(1 for r in results if isinstance(r, Exception))
+        if failed:
+            print(f"[NODE 5] AI cleanup failed for {failed} jobs, kept them")
+    else:
+        for i in range(0, max_jobs_to_process, batch_size):
+            batch = jobs[i:i+batch_size]
             
-            # Try to find JSON object
-            json_match = re.search(r'\{[^{}]*"relevant_ids"[^{}]*\}', content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                
-                # Clean up common JSON issues
-                json_str = json_str.replace("'", '"')  # Single quotes to double
-                json_str = re.sub(r'(\w+):', r'"\1":', json_str)  # Add quotes to keys
-                json_str = re.sub(r'""(\w+)":', r'"\1":', json_str)  # Fix double quotes
-                
-                try:
-                    result = json.loads(json_str)
-                    relevant_ids = result.get("relevant_ids", [])
+            try:
+                decisions = _cleanup_entries([(criteria, job) for job in batch])
+                kept = [job for job, decision in zip(batch, decisions) if decision.keep]
+                cleaned.extend(kept)
+                print(f"[NODE 5] Batch {i//batch_size + 1}: {len(kept)}/{len(batch)} jobs kept")
                     
-                    # Add relevant jobs to cleaned list
-                    for job_id in relevant_ids:
-                        if 0 <= job_id < len(batch):
-                            cleaned.append(batch[job_id])
-                    
-                    print(f"[NODE 5] Batch {i//batch_size + 1}: {len(relevant_ids)}/{len(batch)} jobs kept")
-                except json.JSONDecodeError as je:
-                    print(f"[NODE 5] JSON parse error: {je}, keeping all jobs in batch")
-                    cleaned.extend(batch)
-            else:
-                # If no JSON found, try to extract just the array
-                array_match = re.search(r'\[[\d,\s]+\]', content)
-                if array_match:
-                    try:
-                        relevant_ids = json.loads(array_match.group(0))
-                        for job_id in relevant_ids:
-                            if 0 <= job_id < len(batch):
-                                cleaned.append(batch[job_id])
-                        print(f"[NODE 5] Batch {i//batch_size + 1}: {len(relevant_ids)}/{len(batch)} jobs kept")
-                    except:
-                        cleaned.extend(batch)
-                else:
-                    # If parsing fails, keep all (safe fallback)
-                    cleaned.extend(batch)
-                    print(f"[NODE 5] Batch {i//batch_size + 1}: JSON parse failed, keeping all")
-                
-        except Exception as e:
-            print(f"[NODE 5] AI cleanup failed for batch: {e}")
-            # Keep all jobs in this batch on error
-            cleaned.extend(batch)
+            except Exception as e:
+                print(f"[NODE 5] AI cleanup failed for batch: {e}")
+                # Keep all jobs in this batch on error
+                cleaned.extend(batch)
     
     print(f"[NODE 5] AI cleanup complete: {len(cleaned)}/{len(jobs)} jobs retained")
     if log:
@@ -1206,8 +1216,9 @@ def score_jobs_node(state: JobHuntState) -> dict:
             job["matchScore"] = 50  # Default score
         return {"scored_jobs": jobs}
     
-    # Limit to top 30 jobs for scoring (save tokens)
-    jobs_to_score = jobs[:30]
+    # Limit to top 30 jobs for scoring (save tokens; fewer at reduced depth)
+    limits = _depth_limits(state)
+    jobs_to_score = jobs[:limits["scored_jobs"]]
     
     # Use batch scoring (5 jobs per batch)
     try:
@@ -1219,7 +1230,9 @@ def score_jobs_node(state: JobHuntState) -> dict:
                 log("info", f"   Using fingerprint: {resume_fingerprint.get('role')}, {resume_fingerprint.get('yoe')}y exp")
             
             from utils.batch_scorer import score_jobs_in_batch
-            scored_jobs = score_jobs_in_batch(resume_fingerprint, jobs_to_score, batch_size=5)
+            scored_jobs = score_jobs_in_batch(
+                resume_fingerprint, jobs_to_score, batch_size=5, use_llm=limits["llm_scoring"]
+            )
         else:
             # Fallback: Use resume_text (old method)
             print(f"[NODE 6] ⚠️ Fingerprint not available, falling back to resume_text")
@@ -1240,7 +1253,9 @@ def score_jobs_node(state: JobHuntState) -> dict:
             }
             
             from utils.batch_scorer import score_jobs_in_batch
-            scored_jobs = score_jobs_in_batch(basic_fingerprint, jobs_to_score, batch_size=5)
+            scored_jobs = score_jobs_in_batch(
+                basic_fingerprint, jobs_to_score, batch_size=5, use_llm=limits["llm_scoring"]
+            )
         
         # Sort by score (highest first)
         scored_jobs.sort(key=lambda x: x.get("matchScore", 0), reverse=True)
@@ -1323,8 +1338,8 @@ def finalize_node(state: JobHuntState) -> dict:
             company_name = str(company) if company else "Unknown Company"
         
         # Get salary
-        salary_min = job.get("salary_min", 0)
-        salary_max = job.get("salary_max", 0)
+        salary_min = job.get("salary_min") or 0
+        salary_max = job.get("salary_max") or 0
         
         # Classify company tier
         tier = classify_company_tier(company_name, salary_min)
@@ -1399,16 +1414,16 @@ def create_job_hunt_graph():
     workflow = StateGraph(JobHuntState)
     
     # Add nodes
-    workflow.add_node("fetch_user_context", fetch_user_context_node)  # NEW: Node 0
-    workflow.add_node("generate_keywords", generate_keywords_node)
-    workflow.add_node("build_queries", build_queries_node)
-    workflow.add_node("fetch_adzuna", fetch_adzuna_node)
-    workflow.add_node("soft_killswitch", soft_killswitch_node)
-    workflow.add_node("relevance_ranker", relevance_ranker_node)  # PHASE 2: Node 4.5
-    workflow.add_node("ai_cleanup", ai_cleanup_node)
-    workflow.add_node("score_jobs", score_jobs_node)
-    workflow.add_node("validate_links", validate_links_node)
-    workflow.add_node("finalize", finalize_node)
+    workflow.add_node("fetch_user_context", traced_node("fetch_user_context")(fetch_user_context_node))  # NEW: Node 0
+    workflow.add_node("generate_keywords", traced_node("generate_keywords")(generate_keywords_node))
+    workflow.add_node("build_queries", traced_node("build_queries", inputs=("broad_keywords",))(build_queries_node))
+    workflow.add_node("fetch_adzuna", traced_node("fetch_adzuna", inputs=("adzuna_queries",))(fetch_adzuna_node))
+    workflow.add_node("soft_killswitch", traced_node("soft_killswitch", inputs=("raw_jobs",))(soft_killswitch_node))
+    workflow.add_node("relevance_ranker", traced_node("relevance_ranker", inputs=("filtered_jobs",))(relevance_ranker_node))  # PHASE 2: Node 4.5
+    workflow.add_node("ai_cleanup", traced_node("ai_cleanup", inputs=("filtered_jobs",))(ai_cleanup_node))
+    workflow.add_node("score_jobs", traced_node("score_jobs", inputs=("ai_cleaned_jobs",))(score_jobs_node))
+    workflow.add_node("validate_links", traced_node("validate_links", inputs=("scored_jobs",))(validate_links_node))
+    workflow.add_node("finalize", traced_node("finalize", inputs=("validated_jobs",))(finalize_node))
     
     # Define edges
     workflow.set_entry_point("fetch_user_context")  # Start with Node 0
@@ -7,11 +7,10 @@ TIER 3 (RED): Reserved for future JobSpy integration (high risk)
 
 import os
 import json
-import pika
 import time
 import re
+import logging
 from typing import List, Dict, Callable, Optional, Set
-from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import tier clients
@@ -19,15 +18,22 @@ from tier1_adzuna import AdzunaClient
 from tier2_tavily import TavilyJobSearch
 from tier2_hiringcafe import HiringCafeClient
 from url_validator import URLValidator
+from utils.logging_setup import setup_logging, attach_hunt_events_sink, HUNT_EVENTS_LOGGER, HUNT_LOG_QUEUE
+
+hunt_events = logging.getLogger(HUNT_EVENTS_LOGGER)
 
 class LogPublisher:
-    """Publishes logs to RabbitMQ for real-time streaming"""
+    """Publishes user-visible hunt logs through the hunt.events logger (see utils/logging_setup.py)"""
+    
+    LEVELS = {"info": logging.INFO, "success": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
     
     def __init__(self, channel, session_id: str, user_id: str):
         self.channel = channel
         self.session_id = session_id
         self.user_id = user_id
-        self.log_queue = "job_hunt_logs_queue"
+        self.log_queue = HUNT_LOG_QUEUE
+        # The user-visible stream must not depend on the entry point having called setup_logging()
+        attach_hunt_events_sink()
         
         # Ensure queue exists
         if channel:
@@ -35,35 +41,23 @@ class LogPublisher:
     
     def emit(self, level: str, message: str):
         """
-        Emit a log message to RabbitMQ
+        Emit a log message; the RabbitMQ sink streams it to the user and it
+        also reaches the operator log
         
         Args:
             level: Log level (info, success, warning, error)
             message: Log message
         """
-        if not self.channel:
-            print(f"[{level.upper()}] {message}")
-            return
-        
-        log_entry = {
-            "sessionId": self.session_id,
-            "userId": self.user_id,
-            "level": level,
-            "message": message,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        try:
-            self.channel.basic_publish(
-                exchange='',
-                routing_key=self.log_queue,
-                body=json.dumps(log_entry),
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # Make message persistent
-                )
-            )
-        except Exception as e:
-            print(f"[ERROR] Failed to publish log: {e}")
+        hunt_events.log(
+            self.LEVELS.get(level, logging.INFO),
+            message,
+            extra={
+                "session_id": self.session_id,
+                "user_id": self.user_id,
+                "user_level": level,
+                "_channel": self.channel,
+            }
+        )
 
 
 class HuntOrchestrator:
@@ -185,7 +179,8 @@ class HuntOrchestrator:
         self,
         session_id: str,
         user_id: str,
-        criteria: Dict
+        criteria: Dict,
+        depth: str = "full"
     ) -> Dict:
         """
         Execute the job hunt using LangGraph workflow.
@@ -194,6 +189,7 @@ class HuntOrchestrator:
             session_id: Unique session identifier
             user_id: User ID
             criteria: Search criteria dict
+            depth: Pipeline depth ("full" / "reduced" / "minimal"), see utils/usage_tracker.py
             
         Returns:
             Dict with success, totalJobs, jobs, tierUsed
@@ -241,6 +237,7 @@ class HuntOrchestrator:
                 "session_id": session_id,
                 "resume_text": resume_text,
                 "log_callback": log,  # Pass log function to graph nodes
+                "depth": depth,
                 # NEW: Optimization fields (will be populated by Node 0)
                 "user_skills": [],
                 "negative_keywords": [],
@@ -434,6 +431,7 @@ class HuntOrchestrator:
 
 # Test function
 if __name__ == "__main__":
+    setup_logging()
     orchestrator = HuntOrchestrator(rabbitmq_channel=None)
     
     test_criteria = {
@@ -1,52 +1,99 @@
 """
 JD Matcher wrapper for Job Hunter Agent.
 Provides a simple interface to calculate match scores.
+
+Scores come from the deterministic lexical scorer (milliseconds, no LLM).
+The full six-call matcher graph only runs when a caller asks for a refined
+score, and then in a background thread with the result delivered via callback.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict
 from matcher_graph import build_matcher_graph
+from utils.user_config_cache import UserConfigCache
+from utils.lexical_scorer import score_match, score_batch
+from utils.jd_parse_cache import get_jd_parse_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Background pool for optional full-graph refinement
+_refine_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jd-refine")
+
+
+def _run_full_graph(resume_text: str, job_description: str) -> int:
+    """Run the complete matcher graph and return its match score."""
+    graph = build_matcher_graph()
+
+    state = {
+        "resume_text": resume_text,
+        "resume_hash": UserConfigCache.calculate_resume_hash(resume_text),
+        "jd_text": job_description,
+        "parsed_jd": get_jd_parse_cache().get(job_description) or {},
+        "section_scores": {},
+        "ats_section": {},
+        "keyword_gaps": {},
+        "actionable_todos": {},
+        "bullet_feedback": [],
+        "final_result": {},
+        "errors": []
+    }
+
+    result = graph.invoke(state)
+    final_result = result.get("final_result", {})
+    return final_result.get("match_score", 50)
+
 
-def calculate_match_score(resume_text: str, job_description: str) -> int:
+def _refine_in_background(resume_text: str, job_description: str, on_refined: Callable[[int], None]):
+    try:
+        on_refined(_run_full_graph(resume_text, job_description))
+    except Exception as e:
+        logger.error(f"JD Matcher refinement failed: {e}")
+
+
+def calculate_match_score(
+    resume_text: str,
+    job_description: str,
+    refine: bool = False,
+    on_refined: Optional[Callable[[int], None]] = None
+) -> int:
     """
-    Calculate match score between resume and job description.
+    Lexical match score between resume and job description (no LLM call).
+
+    This is the utils.lexical_scorer score, not the matcher graph's score;
+    pass refine=True to also get the graph's score via on_refined.
     
     Args:
         resume_text: User's resume text
         job_description: Job description text
+        refine: Also queue the full LLM matcher graph in the background
+        on_refined: Called with the graph's score when refinement finishes
         
     Returns:
-        Match score (0-100)
+        Preliminary lexical match score (0-100), returned immediately
     """
     try:
-        # Build matcher graph
-        graph = build_matcher_graph()
-        
-        # Initialize state
-        state = {
-            "resume_text": resume_text,
-            "jd_text": job_description,
-            "parsed_jd": {},
-            "section_scores": {},
-            "keyword_gaps": {},
-            "actionable_todos": {},
-            "bullet_feedback": [],
-            "final_result": {},
-            "errors": []
-        }
-        
-        # Execute graph
-        result = graph.invoke(state)
-        
-        # Extract match score
-        final_result = result.get("final_result", {})
-        match_score = final_result.get("match_score", 50)
-        
-        return match_score
-        
+        parsed_jd = get_jd_parse_cache().peek(job_description)
+        match_score = score_match(resume_text, job_description, parsed_jd)["score"]
     except Exception as e:
         logger.error(f"JD Matcher failed: {e}")
         # Return default score on error
-        return 50
+        match_score = 50
+
+    if refine and on_refined:
+        _refine_executor.submit(_refine_in_background, resume_text, job_description, on_refined)
+
+    return match_score
+
+
+def calculate_match_scores(resume_text: str, job_descriptions: List[str]) -> List[Dict]:
+    """
+    Batch lexical scoring of one resume against many job descriptions.
+
+    Returns one dict per JD with score, components and matched/missing skills.
+    """
+    cache = get_jd_parse_cache()
+    return score_batch(
+        [(resume_text, jd) for jd in job_descriptions],
+        parsed_jds=[cache.peek(jd) for jd in job_descriptions]
+    )
@@ -2,21 +2,33 @@ import os
 import json
 import operator
 from typing import TypedDict, List, Dict, Any, Optional, Annotated
-from langgraph.graph import StateGraph, END
-from langchain_groq import ChatGroq
+from langgraph.graph import StateGraph, START, END
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from utils.user_config_cache import UserConfigCache
+from utils.matcher_cache import get_matcher_cache
+from utils.lexical_scorer import score_match
+from utils.jd_parse_cache import get_jd_parse_cache
+from utils.json_extract import extract_json, JSONExtractionError
+from utils.llm_client import get_chat_model, Priority
+from utils.tracing import traced_node, annotate
 
 load_dotenv()
 
+# Fused mode folds JD extraction into the gap-analysis prompt instead of
+# running parse_jd as a separate serial LLM hop (see build_matcher_graph).
+MATCHER_FUSED_MODE = os.getenv("MATCHER_FUSED_MODE", "false").lower() == "true"
+
 # --- STATE DEFINITION ---
 class MatcherState(TypedDict):
     resume_text: str
+    resume_hash: str  # Key for JD-independent outputs (see utils/matcher_cache.py)
     jd_text: str
     parsed_jd: Dict[str, Any]
     section_scores: Dict[str, Any]
+    ats_section: Dict[str, Any]
     keyword_gaps: Dict[str, Any]
     actionable_todos: Dict[str, Any]
     bullet_feedback: List[Dict[str, Any]]
@@ -28,7 +40,7 @@ def get_llm(temperature=0.1):
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise ValueError("GROQ_API_KEY not found in environment variables")
-    return ChatGroq(model="llama-3.3-70b-versatile", groq_api_key=api_key, temperature=temperature)
+    return get_chat_model("llama-3.3-70b-versatile", temperature=temperature, priority=Priority.JD, api_key=api_key)
 
 # --- PROMPTS ---
 
@@ -67,9 +79,8 @@ Required Sections to Analyze:
 2. Experience Relevance
 3. Skill Evidence Strength
 4. Impact & Metrics
-5. ATS Compatibility (Focus on formatting risks, unreadable sections)
-6. Role & Seniority Fit
-7. Language & Clarity
+5. Role & Seniority Fit
+6. Language & Clarity
 
 Output JSON:
 {{
@@ -82,7 +93,7 @@ Output JSON:
       "what_is_missing": ["point 1", "point 2"],
       "impact": "Explanation of how this affects screening"
     }},
-    ... (repeat for all 7 sections)
+    ... (repeat for all 6 sections)
   ]
 }}
 """
@@ -108,6 +119,37 @@ Output JSON:
 }}
 """
 
+FUSED_GAP_ANALYSIS_PROMPT = """
+Read the raw job description, extract its key requirements, then identify skill gaps
+between the resume and the JD.
+Classify skills as:
+1. Matched (Present in resume)
+2. Missing (Critical for JD, absent in resume)
+3. Weak (Present but lacks depth/evidence)
+
+Resume:
+{resume_text}
+
+Job Description:
+{jd_text}
+
+Output JSON:
+{{
+  "jd_profile": {{
+    "job_title": "string",
+    "company": "string",
+    "experience_level": "string",
+    "mandatory_skills": ["skill1", "skill2"],
+    "optional_skills": ["skill1", "skill2"],
+    "core_values": ["value1", "value2"],
+    "min_experience_years": integer
+  }},
+  "matched": ["skill1", "skill2"],
+  "missing": ["skill1", "skill2"],
+  "weak": ["skill1", "skill2"]
+}}
+"""
+
 ACTIONS_PROMPT = """
 Generate a high-impact "Actionable To-Do List" to improve this resume for the specific JD.
 Focus on "Quick Wins" and "High Impact" changes.
@@ -153,22 +195,38 @@ Output JSON:
 """
 
 FEEDBACK_PROMPT = """
-Review user's experience bullet points. Provide specific, constructive feedback.
-Do NOT suggest lying. Suggest quantifying impact or clarifying vague terms.
-Select top 3-5 weak bullets to critique.
+Review this resume. Both parts depend only on the resume, not on any job.
+
+1. Bullet feedback: review the user's experience bullet points and give specific,
+   constructive feedback. Do NOT suggest lying. Suggest quantifying impact or
+   clarifying vague terms. Select the top 3-5 weak bullets to critique.
+2. ATS compatibility: assess formatting and parsing risks only - unreadable
+   sections, tables/columns, missing standard headings, inconsistent dates,
+   contact info placement, graphics or special characters. Rate it 0-100 and
+   provide a status (Strong, Average, Weak).
 
 Resume:
 {resume_text}
 
 Output JSON:
-[
-  {{
-    "original_bullet": "The exact bullet text",
-    "feedback_tag": "Too vague / Missing Outcome / Skill not explicit",
-    "explanation": "Why this is weak",
-    "improvement_example": "A better version of the same bullet"
+{{
+  "bullet_feedback": [
+    {{
+      "original_bullet": "The exact bullet text",
+      "feedback_tag": "Too vague / Missing Outcome / Skill not explicit",
+      "explanation": "Why this is weak",
+      "improvement_example": "A better version of the same bullet"
+    }}
+  ],
+  "ats_compatibility": {{
+    "name": "ATS Compatibility",
+    "score": 0-100,
+    "status": "Strong/Average/Weak",
+    "what_worked": ["point 1", "point 2"],
+    "what_is_missing": ["point 1", "point 2"],
+    "impact": "Explanation of how this affects screening"
   }}
-]
+}}
 """
 
 HEADER_PROMPT = """
@@ -190,74 +248,51 @@ import re
 def clean_json(text):
     """
     Robust JSON extraction that handles markdown blocks, raw JSON, and preamble text.
-    It attempts to find the largest valid JSON object or array.
+    Delegates to utils.json_extract (single linear pass, tolerant of LLM quirks).
     """
-    text = text.strip()
-    
-    # 1. Try finding markdown JSON block
-    match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
-    if match:
-        text = match.group(1).strip()
-        
-    # 2. Try generic code block if no json block
-    if not match:
-        match = re.search(r'```\s*(.*?)\s*```', text, re.DOTALL)
-        if match:
-            text = match.group(1).strip()
-
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # 3. Fallback: Find the first occurrence of '{' or '['
-        start_brace = text.find('{')
-        start_bracket = text.find('[')
-        
-        start_index = -1
-        is_object = False
-        
-        if start_brace != -1 and (start_bracket == -1 or start_brace < start_bracket):
-            start_index = start_brace
-            is_object = True
-        elif start_bracket != -1:
-            start_index = start_bracket
-            is_object = False
-            
-        if start_index == -1:
-             print(f"   [graph] ❌ JSON Parsing Failed (No JSON found). Raw text: {text[:200]}...")
-             raise ValueError("No JSON object or array found in response.")
-
-        # Try to parse from start_index to the end, then progressively shrink from the end
-        # This is inefficient but robust for "Extra data" issues
-        for end_index in range(len(text), start_index, -1):
-            try:
-                candidate = text[start_index:end_index]
-                return json.loads(candidate)
-            except json.JSONDecodeError:
-                continue
-        
-        print(f"   [graph] ❌ JSON Parsing Failed (Structure invalid). Raw text: {text[:200]}...")
-        raise ValueError("Could not extract valid JSON from text.")
+        return extract_json(text)
+    except JSONExtractionError:
+        print(f"   [graph] ❌ JSON Parsing Failed. Raw text: {text.strip()[:200]}...")
+        raise
 
 # --- NODES Implementation ---
 
 def parse_jd_node(state: MatcherState):
+    # Callers pre-fill parsed_jd from the shared cache for JDs seen before
+    if state.get('parsed_jd'):
+        print("   [graph] Parsed JD supplied by cache, skipping parse")
+        annotate(cache_hit=True)
+        return {"parsed_jd": state['parsed_jd']}
     print("   [graph] Parsing JD...")
+    cache = get_jd_parse_cache()
+    cached = cache.get(state['jd_text'])
+    annotate(cache_hit=bool(cached))
+    if cached:
+        return {"parsed_jd": cached}
     try:
         llm = get_llm()
         result = llm.invoke(PARSE_JD_PROMPT.format(jd_text=state['jd_text']))
         parsed = clean_json(result.content)
+        cache.save(state['jd_text'], parsed)
         return {"parsed_jd": parsed}
     except Exception as e:
         print(f"   [graph] Error parsing JD: {e}")
         return {"errors": [str(e)]}
 
+def _jd_context(state: MatcherState) -> str:
+    """Parsed JD when available, otherwise the raw JD text (fused mode / parse failure)."""
+    if state.get('parsed_jd'):
+        return json.dumps(state['parsed_jd'])
+    return state['jd_text'][:6000]
+
 def analyze_sections_node(state: MatcherState):
     print("   [graph] Analyzing Sections...")
     try:
         llm = get_llm()
         result = llm.invoke(SECTION_ANALYSIS_PROMPT.format(
             resume_text=state['resume_text'][:10000], 
-            parsed_jd=json.dumps(state['parsed_jd'])
+            parsed_jd=_jd_context(state)
         ))
         data = clean_json(result.content)
         return {"section_scores": data}
@@ -268,12 +303,23 @@ def analyze_gaps_node(state: MatcherState):
     print("   [graph] Analyzing Gaps...")
     try:
         llm = get_llm()
-        result = llm.invoke(GAP_ANALYSIS_PROMPT.format(
-            resume_text=state['resume_text'][:10000], 
-            parsed_jd=json.dumps(state['parsed_jd'])
+        if state.get('parsed_jd'):
+            result = llm.invoke(GAP_ANALYSIS_PROMPT.format(
+                resume_text=state['resume_text'][:10000], 
+                parsed_jd=_jd_context(state)
+            ))
+            data = clean_json(result.content)
+            return {"keyword_gaps": data}
+
+        # Fused mode (or parse_jd failed): extract the JD profile in the same call
+        result = llm.invoke(FUSED_GAP_ANALYSIS_PROMPT.format(
+            resume_text=state['resume_text'][:10000],
+            jd_text=state['jd_text'][:6000]
         ))
         data = clean_json(result.content)
-        return {"keyword_gaps": data}
+        parsed = data.pop("jd_profile", {}) or {}
+        get_jd_parse_cache().save(state['jd_text'], parsed)
+        return {"keyword_gaps": data, "parsed_jd": parsed}
     except Exception as e:
          return {"errors": [str(e)]}
 
@@ -283,28 +329,73 @@ def generate_actions_node(state: MatcherState):
         llm = get_llm()
         result = llm.invoke(ACTIONS_PROMPT.format(
             resume_text=state['resume_text'][:10000], 
-            parsed_jd=json.dumps(state['parsed_jd'])
+            parsed_jd=_jd_context(state)
         ))
         data = clean_json(result.content)
         return {"actionable_todos": data}
     except Exception as e:
          return {"errors": [str(e)]}
 
+def _resume_hash(state: MatcherState) -> str:
+    return state.get('resume_hash') or UserConfigCache.calculate_resume_hash(state['resume_text'])
+
+def _is_ats_section(data) -> bool:
+    """True if `data` has the shape of the ATS section (safe to cache and merge)."""
+    return isinstance(data, dict) and isinstance(data.get("score"), (int, float)) and bool(data.get("status"))
+
 def generate_feedback_node(state: MatcherState):
-    print("   [graph] Generating Bulletin Feedback...")
+    """
+    Bullet feedback and the ATS compatibility section, from one resume-only call.
+
+    Both are cached per resume hash; the LLM only runs when either is missing.
+    """
+    print("   [graph] Generating Bulletin Feedback + ATS Compatibility...")
+    resume_hash = _resume_hash(state)
+    cache = get_matcher_cache()
+    cached_feedback = cache.get(resume_hash, "bullet_feedback") if cache else None
+    cached_ats = cache.get(resume_hash, "ats_compatibility") if cache else None
+    if cached_feedback and _is_ats_section(cached_ats):
+        return {"bullet_feedback": cached_feedback, "ats_section": cached_ats}
     try:
         llm = get_llm()
         result = llm.invoke(FEEDBACK_PROMPT.format(resume_text=state['resume_text'][:10000]))
         data = clean_json(result.content)
-        return {"bullet_feedback": data}
+        if isinstance(data, list):
+            data = {"bullet_feedback": data}  # bullets only, no ATS part
+        feedback = data.get("bullet_feedback") or []
+        ats = data.get("ats_compatibility")
+        update = {"bullet_feedback": feedback}
+        if cache and feedback:
+            cache.save(resume_hash, "bullet_feedback", feedback)
+        if _is_ats_section(ats):
+            ats["name"] = "ATS Compatibility"
+            update["ats_section"] = ats
+            if cache:
+                cache.save(resume_hash, "ats_compatibility", ats)
+        else:
+            update["errors"] = [f"ATS analysis returned an unexpected shape: {str(ats)[:200]}"]
+        return update
     except Exception as e:
          return {"errors": [str(e)]}
 
+def build_jd_summary(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_title": parsed.get('job_title', 'Unknown Role'),
+        "company": parsed.get('company', 'Unknown Company'),
+        "experience_level": parsed.get('experience_level', 'N/A'),
+        "top_skills": parsed.get('mandatory_skills', [])[:3]
+    }
+
 def aggregator_node(state: MatcherState):
     print("   [graph] Aggregating Results...")
     
+    # Merge the resume-only ATS section back into its usual slot (after Impact & Metrics)
+    sections = [s for s in state.get('section_scores', {}).get('sections', []) if s.get("name") != "ATS Compatibility"]
+    ats_section = state.get('ats_section') or {}
+    if ats_section:
+        sections.insert(min(4, len(sections)), ats_section)
+
     # Calculate overall match score from sections
-    sections = state.get('section_scores', {}).get('sections', [])
     total = 0
     count = 0
     for s in sections:
@@ -329,21 +420,14 @@ def aggregator_node(state: MatcherState):
             "emotional_line": "Review the detailed breakdown below to improve your score."
         }
     
-    parsed = state.get('parsed_jd', {})
-    
     final_result = {
         "match_score": avg_score,
         "verdict": verdict,
         "header_summary": header_data.get("one_line_summary"),
         "emotional_line": header_data.get("emotional_line"),
-        "jd_summary": {
-            "job_title": parsed.get('job_title', 'Unknown Role'),
-            "company": parsed.get('company', 'Unknown Company'),
-            "experience_level": parsed.get('experience_level', 'N/A'),
-            "top_skills": parsed.get('mandatory_skills', [])[:3]
-        },
+        "jd_summary": build_jd_summary(state.get('parsed_jd', {})),
         "sections": sections,
-        "ats_compatibility": next((s for s in sections if s["name"] == "ATS Compatibility"), {}),
+        "ats_compatibility": ats_section,
         "keyword_gap": state.get("keyword_gaps", {}),
         "actionable_todos": state.get("actionable_todos", {}),
         "bullet_feedback": state.get("bullet_feedback", [])
@@ -351,29 +435,128 @@ def aggregator_node(state: MatcherState):
     
     return {"final_result": final_result}
 
+# --- PROGRESSIVE RESULTS ---
+
+# analysisResults fields written as soon as their branch completes
+PROGRESSIVE_SECTIONS = ["jd_summary", "sections", "keyword_gap", "actionable_todos", "bullet_feedback", "ats_compatibility"]
+
+def preliminary_match_score(resume_text: str, parsed_jd: Dict[str, Any]) -> Optional[int]:
+    """
+    Deterministic lexical score shown while the LLM branches run.
+
+    Same scorer (utils.lexical_scorer) as jd_matcher.calculate_match_score
+    and simple_job_matcher, so the three agree on a given resume/JD pair.
+
+    Returns None when the parsed JD lists no skills.
+    """
+    if not parsed_jd.get('mandatory_skills') and not parsed_jd.get('optional_skills'):
+        return None
+    return score_match(resume_text, "", parsed_jd)["score"]
+
+def progressive_update(node_name: str, update: Dict[str, Any], resume_text: str) -> Dict[str, Any]:
+    """
+    Map one node's state update to the analysisResults fields it completes.
+
+    Used with graph.stream(stream_mode="updates") so each section can be
+    persisted as soon as its branch finishes. The aggregator's final_result
+    still overwrites analysisResults as a whole, so the final shape is unchanged.
+    """
+    if not update:
+        return {}
+    partial = {}
+    if update.get("parsed_jd"):
+        partial["jd_summary"] = build_jd_summary(update["parsed_jd"])
+        score = preliminary_match_score(resume_text, update["parsed_jd"])
+        if score is not None:
+            partial["match_score"] = score
+    if node_name == "analyze_sections" and isinstance(update.get("section_scores"), dict):
+        partial["sections"] = update["section_scores"].get("sections", [])
+    if "keyword_gaps" in update:
+        partial["keyword_gap"] = update["keyword_gaps"]
+    if "actionable_todos" in update:
+        partial["actionable_todos"] = update["actionable_todos"]
+    if "bullet_feedback" in update:
+        partial["bullet_feedback"] = update["bullet_feedback"]
+    if "ats_section" in update:
+        partial["ats_compatibility"] = update["ats_section"]
+    return partial
+
 # --- GRAPH BUILDER ---
-def build_matcher_graph():
-    workflow = StateGraph(MatcherState)
+RESUME_ONLY_BRANCHES = ["generate_feedback"]
+JD_BRANCHES = ["analyze_sections", "analyze_gaps", "generate_actions"]
+JD_SUBGRAPH = "jd_analysis"
 
-    workflow.add_node("parse_jd", parse_jd_node)
-    workflow.add_node("analyze_sections", analyze_sections_node)
-    workflow.add_node("analyze_gaps", analyze_gaps_node)
-    workflow.add_node("generate_actions", generate_actions_node)
-    workflow.add_node("generate_feedback", generate_feedback_node)
-    workflow.add_node("aggregator", aggregator_node)
+class JDAnalysisInput(TypedDict):
+    resume_text: str
+    jd_text: str
+    parsed_jd: Dict[str, Any]
 
-    workflow.set_entry_point("parse_jd")
-    
-    workflow.add_edge("parse_jd", "analyze_sections")
-    workflow.add_edge("parse_jd", "analyze_gaps")
-    workflow.add_edge("parse_jd", "generate_actions")
-    workflow.add_edge("parse_jd", "generate_feedback")
+class JDAnalysisOutput(TypedDict):
+    parsed_jd: Dict[str, Any]
+    section_scores: Dict[str, Any]
+    keyword_gaps: Dict[str, Any]
+    actionable_todos: Dict[str, Any]
+    errors: Annotated[List[str], operator.add]
+
+def build_jd_subgraph(fused: bool):
+    """
+    parse_jd -> JD branches, compiled as one node of the matcher graph.
+
+    LangGraph runs a graph in supersteps: every node of a step finishes before
+    the next step starts. With parse_jd and the resume-only branch in the same
+    top-level step, the JD branches would wait for the slower of the two.
+    Inside the subgraph they only wait for parse_jd. Errors are not part of
+    the input, so the parent's errors aren't returned (and added) twice.
+    """
+    workflow = StateGraph(MatcherState, input_schema=JDAnalysisInput, output_schema=JDAnalysisOutput)
+
+    workflow.add_node("analyze_sections", traced_node("analyze_sections")(analyze_sections_node))
+    workflow.add_node("analyze_gaps", traced_node("analyze_gaps")(analyze_gaps_node))
+    workflow.add_node("generate_actions", traced_node("generate_actions")(generate_actions_node))
+
+    if fused:
+        for branch in JD_BRANCHES:
+            workflow.add_edge(START, branch)
+    else:
+        workflow.add_node("parse_jd", traced_node("parse_jd")(parse_jd_node))
+        workflow.add_edge(START, "parse_jd")
+        for branch in JD_BRANCHES:
+            workflow.add_edge("parse_jd", branch)
+
+    workflow.add_edge(JD_BRANCHES, END)
+    return workflow.compile()
+
+def build_matcher_graph(fused: Optional[bool] = None):
+    """
+    Build the JD matcher graph.
+
+    The resume-only branch (feedback + ATS) and the JD subgraph both start at
+    entry, so time-to-aggregate is max(feedback, parse + slowest JD branch).
+    In standard mode the JD branches wait for parse_jd; in fused mode there is
+    no parse_jd node and the JD branches start from the raw JD text, with
+    analyze_gaps also returning the parsed JD profile for the header summary.
+
+    Per-branch updates are only streamed with graph.stream(..., subgraphs=True);
+    without it the JD subgraph reports once, when all its branches are done.
+
+    Args:
+        fused: Use fused mode (defaults to MATCHER_FUSED_MODE env flag)
+    """
+    if fused is None:
+        fused = MATCHER_FUSED_MODE
+
+    workflow = StateGraph(MatcherState)
+
+    workflow.add_node(JD_SUBGRAPH, build_jd_subgraph(fused))
+    workflow.add_node("generate_feedback", traced_node("generate_feedback")(generate_feedback_node))
+    workflow.add_node("aggregator", traced_node("aggregator")(aggregator_node))
 
-    workflow.add_edge("analyze_sections", "aggregator")
-    workflow.add_edge("analyze_gaps", "aggregator")
-    workflow.add_edge("generate_actions", "aggregator")
-    workflow.add_edge("generate_feedback", "aggregator")
+    workflow.add_edge(START, JD_SUBGRAPH)
+    for branch in RESUME_ONLY_BRANCHES:
+        workflow.add_edge(START, branch)
 
+    # Join: aggregator runs once, after the JD subgraph and the resume-only branch
+    workflow.add_edge([JD_SUBGRAPH] + RESUME_ONLY_BRANCHES, "aggregator")
     workflow.add_edge("aggregator", END)
 
     return workflow.compile()
@@ -3,7 +3,7 @@ import os
 import json
 from typing import TypedDict, List, Dict, Any, Annotated
 from langgraph.graph import StateGraph, END
-from langchain_groq import ChatGroq
+from utils.llm_client import get_chat_model, Priority
 from pymongo import MongoClient
 from dotenv import load_dotenv
 import operator
@@ -61,11 +61,7 @@ def build_mentor_graph():
     tools = get_mentor_tools()
     
     # Create LLM instance
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",
-        groq_api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0.1
-    )
+    llm = get_chat_model("llama-3.3-70b-versatile", temperature=0.1, priority=Priority.MENTOR)
     
     # Create agent using modern API (built on LangGraph internally)
     agent = create_agent(
@@ -97,10 +93,10 @@ async def invoke_mentor(user_id: str, thread_id: str, message: str):
         from langchain.agents import create_agent
         
         tools = get_mentor_tools()
-        llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            groq_api_key=os.getenv("GROQ_API_KEY"),
+        llm = get_chat_model(
+            "llama-3.3-70b-versatile",
             temperature=0.1,
+            priority=Priority.MENTOR,
             streaming=True  # Enable streaming
         )
         
@@ -24,13 +24,14 @@ from dotenv import load_dotenv
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
 from langgraph.checkpoint.mongodb import MongoDBSaver
-from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from pymongo import MongoClient
 
 # Local imports
 from state_schema import AgentState
 from mentor_tools import get_mentor_tools
+from utils.llm_client import get_chat_model, Priority
+from utils.tracing import traced_node
 
 load_dotenv()
 
@@ -285,10 +286,11 @@ def build_mentor_graph_v3():
     tools = get_mentor_tools()
     
     # Create LLM (Groq Llama)
-    llm = ChatGroq(
-        model=MODEL_NAME,
-        groq_api_key=GROQ_API_KEY,
+    llm = get_chat_model(
+        MODEL_NAME,
         temperature=TEMPERATURE,
+        priority=Priority.MENTOR,
+        api_key=GROQ_API_KEY,
         streaming=True
     )
     llm_with_tools = llm.bind_tools(tools)
@@ -429,7 +431,7 @@ def build_mentor_graph_v3():
             }
         
         # Invoke Grader LLM (8b-instant for speed)
-        grader_llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0)
+        grader_llm = get_chat_model("llama-3.1-8b-instant", temperature=0, priority=Priority.MENTOR)
         
         try:
             validation = grader_llm.invoke(GRADER_PROMPT.format(
@@ -464,9 +466,9 @@ def build_mentor_graph_v3():
     
     workflow = StateGraph(AgentState)
     
-    workflow.add_node("agent", agent_node)
+    workflow.add_node("agent", traced_node("agent", inputs=("messages",))(agent_node))
     workflow.add_node("tools", ToolNode(tools))
-    workflow.add_node("grader", grader_node)
+    workflow.add_node("grader", traced_node("grader")(grader_node))
     
     workflow.add_edge(START, "agent")
     
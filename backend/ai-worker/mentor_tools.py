@@ -4,6 +4,7 @@ import json
 from langchain.tools import tool
 from pymongo import MongoClient
 from tavily import TavilyClient
+from utils.usage_tracker import track_http
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -329,12 +330,13 @@ def internet_search(query: str) -> str:
         client = TavilyClient(api_key=api_key)
         
         # optimized for general knowledge and market data
-        response = client.search(
-            query=query, 
-            search_depth="advanced",
-            max_results=5,
-            include_answer=True
-        )
+        with track_http("tavily"):
+            response = client.search(
+                query=query, 
+                search_depth="advanced",
+                max_results=5,
+                include_answer=True
+            )
         
         # Return answer + results for better context
         return json.dumps({
@@ -1,16 +1,23 @@
 """
 Simplified Job Matcher for Job Hunter Agent.
 Calculates match score between resume and job description without ATS analysis.
+
+By default the score is computed locally by utils.lexical_scorer; the 70B
+prompt below is only used when use_llm=True.
 """
 
-from langchain_groq import ChatGroq
+from utils.llm_client import get_chat_model, Priority
 import os
 import json
 import re
+from utils.lexical_scorer import score_match
 
-def calculate_job_match_score(resume_text: str, job_description: str) -> int:
+def calculate_job_match_score(resume_text: str, job_description: str, use_llm: bool = False) -> int:
     """
     Calculate simplified match score for job hunting.
+
+    Without use_llm this returns the lexical score (skill overlap, YoE fit,
+    keyword coverage) and makes no API call.
     
     Scores based on:
     - Keywords & Skills Match
@@ -23,16 +30,20 @@ def calculate_job_match_score(resume_text: str, job_description: str) -> int:
     Args:
         resume_text: User's raw resume text
         job_description: Job description text
+        use_llm: Score with one 70B call per pair instead
         
     Returns:
         Match score (0-100)
     """
+    if not use_llm:
+        try:
+            return score_match(resume_text, job_description)["score"]
+        except Exception as e:
+            print(f"[JobMatcher] Error calculating lexical score: {e}")
+            return 50
+
     try:
-        llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0.1,
-            api_key=os.getenv("GROQ_API_KEY")
-        )
+        llm = get_chat_model("llama-3.3-70b-versatile", temperature=0.1, priority=Priority.JD)
         
         prompt = f"""You are an expert job matching system. Analyze how well this resume matches the job description.
 
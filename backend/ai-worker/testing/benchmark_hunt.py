@@ -0,0 +1,371 @@
+"""
+Benchmark: end-to-end job hunt graph (agent/job_hunter_graph.py), offline
+
+Runs create_job_hunt_graph() with no network:
+- Adzuna: utils.async_adzuna.fetch_job_async serves recorded responses from
+  testing/fixtures/adzuna_responses.json (keyed "what|where"; unknown queries
+  get the fixtures round-robin), with --adzuna-latency per request
+- LLM: testing/fake_llm.FakeChatGroq (deterministic responses, --llm-latency
+  plus up to --llm-jitter seconds per call)
+- MongoDB: MONGODB_URI is unset, so caches and user skills are skipped
+
+With --cassette, Adzuna and the LLM are instead served from a recorded
+utils/cassette.py cassette (a production hunt recorded with CASSETTE_MODE=record,
+or one recorded here with --record --cassette), so node timings reflect real
+response sizes and prompts. --cassette-latency replays that fraction of the
+recorded latency.
+
+For each --concurrency level it runs --hunts hunts and reports throughput
+(hunts/minute), hunt latency and per-node wall / CPU time. Per-node peak
+memory comes from one extra sequential hunt under tracemalloc (kept out of the
+timed runs because tracing slows allocation-heavy code). CPU time is the
+node's own thread; work it hands to thread pools is not included.
+
+Usage:
+    python testing/benchmark_hunt.py [--hunts N] [--concurrency 1 4 8] [--json out.json]
+    python testing/benchmark_hunt.py --record    # re-record Adzuna fixtures (needs keys + network)
+    python testing/benchmark_hunt.py --cassette cassettes/hunt-<sessionId>.json.gz [--cassette-latency 1]
+    python testing/benchmark_hunt.py --record --cassette bench-live    # record a live hunt (Adzuna + Groq)
+
+The JSON output (one object per run, commit hash included) is meant to be
+kept per commit and compared for regressions.
+"""
+
+import os
+import sys
+import json
+import time
+import copy
+import asyncio
+import argparse
+import platform
+import statistics
+import functools
+import itertools
+import threading
+import subprocess
+import tracemalloc
+from contextlib import redirect_stdout, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# Offline: no Mongo caches, no Adzuna pacing, no span files
+for var in ("MONGODB_URI", "MONGO_URI"):
+    os.environ.pop(var, None)
+os.environ["ADZUNA_REQUEST_SPACING"] = "0"
+os.environ.setdefault("TRACING_ENABLED", "false")
+os.environ.setdefault("ADZUNA_APP_ID", "benchmark")
+os.environ.setdefault("ADZUNA_APP_KEY", "benchmark")
+
+from utils import async_adzuna
+from utils.cassette import use_cassette, MODE_RECORD, MODE_REPLAY
+from agent import job_hunter_graph
+from testing.fake_llm import install_fake_llm
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "adzuna_responses.json")
+RESUME = os.path.join(os.path.dirname(__file__), "fixtures", "resume.txt")
+
+DEFAULT_CRITERIA = {
+    "jobTitles": ["MERN Stack Developer"],
+    "locations": ["Bangalore"],
+    "salaryRange": [600000, 2500000],
+    "employmentTypes": ["Full-time"],
+}
+
+
+# ============================================================
+# ADZUNA FIXTURES
+# ============================================================
+
+def _key(query):
+    return f"{query.get('what', '').lower()}|{query.get('where', '').lower()}"
+
+
+class AdzunaFixtures:
+    """Serves recorded search responses; each call gets a fresh parsed copy (nodes mutate jobs)."""
+
+    def __init__(self, path, latency):
+        with open(path, encoding="utf-8") as f:
+            self.raw = {k: json.dumps(v) for k, v in json.load(f)["responses"].items()}
+        self.latency = latency
+        self._fallback = itertools.cycle(sorted(self.raw))
+        self._lock = threading.Lock()
+        self.misses = 0
+
+    async def fetch_job_async(self, session, query, sem, app_id, app_key):
+        async with sem:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            key = _key(query)
+            if key not in self.raw:
+                with self._lock:
+                    self.misses += 1
+                    key = next(self._fallback)
+            return json.loads(self.raw[key])
+
+
+def record_fixtures(path, criteria, resume):
+    """Run one hunt against live Adzuna (fake LLM) and save every response."""
+    recorded = {}
+    live_fetch = async_adzuna.fetch_job_async
+
+    async def recording_fetch(session, query, sem, app_id, app_key):
+        data = await live_fetch(session, query, sem, app_id, app_key)
+        if data.get("results"):
+            recorded[_key(query)] = data
+        return data
+
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'), override=True)
+    for var in ("MONGODB_URI", "MONGO_URI"):
+        os.environ.pop(var, None)
+    async_adzuna.REQUEST_SPACING = 2.5
+    async_adzuna.fetch_job_async = recording_fetch
+    try:
+        run_hunt(job_hunter_graph.create_job_hunt_graph(), 0, criteria, resume)
+    finally:
+        async_adzuna.fetch_job_async = live_fetch
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"_comment": "Recorded Adzuna /jobs/in/search responses, keyed 'what|where'", "responses": recorded}, f)
+    print(f"Recorded {len(recorded)} responses to {path}")
+
+
+def record_cassette(name, criteria, resume):
+    """Run one fully live hunt (Adzuna, Groq, Tavily...) and save its calls as a cassette."""
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'), override=True)
+    for var in ("MONGODB_URI", "MONGO_URI"):
+        os.environ.pop(var, None)
+    async_adzuna.REQUEST_SPACING = 2.5
+    with use_cassette(name, MODE_RECORD, process_wide=True) as cassette:
+        run_hunt(job_hunter_graph.create_job_hunt_graph(), 0, criteria, resume)
+    print(f"Recorded {cassette.stats()['services']} to {cassette.path}")
+
+
+# ============================================================
+# NODE METERING
+# ============================================================
+
+class NodeMeter:
+    """Wraps every *_node function in job_hunter_graph with wall/CPU (and optional memory) timing."""
+
+    def __init__(self):
+        self.samples = {}
+        self.memory = False
+        self._lock = threading.Lock()
+
+    def install(self):
+        for name in dir(job_hunter_graph):
+            fn = getattr(job_hunter_graph, name)
+            if name.endswith("_node") and callable(fn) and not hasattr(fn, "__metered__"):
+                setattr(job_hunter_graph, name, self._wrap(name[:-len("_node")], fn))
+
+    def _wrap(self, node, fn):
+        @functools.wraps(fn)
+        def metered(state, *args, **kwargs):
+            if self.memory:
+                tracemalloc.reset_peak()
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return fn(state, *args, **kwargs)
+            finally:
+                sample = {"wall": time.perf_counter() - wall, "cpu": time.thread_time() - cpu}
+                if self.memory:
+                    sample["peak"] = tracemalloc.get_traced_memory()[1]
+                with self._lock:
+                    self.samples.setdefault(node, []).append(sample)
+        metered.__metered__ = True
+        return metered
+
+    def reset(self):
+        with self._lock:
+            self.samples = {}
+
+    def summary(self):
+        nodes = {}
+        for node, samples in self.samples.items():
+            walls = sorted(s["wall"] for s in samples)
+            nodes[node] = {
+                "calls": len(samples),
+                "wall_mean_ms": round(statistics.mean(walls) * 1000, 2),
+                "wall_p95_ms": round(walls[min(len(walls) - 1, int(0.95 * len(walls)))] * 1000, 2),
+                "cpu_mean_ms": round(statistics.mean(s["cpu"] for s in samples) * 1000, 2),
+            }
+            if "peak" in samples[0]:
+                nodes[node]["peak_kb"] = round(max(s["peak"] for s in samples) / 1024, 1)
+        return nodes
+
+
+# ============================================================
+# RUNS
+# ============================================================
+
+def run_hunt(graph, index, criteria, resume):
+    state = {
+        "criteria": criteria,
+        "user_id": f"bench_user_{index}",
+        "session_id": f"bench_{index}",
+        "resume_text": resume,
+        "log_callback": lambda level, message: None,
+        "depth": "full",
+        "user_skills": [],
+        "negative_keywords": [],
+        "positive_synonyms": {},
+        "broad_keywords": [],
+        "adzuna_queries": [],
+        "raw_jobs": [],
+        "filtered_jobs": [],
+        "ai_cleaned_jobs": [],
+        "scored_jobs": [],
+        "validated_jobs": [],
+        "final_results": [],
+        "tier_used": [],
+        "error": "",
+    }
+    return graph.invoke(copy.deepcopy(state))
+
+
+def run_level(graph, meter, concurrency, hunts, criteria, resume):
+    meter.reset()
+    latencies = []
+    results = []
+
+    def one(i):
+        start = time.perf_counter()
+        final = run_hunt(graph, i, criteria, resume)
+        latencies.append(time.perf_counter() - start)
+        results.append(len(final.get("final_results", [])))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(hunts)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "hunts": hunts,
+        "wall_s": round(elapsed, 3),
+        "hunts_per_min": round(hunts / elapsed * 60, 2),
+        "hunt_p50_s": round(statistics.median(latencies), 3),
+        "hunt_p95_s": round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 3),
+        "final_jobs": sorted(set(results)),
+        "nodes": meter.summary(),
+    }
+
+
+def run_memory_pass(graph, meter, criteria, resume):
+    meter.reset()
+    meter.memory = True
+    tracemalloc.start()
+    try:
+        run_hunt(graph, 0, criteria, resume)
+    finally:
+        tracemalloc.stop()
+        meter.memory = False
+    return {node: s.get("peak_kb") for node, s in meter.summary().items()}
+
+
+def _commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def print_table(report):
+    for level in report["levels"]:
+        print(f"\nconcurrency={level['concurrency']}  hunts={level['hunts']}  "
+              f"{level['hunts_per_min']:.1f} hunts/min  p50={level['hunt_p50_s']:.2f}s  p95={level['hunt_p95_s']:.2f}s")
+        print(f"  {'node':<20s} {'calls':>5s} {'wall ms':>10s} {'p95 ms':>10s} {'cpu ms':>10s} {'peak KB':>10s}")
+        for node, s in level["nodes"].items():
+            peak = report["memory"].get(node)
+            print(f"  {node:<20s} {s['calls']:5d} {s['wall_mean_ms']:10.1f} {s['wall_p95_ms']:10.1f} "
+                  f"{s['cpu_mean_ms']:10.1f} {peak if peak is not None else '-':>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline job hunt graph benchmark")
+    parser.add_argument("--hunts", type=int, default=8, help="Hunts per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM base latency (s)")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Extra fake LLM latency, up to (s)")
+    parser.add_argument("--adzuna-latency", type=float, default=0.0, help="Per-request Adzuna latency (s)")
+    parser.add_argument("--fixtures", default=FIXTURES)
+    parser.add_argument("--resume", default=RESUME)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep node output")
+    parser.add_argument("--record", action="store_true", help="Record Adzuna fixtures (or --cassette) from the live APIs")
+    parser.add_argument("--cassette", help="Replay (or with --record, record) this cassette instead of fixtures + fake LLM")
+    parser.add_argument("--cassette-latency", type=float, default=0.0, help="Fraction of recorded latency to replay")
+    args = parser.parse_args()
+
+    with open(args.resume, encoding="utf-8") as f:
+        resume = f.read()
+
+    if args.record and args.cassette:
+        record_cassette(args.cassette, DEFAULT_CRITERIA, resume)
+        return
+
+    adzuna = None
+    if args.cassette:
+        # Credentials are redacted in cassettes; clients only need something to send
+        os.environ.setdefault("GROQ_API_KEY", "replay")
+        os.environ.setdefault("GEMINI_API_KEY", "replay")
+        replay = use_cassette(args.cassette, MODE_REPLAY, latency=args.cassette_latency, process_wide=True)
+    else:
+        install_fake_llm(latency=args.llm_latency, jitter=args.llm_jitter)
+        if args.record:
+            record_fixtures(args.fixtures, DEFAULT_CRITERIA, resume)
+            return
+        adzuna = AdzunaFixtures(args.fixtures, args.adzuna_latency)
+        async_adzuna.fetch_job_async = adzuna.fetch_job_async
+        replay = nullcontext()
+
+    meter = NodeMeter()
+    meter.install()
+    graph = job_hunter_graph.create_job_hunt_graph()
+
+    report = {
+        "benchmark": "hunt_graph",
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "config": {
+            "llm_latency": args.llm_latency,
+            "llm_jitter": args.llm_jitter,
+            "adzuna_latency": args.adzuna_latency,
+            "fixtures": None if args.cassette else os.path.basename(args.fixtures),
+            "cassette": args.cassette,
+            "cassette_latency": args.cassette_latency if args.cassette else None,
+        },
+        "levels": [],
+        "memory": {},
+    }
+
+    sink = sys.stdout if args.verbose else open(os.devnull, "w")
+    with redirect_stdout(sink), replay as cassette:
+        run_hunt(graph, -1, DEFAULT_CRITERIA, resume)  # warm-up: imports, regex compilation, pools
+        for concurrency in args.concurrency:
+            report["levels"].append(run_level(graph, meter, concurrency, args.hunts, DEFAULT_CRITERIA, resume))
+        if not args.no_memory:
+            report["memory"] = run_memory_pass(graph, meter, DEFAULT_CRITERIA, resume)
+    if adzuna is not None:
+        report["adzuna_fixture_misses"] = adzuna.misses
+    if cassette is not None:
+        report["cassette_stats"] = cassette.stats()
+
+    print_table(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: LLM JSON extraction (utils/json_extract.py)
+
+Compares the shared linear-time extractor with the implementations it
+replaced, on synthetic responses of increasing size:
+- legacy_clean_json: matcher_graph.clean_json (shrinking-suffix json.loads loop)
+- legacy_clean_json_response: worker.clean_json_response + json.loads
+- legacy_regex: the r'\\{.*?\\}' extractor used in batch_scorer / job hunter nodes
+
+Each case also records whether the extractor returned the expected value, so
+the table shows correctness and speed side by side.
+
+Usage:
+    python testing/benchmark_json_extract.py [--repeats N] [--json out.json]
+"""
+
+import os
+import sys
+import re
+import json
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.json_extract import extract_json
+
+
+# --- BASELINES: previous implementations ---
+def legacy_clean_json(text):
+    text = text.strip()
+    match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
+    if match:
+        text = match.group(1).strip()
+    if not match:
+        match = re.search(r'```\s*(.*?)\s*```', text, re.DOTALL)
+        if match:
+            text = match.group(1).strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        start_brace = text.find('{')
+        start_bracket = text.find('[')
+        if start_brace != -1 and (start_bracket == -1 or start_brace < start_bracket):
+            start_index = start_brace
+        elif start_bracket != -1:
+            start_index = start_bracket
+        else:
+            raise ValueError("No JSON object or array found in response.")
+        for end_index in range(len(text), start_index, -1):
+            try:
+                return json.loads(text[start_index:end_index])
+            except json.JSONDecodeError:
+                continue
+        raise ValueError("Could not extract valid JSON from text.")
+
+
+def legacy_clean_json_response(text):
+    match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
+    if match:
+        return json.loads(match.group(1).strip())
+    match = re.search(r'```\s*(.*?)\s*```', text, re.DOTALL)
+    if match:
+        return json.loads(match.group(1).strip())
+    start_match = re.search(r'\{', text)
+    end_match = re.search(r'\}', text[::-1])
+    if start_match and end_match:
+        return json.loads(text[start_match.start():len(text) - end_match.start()].strip())
+    return json.loads(text.strip())
+
+
+def legacy_regex(text):
+    match = re.search(r'\{.*?\}', text, re.DOTALL)
+    return json.loads(match.group(0))
+
+
+IMPLEMENTATIONS = {
+    "json_extract": extract_json,
+    "legacy_clean_json": legacy_clean_json,
+    "legacy_clean_json_response": legacy_clean_json_response,
+    "legacy_regex": legacy_regex,
+}
+
+
+# --- CASES ---
+def make_payload(items):
+    return {
+        "sections": [
+            {"name": f"Section {i}", "score": i % 100, "status": "Average",
+             "feedback": f"Point {i}: add metrics {{like 30%}} to this bullet."}
+            for i in range(items)
+        ]
+    }
+
+
+def make_cases(items):
+    payload = make_payload(items)
+    body = json.dumps(payload, indent=2)
+    return {
+        "clean": (body, payload),
+        "fenced": (f"Here is the analysis:\n```json\n{body}\n```\nLet me know!", payload),
+        "trailing_text": (f"{body}\n\nNote: scores are estimates {{approx}}.", payload),
+        "trailing_commas": (body.replace("\n  ]", ",\n  ]"), payload),
+        "single_quotes": ("{'scores': [85, 72, 91], 'ok': True}", {"scores": [85, 72, 91], "ok": True}),
+    }
+
+
+def time_call(fn, text, expected, repeats):
+    timings = []
+    ok = False
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            ok = fn(text) == expected
+        except Exception:
+            ok = False
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings), ok
+
+
+def run_benchmark(sizes, repeats):
+    rows = []
+    print(f"{'case':16s} {'chars':>8s} " + " ".join(f"{name[:22]:>24s}" for name in IMPLEMENTATIONS))
+    for items in sizes:
+        for case, (text, expected) in make_cases(items).items():
+            row = {"case": case, "items": items, "chars": len(text), "results": {}}
+            cells = []
+            for name, fn in IMPLEMENTATIONS.items():
+                t_min, t_med, ok = time_call(fn, text, expected, repeats)
+                row["results"][name] = {"min_ms": t_min * 1000, "median_ms": t_med * 1000, "correct": ok}
+                cells.append(f"{t_med * 1000:10.3f}ms {'ok' if ok else 'WRONG':>5s}      ")
+            print(f"{case:16s} {len(text):8d} " + " ".join(cells))
+            rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="5,50,200", help="Comma-separated section counts per payload")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run_benchmark([int(s) for s in args.sizes.split(",")], args.repeats)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
@@ -0,0 +1,119 @@
+"""
+Benchmark: resume text extraction (utils/text_extraction.py)
+
+Compares the old in-thread extraction (pdfplumber page loop / docx paragraphs
+on the consumer thread) with the process-pool engine on a corpus of sample
+resumes.
+
+Usage:
+    python testing/benchmark_text_extraction.py [corpus_dir] [--repeats N]
+
+corpus_dir defaults to testing/resume_corpus/ and should contain .pdf/.docx
+files (drop in a mix of one-page, multi-page and image-heavy resumes).
+"""
+
+import os
+import sys
+import io
+import time
+import json
+import argparse
+import statistics
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.text_extraction import extract_text, shutdown_pool, ExtractionError
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "resume_corpus")
+
+
+# --- BASELINE: previous worker.py implementation ---
+def legacy_extract(file_content, file_name):
+    if file_name.lower().endswith(".pdf"):
+        import pdfplumber
+        with io.BytesIO(file_content) as f:
+            with pdfplumber.open(f) as pdf:
+                text = ""
+                for page in pdf.pages:
+                    text += page.extract_text() or ""
+                return text
+    import docx
+    with io.BytesIO(file_content) as f:
+        doc = docx.Document(f)
+        text = ""
+        for para in doc.paragraphs:
+            text += para.text + "\n"
+        return text
+
+
+def time_call(fn, content, name, repeats):
+    timings = []
+    text = ""
+    for _ in range(repeats):
+        start = time.perf_counter()
+        text = fn(content, name)
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings), len(text)
+
+
+def run_benchmark(corpus_dir, repeats):
+    files = sorted(
+        f for f in os.listdir(corpus_dir) if f.lower().endswith((".pdf", ".docx"))
+    )
+    if not files:
+        print(f"❌ No .pdf/.docx files found in {corpus_dir}")
+        return []
+
+    # Warm up the pool so process start-up is not billed to the first file
+    with open(os.path.join(corpus_dir, files[0]), "rb") as f:
+        try:
+            extract_text(f.read(), files[0])
+        except ExtractionError:
+            pass
+
+    rows = []
+    print(f"{'file':40s} {'size':>8s} {'legacy(ms)':>11s} {'pool(ms)':>10s} {'speedup':>8s} {'chars':>7s}")
+    for name in files:
+        with open(os.path.join(corpus_dir, name), "rb") as f:
+            content = f.read()
+        try:
+            legacy_min, legacy_med, legacy_chars = time_call(legacy_extract, content, name, repeats)
+            pool_min, pool_med, pool_chars = time_call(extract_text, content, name, repeats)
+        except ExtractionError as e:
+            print(f"{name[:40]:40s} skipped: {e}")
+            continue
+
+        speedup = legacy_med / pool_med if pool_med else 0
+        print(f"{name[:40]:40s} {len(content)/1024:7.0f}K {legacy_med*1000:11.1f} {pool_med*1000:10.1f} {speedup:7.2f}x {pool_chars:7d}")
+        rows.append({
+            "file": name,
+            "bytes": len(content),
+            "legacy_ms": {"min": legacy_min * 1000, "median": legacy_med * 1000},
+            "pool_ms": {"min": pool_min * 1000, "median": pool_med * 1000},
+            "legacy_chars": legacy_chars,
+            "pool_chars": pool_chars,
+        })
+
+    if rows:
+        total_legacy = sum(r["legacy_ms"]["median"] for r in rows)
+        total_pool = sum(r["pool_ms"]["median"] for r in rows)
+        print(f"\nTotal (median): legacy {total_legacy:.0f}ms | pool {total_pool:.0f}ms | "
+              f"speedup {total_legacy / total_pool:.2f}x over {len(rows)} files")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus_dir", nargs="?", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        results = run_benchmark(args.corpus_dir, args.repeats)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {args.json}")
+    finally:
+        shutdown_pool()
@@ -0,0 +1,387 @@
+"""
+Fake Groq server - local OpenAI-compatible chat completions for offline load tests
+
+Worker consumers and /mentor/stream can't be load-tested against Groq (rate
+limits, cost). This server implements the endpoint langchain_groq calls,
+POST /openai/v1/chat/completions, so every LLM path runs unchanged against it:
+
+- Responses per prompt family come from testing/fake_llm.match_prompt() and
+  fixtures/llm_responses.json: resume verification/extraction/fingerprint,
+  hunt fingerprint/negatives/synonyms/keywords, cleanup decisions sized to
+  the job ids, scores sized to the batch, matcher sections/gaps/actions/
+  feedback+ATS/header, mentor grader
+- Requests with tools (the mentor agent) get tool calls picked from the last
+  user message (jobs, scans, profile, salary/company search, LeetCode, job
+  hunt / JD matcher action cards); after a tool result they get a text answer
+- stream=true is served as SSE chunks (tool calls in one chunk, usage in
+  x_groq on the last chunk, like Groq)
+- Latency: time to first token from a distribution (fixed:S, uniform:LO:HI,
+  normal:MEAN:SD, lognormal:MEDIAN:SIGMA, exp:MEAN), per family overridable,
+  plus completion tokens / --tokens-per-sec
+- 429s: --rate-429 injects them at random; --rpm / --tpm enforce a sliding
+  60s window per model. x-ratelimit-* and retry-after headers are sent so
+  llm_client's scheduler budgets react as they would against Groq.
+
+GET /stats returns per-family counts, streamed requests, tool calls and 429s.
+
+Usage:
+    python testing/fake_groq_server.py [--port 8300] [--latency lognormal:0.4:0.5]
+        [--family-latency matcher_sections=lognormal:2:0.3] [--tokens-per-sec 300]
+        [--rate-429 0.02] [--rpm 30] [--tpm 6000] [--seed 1]
+    GROQ_API_BASE=http://127.0.0.1:8300 GROQ_API_KEY=fake python worker.py
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from testing.fake_llm import match_prompt, load_responses, DEFAULT_RESPONSES
+
+WINDOW_SECONDS = 60
+CHARS_PER_TOKEN = 4
+STREAM_CHUNK_CHARS = 16
+
+# Mentor tools, first keyword match wins; only tools offered in the request are used
+_TOOL_RULES = [
+    ("open_jd_matcher", ("http://", "https://", "analyze this job", "ats check")),
+    ("open_job_hunter", ("find jobs", "find me", "search for", "job hunt", "looking for a job", "openings")),
+    ("vector_search_jobs", ("tracked", "saved job", "my jobs", "applied", "application")),
+    ("fetch_scan_history", ("scan", "analysis", "analyses", "match score", "gap")),
+    ("query_leetcode_questions", ("leetcode", "interview question", "coding question", "dsa")),
+    ("get_profile_details", ("resume", "profile", "my skills", "my experience", "my projects")),
+    ("internet_search", ("salary", "company", "market", "trend", "culture", "layoff")),
+]
+_URL = re.compile(r"https?://\S+")
+_USER_ID = re.compile(r"\*\*User ID\*\*: (\S+)")
+
+
+# ============================================================
+# LATENCY
+# ============================================================
+
+class LatencyModel:
+    """Samples seconds from a spec: fixed:S, uniform:LO:HI, normal:MEAN:SD, lognormal:MEDIAN:SIGMA, exp:MEAN."""
+
+    def __init__(self, spec: str, rng: random.Random):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self.rng = rng
+        if kind not in ("fixed", "uniform", "normal", "lognormal", "exp"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            return p[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(p[0], p[1])
+        if self.kind == "normal":
+            return max(0.0, self.rng.gauss(p[0], p[1]))
+        if self.kind == "lognormal":
+            return self.rng.lognormvariate(math.log(p[0]), p[1]) if p[0] > 0 else 0.0
+        return self.rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+
+
+# ============================================================
+# SERVER STATE
+# ============================================================
+
+class FakeGroq:
+    """Response selection, latency, rate limiting and counters shared by all requests."""
+
+    def __init__(self, responses: List[Dict[str, Any]], latency: str = "fixed:0", family_latency: Optional[Dict[str, str]] = None,
+                 tokens_per_sec: float = 0.0, rate_429: float = 0.0, rpm: int = 0, tpm: int = 0, seed: Optional[int] = None):
+        self.responses = responses
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency, self.rng)
+        self.family_latency = {f: LatencyModel(s, self.rng) for f, s in (family_latency or {}).items()}
+        self.tokens_per_sec = tokens_per_sec
+        self.rate_429 = rate_429
+        self.rpm = rpm
+        self.tpm = tpm
+        self.stats: Dict[str, Any] = {"requests": 0, "streamed": 0, "tool_calls": 0, "injected_429": 0, "limited_429": 0, "families": {}}
+        self._windows: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def first_token_delay(self, family: str) -> float:
+        with self._lock:
+            return self.family_latency.get(family, self.latency).sample()
+
+    def token_delay(self, tokens: int) -> float:
+        return tokens / self.tokens_per_sec if self.tokens_per_sec else 0.0
+
+    def admit(self, model: str, tokens: int) -> Tuple[Optional[float], Dict[str, str]]:
+        """(retry_after or None, x-ratelimit-* headers) for a request of ~tokens."""
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(model, deque())
+            while window and now - window[0][0] >= WINDOW_SECONDS:
+                window.popleft()
+            used_requests = len(window)
+            used_tokens = sum(t for _, t in window)
+            reset = f"{WINDOW_SECONDS - (now - window[0][0]):.2f}s" if window else "0s"
+            limit_requests = self.rpm or 14400
+            limit_tokens = self.tpm or 1_000_000
+
+            retry_after = None
+            if self.rate_429 and self.rng.random() < self.rate_429:
+                retry_after = round(self.rng.uniform(0.5, 3.0), 2)
+                self.stats["injected_429"] += 1
+            elif (self.rpm and used_requests >= self.rpm) or (self.tpm and used_tokens + tokens > self.tpm):
+                retry_after = round(WINDOW_SECONDS - (now - window[0][0]), 2) if window else 1.0
+                self.stats["limited_429"] += 1
+            else:
+                window.append((now, tokens))
+                used_requests += 1
+                used_tokens += tokens
+
+            headers = {
+                "x-ratelimit-limit-requests": str(limit_requests),
+                "x-ratelimit-limit-tokens": str(limit_tokens),
+                "x-ratelimit-remaining-requests": str(max(0, limit_requests - used_requests)),
+                "x-ratelimit-remaining-tokens": str(max(0, limit_tokens - used_tokens)),
+                "x-ratelimit-reset-requests": reset,
+                "x-ratelimit-reset-tokens": reset,
+            }
+            return retry_after, headers
+
+    def count(self, family: str, stream: bool, tool_calls: bool):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["streamed"] += int(stream)
+            self.stats["tool_calls"] += int(tool_calls)
+            self.stats["families"][family] = self.stats["families"].get(family, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(self.stats))
+
+
+# ============================================================
+# RESPONSES
+# ============================================================
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def _tool_call(name: str, message: str, user_id: str) -> Dict[str, Any]:
+    url = _URL.search(message)
+    arguments = {
+        "open_jd_matcher": {"url": url.group(0) if url else "https://example.com/jobs/1", "mode": "FULL_ANALYSIS"},
+        "open_job_hunter": {"role": "Full Stack Developer", "location": "Bangalore"},
+        "vector_search_jobs": {"query": message[:200], "user_id": user_id},
+        "fetch_scan_history": {"query": message[:200], "user_id": user_id},
+        "query_leetcode_questions": {"company": "Google", "limit": 3},
+        "get_profile_details": {"section": "skills", "user_id": user_id},
+        "internet_search": {"query": message[:200]},
+    }[name]
+    return {
+        "id": f"call_{uuid.uuid4().hex[:24]}",
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments)},
+    }
+
+
+def mentor_reply(messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """(family, content, tool_calls) for a tool-calling (mentor agent) request."""
+    last = messages[-1] if messages else {}
+    if last.get("role") == "tool":
+        result = _text(last.get("content"))[:300]
+        return "mentor_answer", f"Here's what I found based on your data: {result}", []
+
+    message = _text(last.get("content"))
+    offered = {t.get("function", {}).get("name") for t in tools}
+    system = next((_text(m.get("content")) for m in messages if m.get("role") == "system"), "")
+    user_id = _USER_ID.search(system)
+    lowered = message.lower()
+    for name, keywords in _TOOL_RULES:
+        if name in offered and any(k in lowered for k in keywords):
+            return f"mentor_tool:{name}", "", [_tool_call(name, message, user_id.group(1) if user_id else "unknown")]
+    return "mentor_answer", (
+        "Great question! Focus on one measurable project per skill you want to be hired for, "
+        "and tailor your resume's top third to each role you apply to."
+    ), []
+
+
+def completion_body(model: str, content: str, tool_calls: List[Dict[str, Any]], usage: Dict[str, Any]) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"role": "assistant", "content": content or None}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return {
+        "id": f"chatcmpl-{uuid.uuid4()}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "logprobs": None, "finish_reason": "tool_calls" if tool_calls else "stop"}],
+        "usage": usage,
+        "system_fingerprint": "fp_fake",
+        "x_groq": {"id": f"req_{uuid.uuid4().hex[:26]}"},
+    }
+
+
+def _usage(prompt_tokens: int, completion_tokens: int, seconds: float) -> Dict[str, Any]:
+    return {
+        "queue_time": 0.0,
+        "prompt_tokens": prompt_tokens,
+        "prompt_time": 0.0,
+        "completion_tokens": completion_tokens,
+        "completion_time": round(seconds, 4),
+        "total_tokens": prompt_tokens + completion_tokens,
+        "total_time": round(seconds, 4),
+    }
+
+
+# ============================================================
+# APP
+# ============================================================
+
+def create_app(fake: FakeGroq) -> FastAPI:
+    app = FastAPI(title="Fake Groq")
+
+    @app.get("/stats")
+    def stats():
+        return fake.snapshot()
+
+    @app.get("/openai/v1/models")
+    def models():
+        return {"object": "list", "data": [{"id": "llama-3.3-70b-versatile", "object": "model", "owned_by": "fake"}]}
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "llama-3.3-70b-versatile")
+        messages = body.get("messages", [])
+        tools = body.get("tools") or []
+        stream = bool(body.get("stream"))
+
+        prompt = "\n".join(_text(m.get("content")) for m in messages)
+        prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+        retry_after, headers = fake.admit(model, prompt_tokens)
+        if retry_after is not None:
+            headers["retry-after"] = str(retry_after)
+            return JSONResponse(status_code=429, headers=headers, content={"error": {
+                "message": f"Rate limit reached for model `{model}`. Please try again in {retry_after}s.",
+                "type": "tokens",
+                "code": "rate_limit_exceeded",
+            }})
+
+        if tools:
+            family, content, tool_calls = mentor_reply(messages, tools)
+        else:
+            family, content = match_prompt(prompt, fake.responses)
+            tool_calls = []
+        completion_tokens = (len(content) + len(json.dumps(tool_calls) if tool_calls else "")) // CHARS_PER_TOKEN
+        fake.count(family, stream, bool(tool_calls))
+        ttft = fake.first_token_delay(family)
+
+        if not stream:
+            seconds = ttft + fake.token_delay(completion_tokens)
+            await asyncio.sleep(seconds)
+            return JSONResponse(
+                headers=headers,
+                content=completion_body(model, content, tool_calls, _usage(prompt_tokens, completion_tokens, seconds)),
+            )
+
+        return StreamingResponse(
+            _stream(fake, model, content, tool_calls, prompt_tokens, completion_tokens, ttft),
+            media_type="text/event-stream",
+            headers=headers,
+        )
+
+    return app
+
+
+async def _stream(fake: FakeGroq, model: str, content: str, tool_calls: List[Dict[str, Any]],
+                  prompt_tokens: int, completion_tokens: int, ttft: float):
+    chunk_id = f"chatcmpl-{uuid.uuid4()}"
+    created = int(time.time())
+    start = time.monotonic()
+
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra) -> str:
+        body = {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "system_fingerprint": "fp_fake",
+            "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish_reason}],
+            **extra,
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    await asyncio.sleep(ttft)
+    yield chunk({"role": "assistant", "content": ""})
+    if tool_calls:
+        yield chunk({"tool_calls": [{"index": i, **call} for i, call in enumerate(tool_calls)]})
+    pause = fake.token_delay(STREAM_CHUNK_CHARS // CHARS_PER_TOKEN)
+    for i in range(0, len(content), STREAM_CHUNK_CHARS):
+        if pause:
+            await asyncio.sleep(pause)
+        yield chunk({"content": content[i:i + STREAM_CHUNK_CHARS]})
+    usage = _usage(prompt_tokens, completion_tokens, time.monotonic() - start)
+    yield chunk({}, "tool_calls" if tool_calls else "stop", x_groq={"id": f"req_{uuid.uuid4().hex[:26]}", "usage": usage})
+    yield "data: [DONE]\n\n"
+
+
+def _parse_family_latency(items: List[str]) -> Dict[str, str]:
+    overrides = {}
+    for item in items:
+        family, _, spec = item.partition("=")
+        if not spec:
+            raise SystemExit(f"--family-latency expects FAMILY=SPEC, got {item!r}")
+        overrides[family] = spec
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Groq-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8300)
+    parser.add_argument("--responses", default=DEFAULT_RESPONSES, help="Prompt marker fixtures")
+    parser.add_argument("--latency", default="fixed:0", help="Time to first token distribution")
+    parser.add_argument("--family-latency", action="append", default=[], help="FAMILY=SPEC override (repeatable)")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="Completion speed (0 = instant)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute per model (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="Prompt tokens per minute per model (0 = unlimited)")
+    parser.add_argument("--seed", type=int, help="Seed latency / 429 sampling")
+    args = parser.parse_args()
+
+    fake = FakeGroq(
+        load_responses(args.responses),
+        latency=args.latency,
+        family_latency=_parse_family_latency(args.family_latency),
+        tokens_per_sec=args.tokens_per_sec,
+        rate_429=args.rate_429,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        seed=args.seed,
+    )
+    print(f"Fake Groq on http://{args.host}:{args.port} (set GROQ_API_BASE to this URL)")
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
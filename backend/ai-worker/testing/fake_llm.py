@@ -0,0 +1,149 @@
+"""
+Fake ChatGroq - deterministic offline stand-in for the hunt's LLM calls
+
+Installed through utils.llm_client.set_model_factory(), so every
+get_chat_model() call (nodes, llm_cascade, batch_scorer) gets a FakeChatGroq.
+Responses are picked from the prompt:
+
+- Batch scoring ("Score these N jobs") and AI cleanup ("strict job relevance
+  filter") are answered per job, sized to the prompt, with scores/decisions
+  derived from a hash of the job title so every run gives the same result
+- Other prompts are matched against fixtures/llm_responses.json
+  ({"responses": [{"marker": "...", "family": "...", "response": ...}]});
+  unmatched prompts get "{}"
+
+Latency is `latency` seconds plus up to `jitter` seconds, also derived from
+the prompt hash. Token usage (~4 chars/token) is reported like Groq's, and
+charged to the current usage scope.
+
+Usage:
+    from testing.fake_llm import install_fake_llm
+    install_fake_llm(latency=0.4, jitter=0.2)
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from utils.usage_tracker import record_llm
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+DEFAULT_RESPONSES = os.path.join(FIXTURES_DIR, "llm_responses.json")
+
+_CLEANUP_JOBS = re.compile(r"\*\*Jobs to Review:\*\*\n(.*?)\n\n\*\*STRICT", re.DOTALL)
+_SCORING_TITLES = re.compile(r"^\d+\. Title: (.*?)(?:  \[Candidate .*\])?$", re.MULTILINE)
+
+
+def _stable(text: str) -> int:
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def load_responses(path: str = DEFAULT_RESPONSES) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["responses"]
+
+
+def respond(prompt: str, responses: List[Dict[str, Any]]) -> str:
+    """Deterministic response text for a prompt."""
+    return match_prompt(prompt, responses)[1]
+
+
+def match_prompt(prompt: str, responses: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """(prompt family, deterministic response text) for a prompt."""
+    if prompt.startswith("Your previous JSON response had invalid parts"):
+        return "repair", "{}"
+
+    scoring = re.search(r"Score these (\d+) jobs", prompt)
+    if scoring:
+        count = int(scoring.group(1))
+        titles = (_SCORING_TITLES.findall(prompt) + [""] * count)[:count]
+        scores = [35 + _stable(title) % 60 for title in titles]
+        confidence = [round(0.55 + (_stable(title[::-1]) % 45) / 100, 2) for title in titles]
+        return "hunt_scores", json.dumps({"scores": scores, "confidence": confidence})
+
+    cleanup = _CLEANUP_JOBS.search(prompt)
+    if cleanup:
+        jobs = json.loads(cleanup.group(1))
+        return "hunt_cleanup", json.dumps({"decisions": [
+            {
+                "id": job["id"],
+                "keep": _stable(str(job.get("title"))) % 5 != 0,
+                "confidence": round(0.55 + (_stable(str(job.get("company"))) % 45) / 100, 2),
+            }
+            for job in jobs
+        ]})
+
+    for entry in responses:
+        if entry["marker"] in prompt:
+            response = entry["response"]
+            return entry.get("family", entry["marker"]), response if isinstance(response, str) else json.dumps(response)
+    return "unknown", "{}"
+
+
+class FakeChatGroq(BaseChatModel):
+    """ChatGroq stand-in: canned responses, simulated latency, Groq-style token usage."""
+
+    model_name: str = "fake"
+    latency: float = 0.0
+    jitter: float = 0.0
+    responses: List[Dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-groq"
+
+    def _prompt(self, messages) -> str:
+        return "\n".join(m.content for m in messages if isinstance(m.content, str))
+
+    def _delay(self, prompt: str) -> float:
+        return self.latency + self.jitter * (_stable(prompt) % 1000) / 1000
+
+    def _result(self, prompt: str, content: str, seconds: float) -> ChatResult:
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        }
+        record_llm(self.model_name, usage["prompt_tokens"], usage["completion_tokens"], seconds)
+        message = AIMessage(content=content, response_metadata={"token_usage": usage, "model_name": self.model_name})
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"token_usage": usage, "model_name": self.model_name},
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = self._prompt(messages)
+        start = time.monotonic()
+        content = respond(prompt, self.responses)
+        time.sleep(self._delay(prompt))
+        return self._result(prompt, content, time.monotonic() - start)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = self._prompt(messages)
+        start = time.monotonic()
+        content = respond(prompt, self.responses)
+        await asyncio.sleep(self._delay(prompt))
+        return self._result(prompt, content, time.monotonic() - start)
+
+
+def install_fake_llm(latency: float = 0.0, jitter: float = 0.0, responses_path: Optional[str] = None):
+    """Route get_chat_model() to FakeChatGroq and drop already-cached Groq models."""
+    from utils import llm_cascade
+    from utils.llm_client import set_model_factory
+
+    responses = load_responses(responses_path or DEFAULT_RESPONSES)
+
+    def factory(model, temperature=0.1, priority=None, **kwargs):
+        return FakeChatGroq(model_name=model, latency=latency, jitter=jitter, responses=responses)
+
+    set_model_factory(factory)
+    with llm_cascade._models_lock:
+        llm_cascade._models.clear()
@@ -0,0 +1,376 @@
+"""
+Synthetic job corpus - Adzuna-shaped jobs at any scale (1k-1M+) for scale tests
+
+The only real data we have is a handful of Adzuna responses
+(testing/get_adzuna_object.py, testing/fixtures/adzuna_responses.json).
+generate_jobs() yields jobs in the /jobs/in/search result shape, one at a
+time, with the distributions the hunt pipeline is sensitive to under control
+(CorpusProfile):
+
+- Titles: on-target (MERN / React / Node), adjacent stacks (Java, Django,
+  .NET...) and off-target roles (sales, support) by --title-mix
+- Companies: --elite-rate / --premier-rate draw from company_tiers'
+  ELITE_COMPANIES / PREMIER_COMPANIES (sometimes with "India Pvt Ltd"
+  suffixes), the rest from a long tail of services firms and startups
+- Salary presence (--salary-rate; Adzuna omits the fields otherwise)
+- YoE phrases in the description (--yoe-rate), in the phrasings
+  extract_required_yoe_from_desc and generate_gap_analysis look for
+- Poison keywords (--poison-rate): on-target titles whose description
+  repeats an off-stack technology, which relevance_ranker penalises
+- Exact duplicates (--duplicate-rate) and near-duplicates
+  (--near-duplicate-rate): reposts with a new id/url, case/whitespace title
+  variants, and location-suffixed titles dedupe_jobs does not catch
+- Posting age: exponential with --age-mean-days, capped at --max-age-days
+
+Duplicates are drawn from a window of recent jobs, so memory stays flat for
+any count. Output streams to JSONL (gzip for *.gz, "-" for stdout);
+read_jsonl() streams it back. Generation is deterministic per --seed and
+--now (the UTC reference time posting ages count back from).
+
+Usage:
+    python testing/job_corpus.py --count 1000000 --out corpus.jsonl.gz [--seed 7] [--poison-rate 0.2]
+    python testing/job_corpus.py --count 1000 --out fixed.jsonl --now 2026-01-01T00:00:00Z
+    python testing/job_corpus.py --count 1000 --out - | head -1
+    python -m testing.microbench --source corpus --corpus corpus.jsonl.gz
+"""
+
+import os
+import sys
+import gzip
+import json
+import random
+import argparse
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.company_tiers import ELITE_COMPANIES, PREMIER_COMPANIES
+
+TARGET_TITLES = [
+    "MERN Stack Developer", "Full Stack Developer", "React Developer", "React.js Developer",
+    "Node.js Developer", "Backend Engineer (Node.js)", "Frontend Engineer", "Software Engineer - Full Stack",
+    "JavaScript Developer", "Software Development Engineer II", "Full Stack Engineer (MERN)",
+]
+ADJACENT_TITLES = [
+    "Java Spring Boot Developer", "Python Django Developer", ".NET Developer", "Angular Developer",
+    "PHP Laravel Developer", "DevOps Engineer", "Data Engineer", "QA Automation Engineer", "Android Developer",
+]
+OFFTARGET_TITLES = [
+    "Sales Executive", "Business Development Manager", "Customer Support Associate", "HR Executive",
+    "Telecaller", "Relationship Manager - Loans", "Field Sales Officer", "Insurance Advisor",
+]
+SENIORITY = [("", 0.55), ("Senior ", 0.2), ("Junior ", 0.1), ("Lead ", 0.08), ("Associate ", 0.07)]
+
+TARGET_SKILLS = ["React", "Node.js", "Express", "MongoDB", "JavaScript", "TypeScript", "Redux", "Next.js",
+                 "REST APIs", "GraphQL", "Docker", "AWS", "PostgreSQL", "Redis", "Jest"]
+ADJACENT_SKILLS = {
+    "Java": ["Java", "Spring Boot", "Hibernate", "MySQL", "Microservices"],
+    "Django": ["Python", "Django", "Flask", "PostgreSQL", "Celery"],
+    ".NET": [".NET", "C#", "ASP.NET", "SQL Server", "Azure"],
+    "Angular": ["Angular", "TypeScript", "RxJS", "NgRx", "HTML/CSS"],
+    "PHP": ["PHP", "Laravel", "MySQL", "WordPress", "jQuery"],
+    "DevOps": ["Kubernetes", "Terraform", "AWS", "Jenkins", "Docker"],
+    "Data": ["Python", "Spark", "Airflow", "SQL", "Kafka"],
+    "QA": ["Selenium", "Cypress", "Java", "TestNG", "Postman"],
+    "Android": ["Kotlin", "Java", "Android SDK", "Jetpack Compose", "Firebase"],
+}
+OFFTARGET_DUTIES = ["meet monthly sales targets", "handle inbound customer calls", "generate leads",
+                    "manage client relationships", "coordinate field visits", "maintain CRM records"]
+POISON_KEYWORDS = ["spring boot", "django", "laravel", ".net", "php", "angular", "vue", "ruby on rails", "flask"]
+
+YOE_PHRASES = [
+    "{n}+ years of experience", "{n}-{m} years of experience", "minimum {n} years", "at least {n} years of hands-on experience",
+    "{n} to {m} years experience", "experience of {n}+ years", "{n}+ yrs experience",
+]
+YOE_WEIGHTS = [8, 12, 16, 16, 14, 10, 8, 6, 4, 3, 3]  # 0..10 years
+
+TAIL_COMPANIES = [
+    "Infosys", "TCS", "Wipro", "HCLTech", "Tech Mahindra", "Cognizant", "Accenture", "Capgemini", "LTIMindtree",
+    "Mphasis", "Persistent Systems", "Teamlease", "Randstad India", "Quess Corp", "ThoughtWorks", "Freshworks",
+    "Zoho", "Postman", "BrowserStack", "Chargebee", "InMobi", "Groww", "Slice", "Jupiter", "Fi Money",
+]
+_TAIL_PREFIX = ["Nimbus", "Quantum", "Bluefin", "Kestrel", "Vertex", "Saffron", "Indigo", "Cobalt", "Helix", "Orbit",
+                "Lumen", "Pinecone", "Maple", "Sierra", "Nova", "Aster", "Crimson", "Delta", "Zenith", "Arbor"]
+_TAIL_SUFFIX = ["Labs", "Technologies", "Softech", "Systems", "Digital", "Solutions", "Infotech", "Works", "Analytics", "Cloud"]
+_COMPANY_SUFFIX = ["", "", " India", " India Pvt Ltd", " Private Limited"]
+
+LOCATIONS = [
+    ("Bangalore", "Karnataka", ["Koramangala", "Whitefield", "HSR Layout", "Indiranagar", "Electronic City"]),
+    ("Gurgaon", "Haryana", ["Cyber City", "Sohna Road", "Udyog Vihar"]),
+    ("Hyderabad", "Telangana", ["HITEC City", "Gachibowli", "Madhapur"]),
+    ("Pune", "Maharashtra", ["Hinjewadi", "Kharadi", "Baner"]),
+    ("Mumbai", "Maharashtra", ["Andheri", "Powai", "Lower Parel"]),
+    ("Chennai", "Tamil Nadu", ["OMR", "Guindy", "Tidel Park"]),
+    ("Noida", "Uttar Pradesh", ["Sector 62", "Sector 132"]),
+]
+
+
+class CorpusProfile:
+    """
+    Distribution knobs for generate_jobs(). duplicate_rate / near_duplicate_rate
+    are fractions of all generated jobs; the other rates apply to fresh jobs
+    (poison_rate to fresh on-target ones).
+    """
+
+    def __init__(self, title_mix=(0.6, 0.25, 0.15), elite_rate: float = 0.05, premier_rate: float = 0.08,
+                 salary_rate: float = 0.55, yoe_rate: float = 0.7, poison_rate: float = 0.1,
+                 duplicate_rate: float = 0.05, near_duplicate_rate: float = 0.08,
+                 age_mean_days: float = 7.0, max_age_days: int = 45, duplicate_window: int = 2000):
+        self.title_mix = tuple(title_mix)
+        self.elite_rate = elite_rate
+        self.premier_rate = premier_rate
+        self.salary_rate = salary_rate
+        self.yoe_rate = yoe_rate
+        self.poison_rate = poison_rate
+        self.duplicate_rate = duplicate_rate
+        self.near_duplicate_rate = near_duplicate_rate
+        self.age_mean_days = age_mean_days
+        self.max_age_days = max_age_days
+        self.duplicate_window = duplicate_window
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+
+# ============================================================
+# GENERATION
+# ============================================================
+
+def _article(word: str) -> str:
+    return "an" if word[:1].lower() in "aeiou." else "a"
+
+
+class _Generator:
+    def __init__(self, profile: CorpusProfile, seed: int, now: datetime):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.now = now
+        self.elite = sorted(ELITE_COMPANIES)
+        self.premier = sorted(PREMIER_COMPANIES - ELITE_COMPANIES)
+        self.tail = TAIL_COMPANIES + [f"{p} {s}" for p in _TAIL_PREFIX for s in _TAIL_SUFFIX]
+        self.stats: Dict[str, int] = {}
+
+    def count(self, key: str):
+        self.stats[key] = self.stats.get(key, 0) + 1
+
+    def _company(self) -> str:
+        rng, p = self.rng, self.profile
+        roll = rng.random()
+        if roll < p.elite_rate:
+            self.count("elite")
+            return rng.choice(self.elite).title() + rng.choice(_COMPANY_SUFFIX)
+        if roll < p.elite_rate + p.premier_rate:
+            self.count("premier")
+            return rng.choice(self.premier).title() + rng.choice(_COMPANY_SUFFIX)
+        return rng.choice(self.tail)
+
+    def _title(self):
+        rng = self.rng
+        family = rng.choices(("target", "adjacent", "offtarget"), weights=self.profile.title_mix)[0]
+        self.count(f"title_{family}")
+        if family == "offtarget":
+            return family, rng.choice(OFFTARGET_TITLES)
+        base = rng.choice(TARGET_TITLES if family == "target" else ADJACENT_TITLES)
+        prefix = rng.choices([s for s, _ in SENIORITY], weights=[w for _, w in SENIORITY])[0]
+        return family, prefix + base
+
+    def _description(self, family: str, title: str, city: str) -> str:
+        rng, p = self.rng, self.profile
+        if family == "offtarget":
+            duties = rng.sample(OFFTARGET_DUTIES, 3)
+            parts = [f"We are hiring {_article(title)} {title} in {city}. You will {duties[0]}, {duties[1]} and {duties[2]}."]
+            skills = ["communication", "MS Excel"]
+        else:
+            if family == "target":
+                skills = rng.sample(TARGET_SKILLS, 6)
+            else:
+                stack = next((v for k, v in ADJACENT_SKILLS.items() if k.lower() in title.lower()), TARGET_SKILLS)
+                skills = rng.sample(stack, min(5, len(stack)))
+            parts = [
+                f"We are hiring {_article(title)} {title} to build and scale customer-facing products in {city}.",
+                f"You will work with {', '.join(skills[:4])}, own services end to end, and collaborate with product and design.",
+                f"Strong fundamentals in {skills[0]} and {skills[1]} are essential; experience with {skills[-1]} is a plus.",
+            ]
+            if family == "target" and rng.random() < p.poison_rate:
+                poison = rng.choice(POISON_KEYWORDS)
+                parts.append(f"Our core platform runs on {poison}, so most work is {poison} services and {poison} tooling.")
+                self.count("poison")
+        if rng.random() < p.yoe_rate:
+            n = rng.choices(range(len(YOE_WEIGHTS)), weights=YOE_WEIGHTS)[0]
+            parts.append("Requirements: " + rng.choice(YOE_PHRASES).format(n=n, m=n + rng.randint(1, 3)) + ".")
+            self.count("yoe_phrase")
+        parts.append(rng.choice([
+            "Competitive pay, flexible hours and a hybrid setup.", "Health insurance, ESOPs and learning budget.",
+            "Work from office five days a week.", "Remote-friendly team with quarterly offsites.",
+        ]))
+        return " ".join(parts)
+
+    def fresh(self, index: int) -> Dict[str, Any]:
+        rng, p = self.rng, self.profile
+        family, title = self._title()
+        city, state, areas = rng.choice(LOCATIONS)
+        area = rng.choice(areas)
+        age = min(p.max_age_days, rng.expovariate(1 / p.age_mean_days) if p.age_mean_days > 0 else 0)
+        job_id = str(4_900_000_000 + index)
+        job = {
+            "__CLASS__": "Adzuna::API::Response::Job",
+            "id": job_id,
+            "adref": "eyJhbGciOiJIUzI1NiJ9." + "%09x" % rng.getrandbits(36),
+            "title": title,
+            "description": self._description(family, title, city),
+            "created": (self.now - timedelta(days=age)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "redirect_url": f"https://www.adzuna.in/land/ad/{job_id}?se=corpus&utm_medium=api&utm_source=corpus",
+            "company": {"__CLASS__": "Adzuna::API::Response::Company", "display_name": self._company()},
+            "location": {
+                "__CLASS__": "Adzuna::API::Response::Location",
+                "display_name": f"{area}, {city}",
+                "area": ["India", state, city, area],
+            },
+            "category": (
+                {"__CLASS__": "Adzuna::API::Response::Category", "label": "Sales Jobs", "tag": "sales-jobs"}
+                if family == "offtarget" else
+                {"__CLASS__": "Adzuna::API::Response::Category", "label": "IT Jobs", "tag": "it-jobs"}
+            ),
+            "salary_is_predicted": "0",
+        }
+        if rng.random() < p.salary_rate:
+            # Lognormal around ~10 LPA, rounded like real postings; both bounds are floats, as Adzuna sends them
+            salary_min = round(rng.lognormvariate(13.8, 0.5), -5) or 300000.0
+            job["salary_min"] = salary_min
+            job["salary_max"] = salary_min + round(salary_min * rng.uniform(0.2, 0.6), -5)
+            job["salary_is_predicted"] = rng.choice(["0", "0", "1"])
+            self.count("salary")
+        return job
+
+    def near_duplicate(self, original: Dict[str, Any], index: int) -> Dict[str, Any]:
+        rng = self.rng
+        job = dict(original)
+        job_id = str(4_900_000_000 + index)
+        job["id"] = job_id
+        job["redirect_url"] = f"https://www.adzuna.in/land/ad/{job_id}?se=corpus&utm_medium=api&utm_source=corpus"
+        kind = rng.choice(("repost", "title_variant", "title_suffix"))
+        if kind == "title_variant":
+            job["title"] = rng.choice([job["title"].upper(), f"  {job['title']} ", job["title"].lower()])
+        elif kind == "title_suffix":
+            job["title"] = f"{job['title']} - {job['location']['area'][2]}"
+        self.count(f"near_duplicate_{kind}")
+        return job
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _parse_now(value: str) -> datetime:
+    try:
+        return _as_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO timestamp: {value!r}")
+
+
+def generate_jobs(count: int, profile: Optional[CorpusProfile] = None, seed: int = 7,
+                  now: Optional[datetime] = None, stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield `count` Adzuna-shaped jobs.
+
+    Args:
+        profile: Distribution knobs (defaults: CorpusProfile())
+        seed: Same seed + profile + now gives the same corpus
+        now: Reference time for `created` (default: current UTC time; naive values are taken as UTC)
+        stats: Filled with per-feature counts (titles, elite, salary, poison, duplicates...)
+    """
+    profile = profile or CorpusProfile()
+    generator = _Generator(profile, seed, _as_utc(now) if now else datetime.now(timezone.utc))
+    if stats is not None:
+        generator.stats = stats
+    recent: deque = deque(maxlen=max(1, profile.duplicate_window))
+    rng = generator.rng
+
+    for index in range(count):
+        roll = rng.random()
+        if recent and roll < profile.duplicate_rate:
+            generator.count("duplicate")
+            yield dict(rng.choice(recent))
+            continue
+        if recent and roll < profile.duplicate_rate + profile.near_duplicate_rate:
+            yield generator.near_duplicate(rng.choice(recent), index)
+            continue
+        job = generator.fresh(index)
+        recent.append(job)
+        yield job
+
+
+# ============================================================
+# JSONL I/O
+# ============================================================
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return sys.stdout if "w" in mode else sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_jsonl(path: str, jobs: Iterable[Dict[str, Any]]) -> int:
+    """Stream jobs to a JSONL file; returns the number written."""
+    written = 0
+    f = _open(path, "w")
+    try:
+        for job in jobs:
+            f.write(json.dumps(job, ensure_ascii=False) + "\n")
+            written += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return written
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream jobs back from a JSONL file."""
+    f = _open(path, "r")
+    try:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main():
+    defaults = CorpusProfile()
+    parser = argparse.ArgumentParser(description="Generate a synthetic Adzuna-shaped job corpus (JSONL)")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--out", default="-", help="Output path (.jsonl, .jsonl.gz) or - for stdout")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--now", type=_parse_now, default=None,
+                        help="Reference time for posting ages, ISO 8601 (default: current UTC time)")
+    parser.add_argument("--title-mix", type=float, nargs=3, default=defaults.title_mix,
+                        metavar=("TARGET", "ADJACENT", "OFFTARGET"), help="Relative title family weights")
+    for name in ("elite_rate", "premier_rate", "salary_rate", "yoe_rate", "poison_rate",
+                 "duplicate_rate", "near_duplicate_rate", "age_mean_days"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=getattr(defaults, name))
+    parser.add_argument("--max-age-days", type=int, default=defaults.max_age_days)
+    parser.add_argument("--duplicate-window", type=int, default=defaults.duplicate_window,
+                        help="Recent jobs duplicates are drawn from")
+    args = parser.parse_args()
+
+    profile = CorpusProfile(
+        title_mix=args.title_mix, elite_rate=args.elite_rate, premier_rate=args.premier_rate,
+        salary_rate=args.salary_rate, yoe_rate=args.yoe_rate, poison_rate=args.poison_rate,
+        duplicate_rate=args.duplicate_rate, near_duplicate_rate=args.near_duplicate_rate,
+        age_mean_days=args.age_mean_days, max_age_days=args.max_age_days, duplicate_window=args.duplicate_window,
+    )
+    stats: Dict[str, int] = {}
+    written = write_jsonl(args.out, generate_jobs(args.count, profile, args.seed, args.now, stats=stats))
+    # Summary on stderr so stdout output stays pure JSONL
+    now = args.now.strftime("%Y-%m-%dT%H:%M:%SZ") if args.now else None
+    print(json.dumps({"written": written, "seed": args.seed, "now": now, "profile": profile.to_dict(), "stats": stats}),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,650 @@
+"""
+Load test: one worker replica under N concurrent user sessions, offline
+
+Runs worker.main() unchanged, with every external dependency replaced:
+- RabbitMQ: testing/memory_broker.py through utils/transport.set_transport()
+  (RabbitMQ ack / nack / prefetch semantics; the worker's own prefetch 1)
+- MongoDB: mongomock (pip install mongomock; every client the worker and
+  utils/* create shares one in-process store), or a real mongod with
+  --mongo-uri. The worker always writes to the career_os database, so point
+  --mongo-uri at a throwaway server.
+- LLM: testing/fake_llm.FakeChatGroq (--llm-latency / --llm-jitter), or the
+  Groq-compatible testing/fake_groq_server.py with --llm-url, which also
+  exercises the HTTP client and the rate-limit scheduler
+- Adzuna: the recorded testing/fixtures/adzuna_responses.json (as in
+  testing/benchmark_hunt.py). With --cassette-dir, the HTTP calls hunts and
+  JD analyses make (Adzuna, embeddings, Groq with --llm-url) instead replay
+  recorded utils/cassette.py cassettes (hunt-*.json.gz / jd_analysis-*.json.gz,
+  assigned round-robin to the sessions)
+- Resume downloads: a local HTTP server serving testing/fixtures/resume.txt
+  as a .docx, one variant per user so the content-hash dedupe doesn't skip
+  the LLM calls (--same-resume serves identical bytes to everyone)
+
+A session is what one user does: upload a resume, analyse a JD (generated by
+testing/job_corpus.py), then start a hunt. Like the API gateway, the session
+writes the jd_analyses / huntersessions document, publishes the job, and
+waits until the worker acks or nacks it before the next step; a step is
+verified against the status the worker leaves in MongoDB.
+
+For each --sessions level, that many sessions start together (or --stagger
+seconds apart) and the report gives:
+- Per flow (resume / jd / hunt): messages, acks, nacks, and p50 / p95 / p99 /
+  max of queue wait (publish -> callback starts), service time (callback ->
+  ack / nack) and total time
+- Session latency percentiles, sessions/min and messages/min
+- Resource use: process CPU time and utilisation, peak / mean RSS, peak
+  thread count (psutil, if installed, adds the extraction pool's children)
+- Broker: max queue depth, redeliveries, dead-lettered / discarded messages,
+  hunt log messages streamed to job_hunt_logs_queue
+
+--consumers K runs K worker.main() loops (K connections) in this process; it
+shares one GIL, so it approximates K consumers, not K replicas.
+
+Usage:
+    python testing/load_test.py [--sessions 1 4 8 16] [--flows resume jd hunt] [--json out.json]
+    python testing/load_test.py --llm-latency 0.8 --llm-jitter 0.6 --stagger 2
+    python testing/load_test.py --mongo-uri mongodb://localhost:27017 --llm-url http://127.0.0.1:8300/openai/v1
+    python testing/load_test.py --cassette-dir cassettes/ --cassette-latency 1
+"""
+
+import io
+import os
+import sys
+import json
+import glob
+import time
+import uuid
+import shutil
+import zipfile
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from contextlib import redirect_stdout, redirect_stderr
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+RESUME = os.path.join(os.path.dirname(__file__), "fixtures", "resume.txt")
+MOCK_MONGO_URI = "mongodb://loadtest.mongo:27017"
+FLOWS = ("resume", "jd", "hunt")
+
+# Bound by boot(): importing the worker has to wait until the stand-ins are in place
+worker = None
+BasicProperties = None
+HUNT_LOG_QUEUE = RESUME_QUEUE_NAME = JD_QUEUE_NAME = JOB_HUNTER_QUEUE_NAME = None
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+# ============================================================
+# RESUME SERVER
+# ============================================================
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+
+def build_docx(text: str) -> bytes:
+    """Minimal .docx (one paragraph per line) that python-docx can open."""
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.splitlines()
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        docx.writestr("_rels/.rels", _RELS)
+        docx.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+class ResumeServer:
+    """Serves /resumes/<userId>.docx on 127.0.0.1 (what fileUrl points at)."""
+
+    def __init__(self, resume_text: str, same_resume: bool = False):
+        self.resume_text = resume_text
+        self.same_resume = same_resume
+        self.shared = build_docx(resume_text)
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                user_id = os.path.splitext(os.path.basename(self.path))[0]
+                body = server.document(user_id)
+                server.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, name="resume-server", daemon=True).start()
+
+    def document(self, user_id: str) -> bytes:
+        if self.same_resume:
+            return self.shared
+        return build_docx(f"{self.resume_text}\nReference: {user_id}")
+
+    def url(self, user_id: str) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/resumes/{user_id}.docx"
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+# ============================================================
+# MESSAGE TRACKING
+# ============================================================
+
+class Tracker:
+    """Broker observer: timestamps for the messages sessions publish, keyed by message_id."""
+
+    def __init__(self):
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.log_messages = 0
+
+    def expect(self, message_id: str, flow: str) -> Dict[str, Any]:
+        record = {"flow": flow, "done": threading.Event(), "outcome": None, "redelivered": 0}
+        self.records[message_id] = record
+        return record
+
+    def __call__(self, event: str, queue: str, message):
+        message_id = getattr(message.properties, "message_id", None)
+        record = self.records.get(message_id)
+        if record is None:
+            if event == "publish" and queue == HUNT_LOG_QUEUE:
+                self.log_messages += 1
+            return
+        now = time.monotonic()
+        if event == "publish":
+            record["published"] = message.published_at
+        elif event == "dispatch":
+            record["dispatched"] = now
+            record["redelivered"] += int(message.redelivered)
+        elif event in ("ack", "nack", "reject"):
+            record["outcome"] = event
+            record["settled"] = now
+            if event == "ack":
+                record["done"].set()
+        elif event in ("dead_letter", "discard"):
+            record["done"].set()
+
+
+# ============================================================
+# SESSIONS
+# ============================================================
+
+class LoadContext:
+    def __init__(self, args, broker, tracker, resumes, db, jds, criteria, cassettes):
+        self.args = args
+        self.broker = broker
+        self.tracker = tracker
+        self.resumes = resumes
+        self.db = db
+        self.jds = jds
+        self.criteria = criteria
+        self.cassettes = cassettes
+
+
+def _publish(ctx: LoadContext, queue: str, flow: str, job: Dict[str, Any]) -> Dict[str, Any]:
+    message_id = uuid.uuid4().hex
+    record = ctx.tracker.expect(message_id, flow)
+    ctx.broker.publish("", queue, json.dumps(job), BasicProperties(
+        delivery_mode=2, message_id=message_id, content_type="application/json"
+    ))
+    if not record["done"].wait(ctx.args.timeout):
+        record["outcome"] = "timeout"
+    return record
+
+
+def _link_cassette(ctx: LoadContext, kind: str, name: str, index: int):
+    recorded = ctx.cassettes.get(kind)
+    if recorded:
+        os.symlink(recorded[index % len(recorded)], os.path.join(os.environ["CASSETTE_DIR"], f"{name}.json.gz"))
+
+
+def run_session(ctx: LoadContext, index: int, tag: str) -> Dict[str, Any]:
+    user_id = f"load_{tag}_{index}"
+    now = time.time()
+    session = {"user_id": user_id, "steps": {}}
+    start = time.monotonic()
+
+    for flow in ctx.args.flows:
+        if flow == "resume":
+            record = _publish(ctx, RESUME_QUEUE_NAME, flow, {
+                "userId": user_id, "fileUrl": ctx.resumes.url(user_id), "fileName": f"{user_id}.docx",
+            })
+            doc = ctx.db["partial_profiles"].find_one({"user_id": user_id}) or {}
+            verified = doc.get("status") == "validated"
+        elif flow == "jd":
+            run_id = f"{user_id}-jd"
+            ctx.db["jd_analyses"].insert_one({
+                "clerkId": user_id, "runId": run_id, "jdText": ctx.jds[index % len(ctx.jds)],
+                "status": "pending", "errorMessage": None, "analysisResults": None, "createdAt": now,
+            })
+            _link_cassette(ctx, "jd_analysis", f"jd_analysis-{run_id}", index)
+            record = _publish(ctx, JD_QUEUE_NAME, flow, {"clerkId": user_id, "runId": run_id})
+            doc = ctx.db["jd_analyses"].find_one({"runId": run_id}) or {}
+            verified = doc.get("status") == "complete"
+        else:
+            session_id = f"{user_id}-hunt"
+            ctx.db["huntersessions"].insert_one({
+                "userId": user_id, "sessionId": session_id, "status": "queued", "criteria": ctx.criteria,
+                "logs": ["Job hunt session created"], "createdAt": now,
+            })
+            _link_cassette(ctx, "hunt", f"hunt-{session_id}", index)
+            record = _publish(ctx, JOB_HUNTER_QUEUE_NAME, flow, {
+                "sessionId": session_id, "userId": user_id, "criteria": ctx.criteria,
+            })
+            doc = ctx.db["huntersessions"].find_one({"sessionId": session_id}) or {}
+            verified = doc.get("status") == "completed"
+
+        session["steps"][flow] = record
+        record["verified"] = record["outcome"] == "ack" and verified
+        if not record["verified"]:
+            break  # Later steps need this one's output (resume text, profile)
+
+    session["seconds"] = time.monotonic() - start
+    session["ok"] = len(session["steps"]) == len(ctx.args.flows) and all(
+        step["verified"] for step in session["steps"].values()
+    )
+    return session
+
+
+# ============================================================
+# RESOURCES
+# ============================================================
+
+def _rss_bytes() -> int:
+    if PSUTIL_AVAILABLE:
+        process = psutil.Process()
+        return process.memory_info().rss + sum(
+            child.memory_info().rss for child in process.children(recursive=True)
+        )
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _cpu_seconds() -> float:
+    if PSUTIL_AVAILABLE:
+        process = psutil.Process()
+        total = sum(process.cpu_times()[:2])
+        for child in process.children(recursive=True):
+            try:
+                total += sum(child.cpu_times()[:2])
+            except psutil.NoSuchProcess:
+                pass
+        return total
+    return time.process_time()
+
+
+class ResourceSampler:
+    """Samples RSS, thread count and queue depths every `interval` seconds."""
+
+    def __init__(self, broker, interval: float = 0.25):
+        self.broker = broker
+        self.interval = interval
+        self.samples: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            queues = self.broker.stats()["queues"]
+            self.samples.append({
+                "rss": _rss_bytes(),
+                "threads": threading.active_count(),
+                "ready": sum(q["depth"] for q in queues.values()),
+            })
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.cpu = _cpu_seconds()
+        self.wall = time.monotonic()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.cpu = _cpu_seconds() - self.cpu
+        self.wall = time.monotonic() - self.wall
+
+    def summary(self) -> Dict[str, Any]:
+        rss = [s["rss"] for s in self.samples] or [_rss_bytes()]
+        return {
+            "cpu_s": round(self.cpu, 2),
+            "cpu_util": round(self.cpu / self.wall, 3) if self.wall else 0.0,
+            "rss_peak_mb": round(max(rss) / 1024 / 1024, 1),
+            "rss_mean_mb": round(sum(rss) / len(rss) / 1024 / 1024, 1),
+            "threads_peak": max((s["threads"] for s in self.samples), default=threading.active_count()),
+            "ready_peak": max((s["ready"] for s in self.samples), default=0),
+            "children_included": PSUTIL_AVAILABLE,
+        }
+
+
+# ============================================================
+# REPORTING
+# ============================================================
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values)
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    pick = lambda q: round(values[min(len(values) - 1, int(q * len(values)))], 3)
+    return {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": round(values[-1], 3)}
+
+
+def summarise_level(level: int, sessions: List[Dict[str, Any]], wall: float, resources: Dict[str, Any],
+                    broker_before: Dict[str, Any], broker_after: Dict[str, Any], logs: int) -> Dict[str, Any]:
+    flows = {}
+    for flow in FLOWS:
+        steps = [s["steps"][flow] for s in sessions if flow in s["steps"]]
+        if not steps:
+            continue
+        dispatched = [s for s in steps if "dispatched" in s]
+        settled = [s for s in dispatched if "settled" in s]
+        flows[flow] = {
+            "messages": len(steps),
+            "acked": sum(s["outcome"] == "ack" for s in steps),
+            "nacked": sum(s["outcome"] in ("nack", "reject") for s in steps),
+            "timeouts": sum(s["outcome"] == "timeout" for s in steps),
+            "verified": sum(s["verified"] for s in steps),
+            "redelivered": sum(s["redelivered"] for s in steps),
+            "queue_wait_s": _percentiles([s["dispatched"] - s["published"] for s in dispatched]),
+            "service_s": _percentiles([s["settled"] - s["dispatched"] for s in settled]),
+            "total_s": _percentiles([s["settled"] - s["published"] for s in settled]),
+        }
+
+    queues = {}
+    for name, after in broker_after["queues"].items():
+        before = broker_before["queues"].get(name, {})
+        queues[name] = {
+            "max_depth": after["max_depth"],
+            **{key: after[key] - before.get(key, 0) for key in ("published", "redelivered", "dead_lettered", "discarded")},
+        }
+
+    messages = sum(f["messages"] for f in flows.values())
+    return {
+        "sessions": level,
+        "ok": sum(s["ok"] for s in sessions),
+        "failed": sum(not s["ok"] for s in sessions),
+        "wall_s": round(wall, 3),
+        "sessions_per_min": round(level / wall * 60, 2) if wall else None,
+        "messages_per_min": round(messages / wall * 60, 2) if wall else None,
+        "session_s": _percentiles([s["seconds"] for s in sessions]),
+        "flows": flows,
+        "resources": resources,
+        "queues": queues,
+        "dropped": broker_after["dropped"] - broker_before["dropped"],
+        "hunt_log_messages": logs,
+    }
+
+
+def print_level(report: Dict[str, Any], out):
+    r = report["resources"]
+    print(f"\nsessions={report['sessions']}  ok={report['ok']} failed={report['failed']}  wall={report['wall_s']:.1f}s  "
+          f"{report['sessions_per_min']} sessions/min  {report['messages_per_min']} msgs/min  "
+          f"session p50={report['session_s']['p50']}s p95={report['session_s']['p95']}s", file=out)
+    print(f"  cpu={r['cpu_s']}s ({r['cpu_util'] * 100:.0f}%)  rss peak={r['rss_peak_mb']}MB mean={r['rss_mean_mb']}MB  "
+          f"threads peak={r['threads_peak']}  ready peak={r['ready_peak']}  hunt logs={report['hunt_log_messages']}", file=out)
+    print(f"  {'flow':<7s} {'msgs':>5s} {'ack':>4s} {'nack':>5s} {'t/o':>4s} {'wait p50':>9s} {'wait p95':>9s} "
+          f"{'svc p50':>8s} {'svc p95':>8s} {'total p95':>10s} {'total p99':>10s}", file=out)
+    fmt = lambda v: "-" if v is None else f"{v:.2f}"
+    for flow, f in report["flows"].items():
+        print(f"  {flow:<7s} {f['messages']:5d} {f['acked']:4d} {f['nacked']:5d} {f['timeouts']:4d} "
+              f"{fmt(f['queue_wait_s']['p50']):>9s} {fmt(f['queue_wait_s']['p95']):>9s} "
+              f"{fmt(f['service_s']['p50']):>8s} {fmt(f['service_s']['p95']):>8s} "
+              f"{fmt(f['total_s']['p95']):>10s} {fmt(f['total_s']['p99']):>10s}", file=out)
+
+
+def _commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+# ============================================================
+# SETUP
+# ============================================================
+
+def boot(args):
+    """
+    Configure the stand-ins and import the worker. Order matters: env before
+    any repo import (modules read it at import), the mongomock patch before
+    anything does `from pymongo import MongoClient`, and benchmark_hunt
+    (which clears MONGODB_URI) before the URI is set.
+    """
+    global worker, BasicProperties, HUNT_LOG_QUEUE, RESUME_QUEUE_NAME, JD_QUEUE_NAME, JOB_HUNTER_QUEUE_NAME
+
+    os.environ["GROQ_API_KEY"] = os.environ.get("GROQ_API_KEY") or "loadtest"
+    # Set (even empty) so the worker's load_dotenv() can't bring in live keys
+    for var in ("GEMINI_API_KEY", "TAVILY_API_KEY"):
+        os.environ[var] = ""
+    os.environ["ADZUNA_REQUEST_SPACING"] = "0"
+    os.environ.setdefault("ADZUNA_APP_ID", "loadtest")
+    os.environ.setdefault("ADZUNA_APP_KEY", "loadtest")
+    os.environ.setdefault("TRACING_ENABLED", "false")
+    os.environ.setdefault("LOG_LEVEL", "INFO" if args.verbose else "WARNING")
+    if args.llm_url:
+        os.environ["GROQ_API_BASE"] = args.llm_url
+
+    cassettes = {}
+    if args.cassette_dir:
+        for kind in ("hunt", "jd_analysis"):
+            cassettes[kind] = sorted(glob.glob(os.path.join(os.path.abspath(args.cassette_dir), f"{kind}-*.json.gz")))
+        missing = [kind for kind, flow in (("hunt", "hunt"), ("jd_analysis", "jd"))
+                   if flow in args.flows and not cassettes[kind]]
+        if missing:
+            sys.exit(f"No {' / '.join(k + '-*.json.gz' for k in missing)} cassettes in {args.cassette_dir}; "
+                     f"record some or drop those flows with --flows")
+        # Sessions get symlinks named after their own runId / sessionId
+        os.environ["CASSETTE_MODE"] = "replay"
+        os.environ["CASSETTE_DIR"] = tempfile.mkdtemp(prefix="loadtest-cassettes-")
+        os.environ["CASSETTE_LATENCY"] = str(args.cassette_latency)
+    else:
+        os.environ["CASSETTE_MODE"] = "off"
+
+    if not args.mongo_uri:
+        try:
+            import mongomock
+        except ImportError:
+            sys.exit("mongomock is not installed (pip install mongomock); or pass --mongo-uri for a local mongod")
+        mongomock.patch(servers=(("loadtest.mongo", 27017),)).start()
+
+    from testing.benchmark_hunt import AdzunaFixtures, DEFAULT_CRITERIA, FIXTURES
+    from testing.fake_llm import install_fake_llm
+    from testing.memory_broker import BasicProperties as _BasicProperties
+    from utils import async_adzuna
+    from utils.logging_setup import HUNT_LOG_QUEUE as _HUNT_LOG_QUEUE
+
+    os.environ["MONGODB_URI"] = args.mongo_uri or MOCK_MONGO_URI
+    if not args.llm_url:
+        install_fake_llm(latency=args.llm_latency, jitter=args.llm_jitter)
+    if not args.cassette_dir:
+        async_adzuna.fetch_job_async = AdzunaFixtures(FIXTURES, args.adzuna_latency).fetch_job_async
+
+    import worker as _worker
+
+    worker = _worker
+    BasicProperties = _BasicProperties
+    HUNT_LOG_QUEUE = _HUNT_LOG_QUEUE
+    RESUME_QUEUE_NAME, JD_QUEUE_NAME, JOB_HUNTER_QUEUE_NAME = (
+        worker.RESUME_QUEUE_NAME, worker.JD_QUEUE_NAME, worker.JOB_HUNTER_QUEUE_NAME
+    )
+    return DEFAULT_CRITERIA, cassettes
+
+
+def start_consumers(broker, count: int):
+    from utils.transport import set_transport
+    from testing.memory_broker import InMemoryTransport
+
+    set_transport(InMemoryTransport(broker))
+    for i in range(count):
+        threading.Thread(target=worker.main, name=f"worker-{i}", daemon=True).start()
+
+    # The API gateway's log consumer: drain hunt logs so they don't pile up
+    channel = broker.connect().channel()
+    channel.queue_declare(queue=HUNT_LOG_QUEUE, durable=True)
+    channel.basic_consume(queue=HUNT_LOG_QUEUE, on_message_callback=lambda *a: None, auto_ack=True)
+    threading.Thread(target=channel.start_consuming, name="log-consumer", daemon=True).start()
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        queue = broker.stats()["queues"].get(worker.JOB_HUNTER_QUEUE_NAME)
+        if queue and queue["consumers"] >= count:
+            return
+        time.sleep(0.05)
+    raise RuntimeError("Worker consumers did not start")
+
+
+def run_level(ctx: LoadContext, level: int, tag: str) -> Dict[str, Any]:
+    sessions: List[Optional[Dict[str, Any]]] = [None] * level
+    logs_before = ctx.tracker.log_messages
+    broker_before = ctx.broker.stats()
+
+    def one(i):
+        sessions[i] = run_session(ctx, i, tag)
+
+    with ResourceSampler(ctx.broker) as sampler:
+        threads = []
+        for i in range(level):
+            thread = threading.Thread(target=one, args=(i,), name=f"session-{i}")
+            thread.start()
+            threads.append(thread)
+            if ctx.args.stagger:
+                time.sleep(ctx.args.stagger)
+        for thread in threads:
+            thread.join()
+
+    return summarise_level(level, sessions, sampler.wall, sampler.summary(), broker_before,
+                           ctx.broker.stats(), ctx.tracker.log_messages - logs_before)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline multi-session load test of one worker replica")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8], help="Concurrent sessions per level")
+    parser.add_argument("--flows", nargs="+", choices=FLOWS, default=list(FLOWS), help="Steps each session runs, in order")
+    parser.add_argument("--consumers", type=int, default=1, help="worker.main() loops in this process")
+    parser.add_argument("--stagger", type=float, default=0.0, help="Seconds between session starts within a level")
+    parser.add_argument("--timeout", type=float, default=900.0, help="Seconds to wait for each ack / nack")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM base latency (s)")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Extra fake LLM latency, up to (s)")
+    parser.add_argument("--llm-url", help="Use a Groq-compatible server (testing/fake_groq_server.py) instead")
+    parser.add_argument("--adzuna-latency", type=float, default=0.0, help="Per-request Adzuna fixture latency (s)")
+    parser.add_argument("--cassette-dir", help="Replay recorded hunt-* / jd_analysis-* cassettes from here")
+    parser.add_argument("--cassette-latency", type=float, default=0.0, help="Fraction of recorded latency to replay")
+    parser.add_argument("--mongo-uri", help="Use this MongoDB instead of mongomock (writes to career_os)")
+    parser.add_argument("--resume", default=RESUME, help="Resume text served as each user's .docx")
+    parser.add_argument("--same-resume", action="store_true", help="Serve identical resume bytes to every user")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip the untimed warm-up session")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep worker output")
+    args = parser.parse_args()
+
+    console = sys.stdout
+    sink = sys.stdout if args.verbose else open(os.devnull, "w")
+    # Embedding / extraction fallbacks print tracebacks to stderr; failures still land in the report
+    with redirect_stdout(sink), redirect_stderr(sink):
+        criteria, cassettes = boot(args)
+
+        from pymongo import MongoClient
+        from testing.job_corpus import generate_jobs, CorpusProfile
+        from testing.memory_broker import InMemoryBroker
+
+        with open(args.resume, encoding="utf-8") as f:
+            resumes = ResumeServer(f.read(), args.same_resume)
+        jds = [
+            f"{job['title']}\n{job['company']['display_name']} - {job['location']['display_name']}\n\n{job['description']}"
+            for job in generate_jobs(max(args.sessions), CorpusProfile(title_mix=(1, 0, 0), duplicate_rate=0, near_duplicate_rate=0))
+        ]
+        tracker = Tracker()
+        broker = InMemoryBroker(observer=tracker)
+        db = MongoClient(os.environ["MONGODB_URI"])["career_os"]
+        ctx = LoadContext(args, broker, tracker, resumes, db, jds, criteria, cassettes)
+        start_consumers(broker, args.consumers)
+
+        report = {
+            "benchmark": "load_test",
+            "commit": _commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "config": {
+                "flows": args.flows,
+                "consumers": args.consumers,
+                "stagger": args.stagger,
+                "mongo": "local" if args.mongo_uri else "mongomock",
+                "llm": args.llm_url or {"fake": True, "latency": args.llm_latency, "jitter": args.llm_jitter},
+                "adzuna": None if args.cassette_dir else {"fixtures": True, "latency": args.adzuna_latency},
+                "cassettes": {k: len(v) for k, v in cassettes.items()} or None,
+                "same_resume": args.same_resume,
+            },
+            "levels": [],
+        }
+
+        run_token = uuid.uuid4().hex[:6]
+        try:
+            if not args.no_warmup:
+                run_level(ctx, 1, f"{run_token}w")
+            for index, level in enumerate(args.sessions):
+                result = run_level(ctx, level, f"{run_token}{index}")
+                report["levels"].append(result)
+                print_level(result, console)
+        finally:
+            broker.shutdown()
+            resumes.close()
+            worker.shutdown_batchers(timeout=10)
+            worker.shutdown_pool()
+            if args.cassette_dir:
+                shutil.rmtree(os.environ["CASSETTE_DIR"], ignore_errors=True)
+
+    report["broker"] = broker.stats()
+    report["resume_downloads"] = resumes.requests
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+    return 1 if any(level["failed"] for level in report["levels"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,536 @@
+"""
+In-memory broker - an in-process RabbitMQ stand-in for driving worker.py
+
+InMemoryTransport plugs into utils/transport.py, so worker.main() and its
+callbacks run unchanged against queues that live in this process. Channels
+follow pika's BlockingChannel API and RabbitMQ's delivery semantics, which are
+what the worker relies on:
+
+- Default exchange only: basic_publish(exchange="", routing_key=<queue>).
+  Unroutable messages are dropped and counted (no mandatory / basic.return)
+- queue_declare is idempotent; redeclaring with different durable / arguments
+  closes the channel with 406 PRECONDITION_FAILED, passive=True on a missing
+  queue with 404 NOT_FOUND
+- basic_qos(prefetch_count) limits unacked deliveries per consumer created
+  afterwards (RabbitMQ's global=false); global_qos=True shares the limit
+  across the channel; 0 = unlimited. Messages are pushed round-robin to
+  consumers with capacity, so with the worker's three consumers and
+  prefetch 1 a channel can hold one unacked message per queue
+- Delivery tags are per channel and start at 1. Callbacks run one at a time
+  on the thread that called start_consuming(), like BlockingChannel; a
+  callback exception propagates out of start_consuming()
+- basic_ack / basic_nack / basic_reject settle one tag, or everything up to it
+  with multiple=True (delivery_tag=0 + multiple=True: everything outstanding).
+  An unknown or already-settled tag closes the channel with 406
+  PRECONDITION_FAILED; calls on a closed channel raise ChannelWrongStateError
+- requeue=True puts the message back at the head of its queue with
+  redelivered=True; requeue=False dead-letters it through the queue's
+  x-dead-letter-exchange ("" only) / x-dead-letter-routing-key, or discards it
+- Closing a channel or connection (or the broker) requeues its unacked
+  messages as redelivered, in their original order
+- auto_ack consumers settle on delivery
+
+The observer, if given, is called under the broker lock as
+observer(event, queue_name, message) for "publish", "deliver" (pushed to a
+channel), "dispatch" (callback about to run), "ack" / "nack" / "reject",
+"requeue", "dead_letter", "discard" and "drop"; it must not block.
+
+Usage:
+    broker = InMemoryBroker()
+    set_transport(InMemoryTransport(broker))
+    threading.Thread(target=worker.main, daemon=True).start()
+    broker.publish("", "job_hunter_queue", json.dumps(job), BasicProperties(message_id="..."))
+"""
+
+import os
+import sys
+import time
+import itertools
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.transport import Transport
+
+Observer = Callable[[str, str, "Message"], None]
+
+
+# ============================================================
+# ERRORS (same names as pika.exceptions)
+# ============================================================
+
+class AMQPError(Exception):
+    pass
+
+
+class ChannelClosedByBroker(AMQPError):
+    def __init__(self, reply_code: int, reply_text: str):
+        super().__init__(reply_code, reply_text)
+        self.reply_code = reply_code
+        self.reply_text = reply_text
+
+
+class ChannelWrongStateError(AMQPError):
+    pass
+
+
+class ConnectionClosed(AMQPError):
+    pass
+
+
+# ============================================================
+# FRAMES
+# ============================================================
+
+class BasicProperties:
+    """The pika.BasicProperties fields publishers here use."""
+
+    def __init__(self, delivery_mode: Optional[int] = None, message_id: Optional[str] = None,
+                 content_type: Optional[str] = None, timestamp: Optional[int] = None,
+                 headers: Optional[Dict[str, Any]] = None):
+        self.delivery_mode = delivery_mode
+        self.message_id = message_id
+        self.content_type = content_type
+        self.timestamp = timestamp
+        self.headers = headers
+
+
+class Deliver:
+    """Mirrors pika.spec.Basic.Deliver (the `method` callbacks receive)."""
+
+    def __init__(self, consumer_tag: str, delivery_tag: int, redelivered: bool, exchange: str, routing_key: str):
+        self.consumer_tag = consumer_tag
+        self.delivery_tag = delivery_tag
+        self.redelivered = redelivered
+        self.exchange = exchange
+        self.routing_key = routing_key
+
+
+class _DeclareOk:
+    def __init__(self, queue: str, message_count: int, consumer_count: int):
+        self.queue = queue
+        self.message_count = message_count
+        self.consumer_count = consumer_count
+
+
+class _Frame:
+    def __init__(self, method):
+        self.method = method
+
+
+class Message:
+    __slots__ = ("id", "body", "properties", "exchange", "routing_key", "redelivered", "published_at")
+
+    def __init__(self, id: int, body: bytes, properties, exchange: str, routing_key: str):
+        self.id = id
+        self.body = body
+        self.properties = properties
+        self.exchange = exchange
+        self.routing_key = routing_key
+        self.redelivered = False
+        self.published_at = time.monotonic()
+
+
+# ============================================================
+# BROKER
+# ============================================================
+
+class _Queue:
+    def __init__(self, name: str, durable: bool, arguments: Dict[str, Any]):
+        self.name = name
+        self.durable = durable
+        self.arguments = arguments
+        self.messages: deque = deque()
+        self.consumers: List["_Consumer"] = []
+        self.next_consumer = 0
+        self.counts = {key: 0 for key in (
+            "published", "delivered", "redelivered", "acked", "nacked", "rejected",
+            "requeued", "dead_lettered", "discarded",
+        )}
+        self.max_depth = 0
+
+
+class _Consumer:
+    def __init__(self, tag: str, queue: _Queue, channel: "InMemoryChannel", callback: Callable,
+                 auto_ack: bool, prefetch: int):
+        self.tag = tag
+        self.queue = queue
+        self.channel = channel
+        self.callback = callback
+        self.auto_ack = auto_ack
+        self.prefetch = prefetch
+        self.unacked = 0
+
+
+class InMemoryBroker:
+    """Queues, consumers and delivery state shared by every in-memory connection."""
+
+    def __init__(self, observer: Optional[Observer] = None):
+        self.lock = threading.RLock()
+        self.observer = observer
+        self.queues: Dict[str, _Queue] = {}
+        self.connections: List["InMemoryConnection"] = []
+        self.dropped = 0
+        self.closed = False
+        self._ids = itertools.count(1)
+
+    def _notify(self, event: str, queue: str, message: Message):
+        if self.observer is not None:
+            self.observer(event, queue, message)
+
+    def connect(self) -> "InMemoryConnection":
+        with self.lock:
+            if self.closed:
+                raise ConnectionClosed(320, "CONNECTION_FORCED - broker shut down")
+            connection = InMemoryConnection(self)
+            self.connections.append(connection)
+            return connection
+
+    def declare(self, name: str, durable: bool = False, arguments: Optional[Dict[str, Any]] = None) -> _Queue:
+        """Create a queue (or check an existing one) without a channel; raises ValueError on a mismatch."""
+        with self.lock:
+            queue = self.queues.get(name)
+            if queue is None:
+                queue = self.queues[name] = _Queue(name, durable, dict(arguments or {}))
+            elif queue.durable != durable or queue.arguments != dict(arguments or {}):
+                raise ValueError(f"PRECONDITION_FAILED - inequivalent arg for queue '{name}'")
+            return queue
+
+    def publish(self, exchange: str, routing_key: str, body, properties=None) -> Optional[int]:
+        """Route a message through the default exchange; returns its id, or None if it was unroutable."""
+        if exchange != "":
+            raise ValueError(f"Only the default exchange is supported, got '{exchange}'")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        with self.lock:
+            message = Message(next(self._ids), body, properties, exchange, routing_key)
+            queue = self.queues.get(routing_key)
+            if queue is None:
+                self.dropped += 1
+                self._notify("drop", routing_key, message)
+                return None
+            self._enqueue(queue, message)
+            self._dispatch(queue)
+            return message.id
+
+    def _enqueue(self, queue: _Queue, message: Message):
+        queue.messages.append(message)
+        queue.counts["published"] += 1
+        queue.max_depth = max(queue.max_depth, len(queue.messages))
+        self._notify("publish", queue.name, message)
+
+    def _dispatch(self, queue: _Queue):
+        while queue.messages and queue.consumers:
+            consumer = self._next_consumer(queue)
+            if consumer is None:
+                return
+            message = queue.messages.popleft()
+            queue.counts["delivered"] += 1
+            if message.redelivered:
+                queue.counts["redelivered"] += 1
+            consumer.channel._deliver(consumer, message)
+
+    def _next_consumer(self, queue: _Queue) -> Optional[_Consumer]:
+        count = len(queue.consumers)
+        for offset in range(count):
+            consumer = queue.consumers[(queue.next_consumer + offset) % count]
+            if consumer.channel._has_capacity(consumer):
+                queue.next_consumer = (queue.next_consumer + offset + 1) % count
+                return consumer
+        return None
+
+    def _settle(self, queue: _Queue, message: Message, outcome: str, requeue: bool):
+        queue.counts[{"ack": "acked", "nack": "nacked", "reject": "rejected"}[outcome]] += 1
+        self._notify(outcome, queue.name, message)
+        if outcome == "ack":
+            return
+        if requeue:
+            self._requeue(queue, [message])
+        else:
+            self._dead_letter(queue, message)
+
+    def _requeue(self, queue: _Queue, messages: List[Message]):
+        # Back to the head in original order, as close to their old position as RabbitMQ gets
+        for message in reversed(messages):
+            message.redelivered = True
+            queue.messages.appendleft(message)
+            queue.counts["requeued"] += 1
+            self._notify("requeue", queue.name, message)
+        queue.max_depth = max(queue.max_depth, len(queue.messages))
+
+    def _dead_letter(self, queue: _Queue, message: Message):
+        target = None
+        if queue.arguments.get("x-dead-letter-exchange") == "":
+            target = self.queues.get(queue.arguments.get("x-dead-letter-routing-key", message.routing_key))
+        if target is None or target is queue:
+            queue.counts["discarded"] += 1
+            self._notify("discard", queue.name, message)
+            return
+        queue.counts["dead_lettered"] += 1
+        self._notify("dead_letter", queue.name, message)
+        copy = Message(next(self._ids), message.body, message.properties, "", target.name)
+        self._enqueue(target, copy)
+        self._dispatch(target)
+
+    def shutdown(self):
+        """Close every connection (unacked messages are requeued) and refuse new ones."""
+        with self.lock:
+            self.closed = True
+            connections = list(self.connections)
+        for connection in connections:
+            connection.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            unacked: Dict[str, int] = {}
+            for connection in self.connections:
+                for channel in connection.channels:
+                    for consumer, _ in channel._unacked.values():
+                        unacked[consumer.queue.name] = unacked.get(consumer.queue.name, 0) + 1
+            queues = {}
+            for name, queue in self.queues.items():
+                queues[name] = {
+                    "depth": len(queue.messages),
+                    "max_depth": queue.max_depth,
+                    "consumers": len(queue.consumers),
+                    "unacked": unacked.get(name, 0),
+                    **queue.counts,
+                }
+            return {"queues": queues, "dropped": self.dropped, "connections": len(self.connections)}
+
+
+# ============================================================
+# CONNECTION / CHANNEL
+# ============================================================
+
+class InMemoryConnection:
+    def __init__(self, broker: InMemoryBroker):
+        self.broker = broker
+        self.channels: List["InMemoryChannel"] = []
+        self.is_open = True
+
+    @property
+    def is_closed(self) -> bool:
+        return not self.is_open
+
+    def channel(self) -> "InMemoryChannel":
+        with self.broker.lock:
+            if not self.is_open:
+                raise ConnectionClosed(320, "Connection is closed")
+            channel = InMemoryChannel(self, len(self.channels) + 1)
+            self.channels.append(channel)
+            return channel
+
+    def close(self):
+        with self.broker.lock:
+            if not self.is_open:
+                return
+            for channel in self.channels:
+                channel.close()
+            self.is_open = False
+            if self in self.broker.connections:
+                self.broker.connections.remove(self)
+
+
+class InMemoryChannel:
+    """pika BlockingChannel subset on top of InMemoryBroker (safe to call from any thread)."""
+
+    def __init__(self, connection: InMemoryConnection, number: int):
+        self.connection = connection
+        self.broker = connection.broker
+        self.channel_number = number
+        self.is_open = True
+        self._cond = threading.Condition(self.broker.lock)
+        self._inbox: deque = deque()
+        self._unacked: "OrderedDict[int, tuple]" = OrderedDict()
+        self._consumers: Dict[str, _Consumer] = {}
+        self._next_tag = 1
+        self._prefetch = 0
+        self._global_qos = False
+        self._stopping = False
+        self._tags = itertools.count(1)
+
+    @property
+    def is_closed(self) -> bool:
+        return not self.is_open
+
+    def _check_open(self):
+        if not self.is_open:
+            raise ChannelWrongStateError("Channel is closed.")
+
+    def _fail(self, reply_code: int, reply_text: str):
+        self.close()
+        raise ChannelClosedByBroker(reply_code, reply_text)
+
+    # --- queues / qos ---
+
+    def queue_declare(self, queue: str, passive: bool = False, durable: bool = False, exclusive: bool = False,
+                      auto_delete: bool = False, arguments: Optional[Dict[str, Any]] = None) -> _Frame:
+        with self.broker.lock:
+            self._check_open()
+            existing = self.broker.queues.get(queue)
+            if passive:
+                if existing is None:
+                    self._fail(404, f"NOT_FOUND - no queue '{queue}'")
+            else:
+                try:
+                    existing = self.broker.declare(queue, durable, arguments)
+                except ValueError as e:
+                    self._fail(406, str(e))
+            return _Frame(_DeclareOk(queue, len(existing.messages), len(existing.consumers)))
+
+    def basic_qos(self, prefetch_size: int = 0, prefetch_count: int = 0, global_qos: bool = False):
+        with self.broker.lock:
+            self._check_open()
+            self._prefetch = prefetch_count
+            self._global_qos = global_qos
+
+    def _has_capacity(self, consumer: _Consumer) -> bool:
+        if consumer.auto_ack:
+            return True
+        if consumer.prefetch and consumer.unacked >= consumer.prefetch:
+            return False
+        if self._global_qos and self._prefetch and len(self._unacked) >= self._prefetch:
+            return False
+        return True
+
+    # --- consumers ---
+
+    def basic_consume(self, queue: str, on_message_callback: Callable, auto_ack: bool = False,
+                      exclusive: bool = False, consumer_tag: Optional[str] = None,
+                      arguments: Optional[Dict[str, Any]] = None) -> str:
+        with self.broker.lock:
+            self._check_open()
+            target = self.broker.queues.get(queue)
+            if target is None:
+                self._fail(404, f"NOT_FOUND - no queue '{queue}'")
+            tag = consumer_tag or f"ctag{self.channel_number}.{next(self._tags)}"
+            consumer = _Consumer(tag, target, self, on_message_callback, auto_ack,
+                                 0 if self._global_qos else self._prefetch)
+            self._consumers[tag] = consumer
+            target.consumers.append(consumer)
+            self.broker._dispatch(target)
+            return tag
+
+    def basic_cancel(self, consumer_tag: str):
+        # Deliveries it already holds stay unacked until settled or the channel closes
+        with self.broker.lock:
+            consumer = self._consumers.pop(consumer_tag, None)
+            if consumer is not None and consumer in consumer.queue.consumers:
+                consumer.queue.consumers.remove(consumer)
+            self._cond.notify_all()
+
+    def _deliver(self, consumer: _Consumer, message: Message):
+        tag = self._next_tag
+        self._next_tag += 1
+        method = Deliver(consumer.tag, tag, message.redelivered, message.exchange, message.routing_key)
+        if consumer.auto_ack:
+            consumer.queue.counts["acked"] += 1
+        else:
+            self._unacked[tag] = (consumer, message)
+            consumer.unacked += 1
+        self._inbox.append((consumer, method, message))
+        self.broker._notify("deliver", consumer.queue.name, message)
+        self._cond.notify_all()
+
+    def start_consuming(self):
+        """Run callbacks on this thread until stop_consuming(), the last consumer is cancelled or the channel closes."""
+        with self.broker.lock:
+            self._check_open()
+            self._stopping = False
+        while True:
+            with self._cond:
+                while self.is_open and not self._stopping and self._consumers and not self._inbox:
+                    self._cond.wait()
+                if not self.is_open or self._stopping or not self._consumers:
+                    return
+                consumer, method, message = self._inbox.popleft()
+                if consumer.tag not in self._consumers:
+                    continue
+                self.broker._notify("dispatch", consumer.queue.name, message)
+            consumer.callback(self, method, message.properties, message.body)
+
+    def stop_consuming(self, consumer_tag: Optional[str] = None):
+        with self.broker.lock:
+            tags = [consumer_tag] if consumer_tag else list(self._consumers)
+            for tag in tags:
+                self.basic_cancel(tag)
+            self._stopping = True
+            self._cond.notify_all()
+
+    # --- publish / settle ---
+
+    def basic_publish(self, exchange: str, routing_key: str, body, properties=None, mandatory: bool = False):
+        with self.broker.lock:
+            self._check_open()
+            try:
+                self.broker.publish(exchange, routing_key, body, properties)
+            except ValueError as e:
+                self._fail(404, f"NOT_FOUND - {e}")
+
+    def _settle(self, delivery_tag: int, multiple: bool, outcome: str, requeue: bool):
+        with self.broker.lock:
+            self._check_open()
+            if multiple and delivery_tag == 0:
+                tags = list(self._unacked)
+            elif delivery_tag not in self._unacked:
+                self._fail(406, f"PRECONDITION_FAILED - unknown delivery tag {delivery_tag}")
+            elif multiple:
+                tags = [tag for tag in self._unacked if tag <= delivery_tag]
+            else:
+                tags = [delivery_tag]
+
+            queues = []
+            for tag in tags:
+                consumer, message = self._unacked.pop(tag)
+                consumer.unacked -= 1
+                self.broker._settle(consumer.queue, message, outcome, requeue)
+                if consumer.queue not in queues:
+                    queues.append(consumer.queue)
+            # Freed prefetch slots (and requeued messages) go out right away
+            for queue in queues:
+                self.broker._dispatch(queue)
+
+    def basic_ack(self, delivery_tag: int = 0, multiple: bool = False):
+        self._settle(delivery_tag, multiple, "ack", False)
+
+    def basic_nack(self, delivery_tag: int = 0, multiple: bool = False, requeue: bool = True):
+        self._settle(delivery_tag, multiple, "nack", requeue)
+
+    def basic_reject(self, delivery_tag: int, requeue: bool = True):
+        self._settle(delivery_tag, False, "reject", requeue)
+
+    def close(self):
+        with self.broker.lock:
+            if not self.is_open:
+                return
+            self.is_open = False
+            for consumer in self._consumers.values():
+                if consumer in consumer.queue.consumers:
+                    consumer.queue.consumers.remove(consumer)
+            self._consumers.clear()
+
+            held: "OrderedDict[_Queue, List[Message]]" = OrderedDict()
+            for consumer, message in self._unacked.values():
+                consumer.unacked -= 1
+                held.setdefault(consumer.queue, []).append(message)
+            self._unacked.clear()
+            self._inbox.clear()
+            for queue, messages in held.items():
+                self.broker._requeue(queue, messages)
+                self.broker._dispatch(queue)
+            self._cond.notify_all()
+
+
+class InMemoryTransport(Transport):
+    """utils.transport.Transport backed by an InMemoryBroker."""
+
+    name = "memory"
+
+    def __init__(self, broker: Optional[InMemoryBroker] = None):
+        self.broker = broker or InMemoryBroker()
+
+    def connect(self) -> InMemoryConnection:
+        return self.broker.connect()
@@ -0,0 +1,33 @@
+"""
+Micro-benchmarks for the CPU-bound hot paths of a hunt / JD analysis
+
+Cases (testing/microbench/cases.py), each run over N jobs:
+- soft_killswitch, relevance_ranker: the job_hunter_graph nodes
+- extract_required_yoe: job_hunter_graph.extract_required_yoe_from_desc
+- classify_company_tier, assign_badges, generate_gap_analysis: utils/company_tiers.py
+- dedupe: job_hunter_graph.dedupe_jobs (fetch_adzuna_node's dedupe pass)
+- clean_json, extract_json: matcher_graph.clean_json and utils.json_extract
+  (which replaced worker.clean_json_response) on a cleanup response for N jobs
+
+Inputs (testing/microbench/inputs.py) are synthetic Adzuna-shaped jobs from
+testing/job_corpus.py, the recorded Adzuna fixtures, or a saved JSONL corpus
+(--source corpus --corpus PATH), at 100 / 1k / 10k / 100k jobs by default.
+
+Timing (testing/microbench/harness.py): warm-up calls, then repeats with GC
+disabled; fast calls are batched so each sample takes at least ~5 ms. Inputs
+are rebuilt outside the timed region for cases that mutate them. min / median
+/ mean / stdev per call are reported, plus the tracemalloc peak of one
+separate call.
+
+Regression gate: --baseline compares medians and peaks with a stored baseline
+(--save-baseline writes one) and exits 1 when a case is more than --tolerance
+slower or --memory-tolerance bigger. Baselines are machine-specific; record
+them on the machine that runs the gate.
+
+Usage (from backend/ai-worker):
+    python -m testing.microbench [--sizes 100 1000 10000 100000] [--cases relevance_ranker dedupe]
+        [--source synthetic recorded] [--repeats 7] [--json out.json]
+    python -m testing.microbench --source corpus --corpus corpus.jsonl.gz --sizes 1000000
+    python -m testing.microbench --save-baseline
+    python -m testing.microbench --baseline testing/microbench/baseline.json
+"""
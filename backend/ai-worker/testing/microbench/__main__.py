@@ -0,0 +1,109 @@
+"""
+CLI for testing/microbench (see the package docstring)
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from testing.microbench.cases import CASES
+from testing.microbench.inputs import SOURCES, load_jobs
+from testing.microbench.harness import measure, load_baseline, save_baseline, compare, result_key
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def _commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def run(cases, sources, sizes, warmup, repeats, budget, memory, corpus=None):
+    results = []
+    devnull = open(os.devnull, "w")
+    print(f"{'case':<24s} {'source':<10s} {'jobs':>7s} {'min ms':>11s} {'median ms':>11s} {'us/job':>9s} {'peak KB':>10s}")
+    for source in sources:
+        for size in sizes:
+            jobs = load_jobs(source, size, corpus)
+            for name in cases:
+                fn, setup = CASES[name](jobs)
+                # Nodes print per call; keep that out of the timings and the table
+                with redirect_stdout(devnull):
+                    timing = measure(fn, setup, warmup=warmup, repeats=repeats, budget=budget, memory=memory)
+                result = {"case": name, "source": source, "size": size, **timing}
+                results.append(result)
+                print(f"{name:<24s} {source:<10s} {size:7d} {timing['min_ms']:11.3f} {timing['median_ms']:11.3f} "
+                      f"{timing['median_ms'] * 1000 / size:9.2f} {timing.get('peak_kb', '-'):>10}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the hunt / matcher hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--source", nargs="+", choices=SOURCES, default=["synthetic"])
+    parser.add_argument("--corpus", help="JSONL corpus from testing/job_corpus.py (for --source corpus)")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds of timed samples per case (caps repeats)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to --baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed median slowdown (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="Allowed peak memory growth")
+    args = parser.parse_args()
+    if "corpus" in args.source and not args.corpus:
+        parser.error("--source corpus needs --corpus PATH")
+
+    results = run(args.cases, args.source, args.sizes, args.warmup, args.repeats, args.budget,
+                  not args.no_memory, args.corpus)
+    meta = {
+        "benchmark": "microbench",
+        "commit": _commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "corpus": args.corpus,
+    }
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**meta, "results": results}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, meta)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    missing = [result_key(r) for r in results if result_key(r) not in baseline.get("results", {})]
+    regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+    print(f"\nBaseline {baseline.get('commit')} ({baseline.get('timestamp')}): "
+          f"{len(results) - len(missing)} compared, {len(missing)} not in baseline")
+    for r in regressions:
+        print(f"  REGRESSION {r['key']:<45s} {r['metric']:<10s} {r['baseline']} -> {r['current']} (x{r['ratio']})")
+    if regressions:
+        return 1
+    print("  No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
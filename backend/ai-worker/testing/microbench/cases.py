@@ -0,0 +1,97 @@
+"""
+Benchmark cases for testing/microbench
+
+A case turns a job list into (fn, setup): setup() returns fn's arguments and
+runs outside the timed region, so cases that mutate their input
+(relevance_ranker scores and sorts in place) get fresh copies every call.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Tuple
+
+from agent.job_hunter_graph import (
+    soft_killswitch_node, relevance_ranker_node, extract_required_yoe_from_desc, dedupe_jobs
+)
+from matcher_graph import clean_json
+from utils.json_extract import extract_json
+from utils.company_tiers import classify_company_tier, assign_badges, generate_gap_analysis
+
+from testing.microbench.inputs import fingerprint, negative_keywords
+
+Case = Callable[[List[Dict[str, Any]]], Tuple[Callable, Callable[[], Tuple]]]
+
+
+def _company(job: Dict[str, Any]) -> str:
+    company = job.get("company", {})
+    return company.get("display_name", "") if isinstance(company, dict) else str(company)
+
+
+def soft_killswitch(jobs):
+    state = {"raw_jobs": jobs, "criteria": {"salaryMin": 600000}, "negative_keywords": negative_keywords()}
+    return soft_killswitch_node, lambda: (state,)
+
+
+def relevance_ranker(jobs):
+    fp = fingerprint()
+    return relevance_ranker_node, lambda: ({"filtered_jobs": [dict(job) for job in jobs], "resume_fingerprint": fp},)
+
+
+def extract_required_yoe(jobs):
+    # What relevance_ranker_node passes: description + title, lowercased
+    descs = [(job.get("description", "") + " " + job.get("title", "")).lower() for job in jobs]
+    return (lambda items: [extract_required_yoe_from_desc(d) for d in items]), lambda: (descs,)
+
+
+def company_tier(jobs):
+    pairs = [(_company(job), job.get("salary_min") or 0) for job in jobs]
+    return (lambda items: [classify_company_tier(c, s) for c, s in items]), lambda: (pairs,)
+
+
+def badges(jobs):
+    items = [
+        (job, rank, classify_company_tier(_company(job), job.get("salary_min") or 0))
+        for rank, job in enumerate(jobs, 1)
+    ]
+    return (lambda entries: [assign_badges(j, r, t) for j, r, t in entries]), lambda: (items,)
+
+
+def gap_analysis(jobs):
+    fp = fingerprint()
+    items = [(job, 40 + i % 60) for i, job in enumerate(jobs)]
+    return (lambda entries: [generate_gap_analysis(j, fp, s) for j, s in entries]), lambda: (items,)
+
+
+def dedupe(jobs):
+    return dedupe_jobs, lambda: (jobs,)
+
+
+def _cleanup_response(jobs) -> str:
+    decisions = [{"id": i, "keep": i % 5 != 0, "confidence": 0.8} for i in range(len(jobs))]
+    return (
+        "Here are the decisions for the jobs you sent:\n```json\n"
+        + json.dumps({"decisions": decisions}, indent=2)
+        + "\n```\nLet me know if you need anything else."
+    )
+
+
+def clean_json_case(jobs):
+    text = _cleanup_response(jobs)
+    return clean_json, lambda: (text,)
+
+
+def extract_json_case(jobs):
+    text = _cleanup_response(jobs)
+    return extract_json, lambda: (text,)
+
+
+CASES: Dict[str, Case] = {
+    "soft_killswitch": soft_killswitch,
+    "relevance_ranker": relevance_ranker,
+    "extract_required_yoe": extract_required_yoe,
+    "classify_company_tier": company_tier,
+    "assign_badges": badges,
+    "generate_gap_analysis": gap_analysis,
+    "dedupe": dedupe,
+    "clean_json": clean_json_case,
+    "extract_json": extract_json_case,
+}
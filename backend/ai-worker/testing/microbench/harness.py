@@ -0,0 +1,136 @@
+"""
+Timing, memory and baseline comparison for testing/microbench
+"""
+
+import gc
+import json
+import math
+import time
+import statistics
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MIN_SAMPLE_SECONDS = 0.005
+MAX_NUMBER = 1000
+MIN_REPEATS = 3
+
+Setup = Callable[[], Tuple]
+
+
+def _timed(fn: Callable, inputs: List[Tuple]) -> float:
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for args in inputs:
+            fn(*args)
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def peak_memory(fn: Callable, setup: Setup) -> int:
+    """tracemalloc peak (bytes) of one call; allocations made by setup() are excluded."""
+    args = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(fn: Callable, setup: Setup, warmup: int = 1, repeats: int = 7,
+            budget: float = 10.0, memory: bool = True) -> Dict[str, Any]:
+    """
+    Time fn(*setup()) per call.
+
+    Args:
+        warmup: Untimed calls first (at least one; it also calibrates batching)
+        repeats: Timed samples; reduced to fit `budget` seconds (never below 3)
+        budget: Rough time allowed for the timed samples of this case
+        memory: Also record the tracemalloc peak of one separate call
+    """
+    single = 0.0
+    for _ in range(max(1, warmup)):
+        single = _timed(fn, [setup()])
+
+    number = 1 if single >= MIN_SAMPLE_SECONDS else min(MAX_NUMBER, math.ceil(MIN_SAMPLE_SECONDS / max(single, 1e-7)))
+    repeats = max(MIN_REPEATS, min(repeats, int(budget / max(single * number, 1e-9))))
+
+    samples = []
+    for _ in range(repeats):
+        inputs = [setup() for _ in range(number)]
+        samples.append(_timed(fn, inputs) / number)
+
+    result = {
+        "number": number,
+        "repeats": repeats,
+        "min_ms": round(min(samples) * 1000, 4),
+        "median_ms": round(statistics.median(samples) * 1000, 4),
+        "mean_ms": round(statistics.mean(samples) * 1000, 4),
+        "stdev_ms": round(statistics.stdev(samples) * 1000, 4) if len(samples) > 1 else 0.0,
+    }
+    if memory:
+        result["peak_kb"] = round(peak_memory(fn, setup) / 1024, 1)
+    return result
+
+
+# ============================================================
+# BASELINE
+# ============================================================
+
+def result_key(result: Dict[str, Any]) -> str:
+    return f"{result['case']}[{result['source']}]@{result['size']}"
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path: str, results: List[Dict[str, Any]], meta: Dict[str, Any]):
+    document = {
+        **meta,
+        "results": {
+            result_key(r): {k: r[k] for k in ("min_ms", "median_ms", "peak_kb") if k in r}
+            for r in results
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float = 0.25,
+            memory_tolerance: float = 0.25, floor_ms: float = 0.02) -> List[Dict[str, Any]]:
+    """
+    Regressions against a baseline: median more than `tolerance` slower (and
+    by more than floor_ms, so timer noise on tiny cases doesn't fail the
+    gate) or peak memory more than `memory_tolerance` bigger.
+    """
+    regressions = []
+    stored = baseline.get("results", {})
+    for result in results:
+        base = stored.get(result_key(result))
+        if not base:
+            continue
+        checks = [("median_ms", tolerance, floor_ms)]
+        if "peak_kb" in result and "peak_kb" in base:
+            checks.append(("peak_kb", memory_tolerance, 1.0))
+        for metric, allowed, floor in checks:
+            before, now = base.get(metric), result[metric]
+            if before and now > before * (1 + allowed) and now - before > floor:
+                regressions.append({
+                    "key": result_key(result),
+                    "metric": metric,
+                    "baseline": before,
+                    "current": now,
+                    "ratio": round(now / before, 2),
+                })
+    return regressions
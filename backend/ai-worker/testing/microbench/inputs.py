@@ -0,0 +1,74 @@
+"""
+Job inputs for testing/microbench
+
+- synthetic: testing/job_corpus.generate_jobs with the default CorpusProfile
+  (title mix, elite/premier companies, YoE phrases, poison keywords, missing
+  salaries, duplicates and near-duplicates), seed 7
+- recorded: testing/fixtures/adzuna_responses.json, cycled up to the size
+  (so dedupe sees every recorded page repeated)
+- corpus: the first N jobs of a JSONL corpus written by testing/job_corpus.py
+  (--corpus PATH), cycled if the file is shorter
+
+The fingerprint and negative keywords come from fixtures/llm_responses.json,
+i.e. what the fake LLM gives the hunt graph.
+"""
+
+import os
+import json
+import itertools
+from typing import Any, Dict, List, Optional
+
+from testing.job_corpus import generate_jobs, read_jsonl
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+ADZUNA_FIXTURES = os.path.join(FIXTURES_DIR, "adzuna_responses.json")
+LLM_FIXTURES = os.path.join(FIXTURES_DIR, "llm_responses.json")
+
+SOURCES = ("synthetic", "recorded", "corpus")
+
+
+def synthetic_jobs(size: int, seed: int = 7) -> List[Dict[str, Any]]:
+    return list(generate_jobs(size, seed=seed))
+
+
+def corpus_jobs(size: int, path: str) -> List[Dict[str, Any]]:
+    """First `size` jobs of a testing/job_corpus.py JSONL file, cycled if it is shorter."""
+    jobs = list(itertools.islice(read_jsonl(path), size))
+    if not jobs:
+        raise ValueError(f"Empty corpus: {path}")
+    return [dict(job) for job in itertools.islice(itertools.cycle(jobs), size)]
+
+
+def recorded_jobs(size: int, path: str = ADZUNA_FIXTURES) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        responses = json.load(f)["responses"]
+    recorded = [job for key in sorted(responses) for job in responses[key].get("results", [])]
+    return [dict(job) for job in itertools.islice(itertools.cycle(recorded), size)]
+
+
+def load_jobs(source: str, size: int, corpus: Optional[str] = None) -> List[Dict[str, Any]]:
+    if source == "synthetic":
+        return synthetic_jobs(size)
+    if source == "recorded":
+        return recorded_jobs(size)
+    if source == "corpus":
+        if not corpus:
+            raise ValueError("source 'corpus' needs a corpus path (--corpus)")
+        return corpus_jobs(size, corpus)
+    raise ValueError(f"Unknown source: {source}")
+
+
+def llm_fixture(family: str) -> Any:
+    with open(LLM_FIXTURES, encoding="utf-8") as f:
+        for entry in json.load(f)["responses"]:
+            if entry.get("family") == family:
+                return entry["response"]
+    raise KeyError(family)
+
+
+def fingerprint() -> Dict[str, Any]:
+    return llm_fixture("hunt_fingerprint")
+
+
+def negative_keywords() -> List[str]:
+    return llm_fixture("hunt_negatives")["negative_keywords"]
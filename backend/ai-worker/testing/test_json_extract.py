@@ -0,0 +1,72 @@
+"""
+Tests for utils/json_extract.py
+
+Covers the response shapes the extractor has to handle and the two cases it
+used to get wrong: a ``` inside a fenced string value, and adversarial input
+that made the old raw_decode loop quadratic.
+
+Usage:
+    python -m pytest testing/test_json_extract.py
+    python testing/test_json_extract.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.json_extract import extract_json, try_extract_json, JSONExtractionError
+
+
+def test_clean_and_fenced():
+    assert extract_json('{"a": 1}') == {"a": 1}
+    assert extract_json('Here you go:\n```json\n{"a": [1, 2]}\n```\nThanks!') == {"a": [1, 2]}
+    assert extract_json('```JSON\n[1, 2]\n```') == [1, 2]
+
+
+def test_fence_inside_string_value():
+    assert extract_json('```json {"a": "```"} ```') == {"a": "```"}
+    text = 'Result:\n```json\n{"snippet": "use ```python``` blocks", "ok": true}\n```'
+    assert extract_json(text) == {"snippet": "use ```python``` blocks", "ok": True}
+
+
+def test_preamble_trailing_text_and_expect():
+    assert extract_json('The {name} is: {"name": "x"} - done {approx}') == {"name": "x"}
+    assert extract_json('[1] then {"b": 2}', expect=dict) == {"b": 2}
+
+
+def test_repairs():
+    assert extract_json("{'scores': [85, 72,], 'ok': True, 'x': None}") == {"scores": [85, 72], "ok": True, "x": None}
+
+
+def test_failures():
+    try:
+        extract_json("no json here")
+        assert False, "expected JSONExtractionError"
+    except JSONExtractionError:
+        pass
+    assert try_extract_json("{unclosed", default="d") == "d"
+
+
+def _timed(text):
+    start = time.perf_counter()
+    assert try_extract_json(text) is None
+    return time.perf_counter() - start
+
+
+def test_adversarial_input_is_linear():
+    # Every { is a failed candidate; each failed parse used to measure its
+    # error position from the start of the response, so 4x the input cost
+    # ~16x the time ("{]" * 100000 took ~6s)
+    for unit in ("{]", 'x{"a":', "["):
+        small = min(_timed(unit * 20000) for _ in range(3))
+        large = min(_timed(unit * 80000) for _ in range(3))
+        assert large < max(small, 0.001) * 8, (unit, small, large)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
@@ -8,11 +8,15 @@ import os
 import requests
 import time
 import json
+import logging
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
+from utils.usage_tracker import track_http
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 class AdzunaClient:
     """Client for Adzuna API job searches"""
     
@@ -114,33 +118,32 @@ class AdzunaClient:
             try:
                 url = f"{self.base_url}/{page}"
                 
-                # DETAILED LOGGING FOR DEBUGGING
-                print(f"\n[ADZUNA API] Making request to: {url}")
-                print(f"[ADZUNA API] what={params.get('what')}, where={params.get('where')}")
-                print(f"[ADZUNA API] sort_by={params.get('sort_by')}, max_days_old={params.get('max_days_old')}")
-                print(f"[ADZUNA API] App ID present: {bool(params.get('app_id'))}")
-                print(f"[ADZUNA API] App Key present: {bool(params.get('app_key'))}")
-                print(f"[ADZUNA API] App ID value: {params.get('app_id')[:8]}..." if params.get('app_id') else "[ADZUNA API] App ID: MISSING!")
+                logger.debug(
+                    "Adzuna request page=%s what=%r where=%r", page, params.get('what'), params.get('where'),
+                    extra={
+                        "sort_by": params.get('sort_by'),
+                        "max_days_old": params.get('max_days_old'),
+                        "credentials": bool(params.get('app_id') and params.get('app_key')),
+                    }
+                )
                 
                 if log_callback:
                     log_callback("info", f"   Fetching page {page} from Adzuna...")
                     log_callback("info", f"   Query: what='{params.get('what')}', where='{params.get('where')}'")
                 
-                response = requests.get(url, params=params, timeout=15)
-                
-                print(f"[ADZUNA API] Response Status: {response.status_code}")
-                print(f"[ADZUNA API] Response URL: {response.url}")
+                with track_http("adzuna") as call:
+                    response = call.record(requests.get(url, params=params, timeout=15))
                 
+                if response.status_code >= 400:
+                    logger.warning("Adzuna page=%s returned HTTP %s", page, response.status_code)
                 response.raise_for_status()
                 
                 data = response.json()
                 results = data.get("results", [])
-                
-                print(f"[ADZUNA API] Results count: {len(results)}")
-                print(f"[ADZUNA API] Total count from API: {data.get('count', 0)}")
-                
                 total_count = data.get("count", 0)
                 
+                logger.debug("Adzuna page=%s results=%d total=%d", page, len(results), total_count)
+                
                 if log_callback:
                     log_callback("info", f"   Response: {len(results)} jobs (Total available: {total_count})")
                 
@@ -9,6 +9,7 @@ import requests
 import time
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
+from utils.usage_tracker import track_http
 
 class HiringCafeClient:
     """Client for HiringCafe job search API"""
@@ -78,12 +79,13 @@ class HiringCafeClient:
             if log_callback:
                 log_callback("info", f"   Querying HiringCafe API...")
             
-            count_response = requests.post(
-                self.count_endpoint,
-                json=count_payload,
-                headers=self.headers,
-                timeout=30
-            )
+            with track_http("hiringcafe") as call:
+                count_response = call.record(requests.post(
+                    self.count_endpoint,
+                    json=count_payload,
+                    headers=self.headers,
+                    timeout=30
+                ))
             
             total_jobs = 0
             if count_response.status_code == 200:
@@ -108,12 +110,13 @@ class HiringCafeClient:
                 if log_callback:
                     log_callback("info", f"   Fetching page {page}...")
                 
-                jobs_response = requests.post(
-                    self.jobs_endpoint,
-                    json=jobs_payload,
-                    headers=self.headers,
-                    timeout=30
-                )
+                with track_http("hiringcafe") as call:
+                    jobs_response = call.record(requests.post(
+                        self.jobs_endpoint,
+                        json=jobs_payload,
+                        headers=self.headers,
+                        timeout=30
+                    ))
                 
                 if jobs_response.status_code != 200:
                     if log_callback:
@@ -9,6 +9,7 @@ import requests
 import time
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
+from utils.usage_tracker import track_http
 
 load_dotenv()
 
@@ -114,11 +115,12 @@ class TavilyJobSearch:
             if log_callback:
                 log_callback("info", f"   Querying Tavily with: '{query[:60]}...'")
             
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                timeout=30
-            )
+            with track_http("tavily") as call:
+                response = call.record(requests.post(
+                    self.base_url,
+                    json=payload,
+                    timeout=30
+                ))
             response.raise_for_status()
             
             data = response.json()
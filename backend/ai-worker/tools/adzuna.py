@@ -7,6 +7,8 @@ import os
 import requests
 from typing import List, Dict, Optional
 
+from utils.usage_tracker import track_http
+
 
 def fetch_adzuna_jobs(role: str, location: str, limit: int = 20) -> List[Dict]:
     """
@@ -54,7 +56,8 @@ def fetch_adzuna_jobs(role: str, location: str, limit: int = 20) -> List[Dict]:
     
     try:
         print(f"   [adzuna] Searching for '{role}' in '{location}'...")
-        response = requests.get(url, params=params, timeout=10)
+        with track_http("adzuna") as call:
+            response = call.record(requests.get(url, params=params, timeout=10))
         response.raise_for_status()
         
         data = response.json()
@@ -5,6 +5,7 @@ Uses Tavily API to search for jobs on ATS platforms (Greenhouse, Lever, etc.)
 
 import os
 from tavily import TavilyClient
+from utils.usage_tracker import track_http
 from typing import List, Dict
 
 
@@ -52,11 +53,12 @@ def search_with_tavily(role: str, location: str = "", limit: int = 10) -> List[D
             
             try:
                 # Perform search
-                response = client.search(
-                    query=query,
-                    max_results=min(limit // 2, 5),  # Distribute results across platforms
-                    search_depth="basic"
-                )
+                with track_http("tavily"):
+                    response = client.search(
+                        query=query,
+                        max_results=min(limit // 2, 5),  # Distribute results across platforms
+                        search_depth="basic"
+                    )
                 
                 results = response.get("results", [])
                 print(f"   [tavily] Found {len(results)} results from {platform}")
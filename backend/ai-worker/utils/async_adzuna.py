@@ -9,7 +9,7 @@ Adzuna API Limits:
 
 Our Strategy:
 - Max 3 concurrent requests (conservative)
-- 2.5s delay between starting requests (24 req/min = safe)
+- 2.5s delay between starting requests (24 req/min = safe, ADZUNA_REQUEST_SPACING)
 - 10s timeout per request
 - Exponential backoff on 429 errors
 """
@@ -17,9 +17,17 @@ Our Strategy:
 import asyncio
 import aiohttp
 import os
+import logging
 from typing import List, Dict
 from datetime import datetime
 
+from utils.usage_tracker import track_http
+
+logger = logging.getLogger(__name__)
+
+# Delay between starting requests (24 req/min = well under 25/min limit)
+REQUEST_SPACING = float(os.getenv("ADZUNA_REQUEST_SPACING", "2.5"))
+
 
 async def fetch_job_async(session: aiohttp.ClientSession, query: Dict, sem: asyncio.Semaphore, app_id: str, app_key: str) -> Dict:
     """
@@ -52,37 +60,39 @@ async def fetch_job_async(session: aiohttp.ClientSession, query: Dict, sem: asyn
             # 10 second timeout
             timeout = aiohttp.ClientTimeout(total=10)
             
-            async with session.get(url, params=params, timeout=timeout) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"[Async] ✅ {query['what']} in {query['where']}: {len(data.get('results', []))} jobs")
-                    return data
+            with track_http("adzuna") as call:
+                async with session.get(url, params=params, timeout=timeout) as response:
+                    call.record(response)
+                    if response.status == 200:
+                        data = await response.json()
+                        logger.debug("%s in %s: %d jobs", query['what'], query['where'], len(data.get('results', [])))
+                        return data
                 
-                elif response.status == 429:
-                    # Rate limit hit - wait and retry once
-                    print(f"[Async] ⚠️  Rate limit hit, waiting 5s...")
-                    await asyncio.sleep(5)
+                    elif response.status == 429:
+                        # Rate limit hit - wait and retry once
+                        logger.warning("Adzuna rate limit hit, retrying in 5s")
+                        await asyncio.sleep(5)
                     
-                    # Retry once
-                    async with session.get(url, params=params, timeout=timeout) as retry_response:
-                        if retry_response.status == 200:
-                            data = await retry_response.json()
-                            print(f"[Async] ✅ Retry successful: {len(data.get('results', []))} jobs")
-                            return data
-                        else:
-                            print(f"[Async] ❌ Retry failed: {retry_response.status}")
-                            return {"results": []}
+                        # Retry once
+                        async with session.get(url, params=params, timeout=timeout) as retry_response:
+                            if retry_response.status == 200:
+                                data = await retry_response.json()
+                                logger.debug("Retry successful: %d jobs", len(data.get('results', [])))
+                                return data
+                            else:
+                                logger.warning("Retry failed: HTTP %s", retry_response.status)
+                                return {"results": []}
                 
-                else:
-                    print(f"[Async] ❌ Error {response.status} for {query['what']} in {query['where']}")
-                    return {"results": []}
+                    else:
+                        logger.warning("HTTP %s for %s in %s", response.status, query['what'], query['where'])
+                        return {"results": []}
         
         except asyncio.TimeoutError:
-            print(f"[Async] ⏱️  Timeout for {query['what']} in {query['where']}")
+            logger.warning("Timeout for %s in %s", query['what'], query['where'])
             return {"results": []}
         
         except Exception as e:
-            print(f"[Async] ❌ Exception: {e}")
+            logger.exception("Adzuna request failed")
             return {"results": []}
 
 
@@ -108,24 +118,24 @@ async def fetch_all_jobs_async(queries: List[Dict], app_id: str, app_key: str) -
     async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
         tasks = []
         
-        # Create tasks with 2.5s pacing (24 requests/minute = safe)
+        # Create tasks with REQUEST_SPACING pacing (2.5s = 24 requests/minute = safe)
         for i, query in enumerate(queries):
             task = asyncio.create_task(fetch_job_async(session, query, sem, app_id, app_key))
             tasks.append(task)
             
             # Add delay between starting requests (except for last one)
-            if i < len(queries) - 1:
-                await asyncio.sleep(2.5)  # 24 req/min = well under 25/min limit
+            if i < len(queries) - 1 and REQUEST_SPACING:
+                await asyncio.sleep(REQUEST_SPACING)
         
         # Wait for all tasks to complete
-        print(f"[Async] Waiting for {len(tasks)} tasks to complete...")
+        logger.debug("Waiting for %d tasks to complete", len(tasks))
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Flatten results and handle exceptions
         all_jobs = []
         for i, result in enumerate(results):
             if isinstance(result, Exception):
-                print(f"[Async] Task {i+1} failed with exception: {result}")
+                logger.warning("Task %d failed with exception: %s", i + 1, result)
             elif isinstance(result, dict):
                 all_jobs.extend(result.get("results", []))
         
@@ -147,7 +157,7 @@ def fetch_jobs_async(queries: List[Dict]) -> List[Dict]:
     app_key = os.getenv("ADZUNA_APP_KEY")
     
     if not app_id or not app_key:
-        print("[Async] ❌ Missing ADZUNA_APP_ID or ADZUNA_APP_KEY")
+        logger.error("Missing ADZUNA_APP_ID or ADZUNA_APP_KEY")
         return []
     
     # Run async code
@@ -155,6 +165,6 @@ def fetch_jobs_async(queries: List[Dict]) -> List[Dict]:
     all_jobs = asyncio.run(fetch_all_jobs_async(queries, app_id, app_key))
     elapsed = (datetime.now() - start_time).total_seconds()
     
-    print(f"[Async] ✅ Fetched {len(all_jobs)} total jobs in {elapsed:.1f}s")
+    logger.info("Fetched %d total jobs in %.1fs", len(all_jobs), elapsed, extra={"queries": len(queries)})
     
     return all_jobs
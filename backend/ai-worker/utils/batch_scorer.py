@@ -2,53 +2,51 @@
 Batch job scoring using simplified matcher.
 PHASE 1 OPTIMIZATION: Uses resume fingerprint instead of full text.
 Processes jobs in batches of 5 for efficiency.
+Uses the 8B -> 70B cascade (utils/llm_cascade.py).
 """
 
-from langchain_groq import ChatGroq
-import os
 import json
-import re
+from utils.structured_llm import invoke_structured, BatchScores, score_count
+from utils.llm_cascade import cascade_items, low_confidence, near_threshold
+from utils.lexical_scorer import score_match
+from utils.llm_batcher import BATCHER_ENABLED, get_batcher, wait_all, context_key
 
+# Max jobs per shared cross-session prompt (when LLM_BATCHER_ENABLED)
+SHARED_BATCH_ITEMS = 10
 
-def score_jobs_in_batch(resume_fingerprint: dict, jobs: list, batch_size: int = 5) -> list:
+
+def _build_prompt(entries: list) -> str:
     """
-    Score multiple jobs in batches using AI with resume fingerprint.
-    PHASE 1: Uses fingerprint instead of full resume text (saves ~1500 tokens/batch).
-    
-    Args:
-        resume_fingerprint: Compact resume fingerprint from Node 0
-        jobs: List of job dicts
-        batch_size: Number of jobs per batch (default 5)
-        
-    Returns:
-        List of jobs with matchScore added
+    Build one scoring prompt for (fingerprint, job) entries.
+
+    Entries may come from several hunts (see utils/llm_batcher.py); each
+    distinct fingerprint is written once and jobs reference it by label.
     """
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",  # Keep quality for scoring
-        temperature=0.1,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
-    
-    scored_jobs = []
-    total_jobs = len(jobs)
-    
-    for i in range(0, total_jobs, batch_size):
-        batch = jobs[i:i+batch_size]
-        
-        # Prepare batch prompt
-        job_summaries = []
-        for idx, job in enumerate(batch):
-            job_summaries.append(f"""
-{idx+1}. Title: {job.get('title', 'N/A')}
+    profiles = {}
+    for fingerprint, _ in entries:
+        profiles.setdefault(context_key(fingerprint), (f"P{len(profiles) + 1}", fingerprint))
+
+    job_summaries = []
+    for idx, (fingerprint, job) in enumerate(entries):
+        label = profiles[context_key(fingerprint)][0]
+        job_summaries.append(f"""
+{idx+1}. Title: {job.get('title', 'N/A')}{f"  [Candidate {label}]" if len(profiles) > 1 else ""}
    Company: {job.get('company', {}).get('display_name', 'N/A') if isinstance(job.get('company'), dict) else job.get('company', 'N/A')}
    Description: {job.get('description', '')[:300]}...
 """)
-        
-        # PHASE 1: Use fingerprint instead of full resume
-        prompt = f"""Score these {len(batch)} jobs against the candidate profile (0-100).
 
-**Candidate Profile (Fingerprint):**
-{json.dumps(resume_fingerprint, indent=2)}
+    # PHASE 1: Use fingerprint instead of full resume
+    if len(profiles) == 1:
+        profile_section = f"""**Candidate Profile (Fingerprint):**
+{json.dumps(entries[0][0], indent=2)}"""
+    else:
+        profile_section = "**Candidate Profiles (Fingerprints) - score each job against its [Candidate] only:**\n" + "\n".join(
+            f"Candidate {label}:\n{json.dumps(fingerprint, indent=2)}" for label, fingerprint in profiles.values()
+        )
+
+    return f"""Score these {len(entries)} jobs against the candidate profile (0-100).
+
+{profile_section}
 
 **Jobs to Score:**
 {''.join(job_summaries)}
@@ -62,43 +60,97 @@ def score_jobs_in_batch(resume_fingerprint: dict, jobs: list, batch_size: int =
 - No Poison Keywords (5%): Job should NOT mention poison_keywords
 
 **Output Format:**
-Return ONLY a JSON array of scores: {{"scores": [85, 72, 91, ...]}}
+Return ONLY a JSON object with one score and one confidence (0-1, how sure you are) per job:
+{{"scores": [85, 72, 91, ...], "confidence": [0.9, 0.6, 0.95, ...]}}
 
 Be strict but fair. Return ONLY the JSON, no explanations.
 """
+
+
+def _run(llm, entries: list) -> list:
+    result = invoke_structured(
+        llm, _build_prompt(entries), BatchScores,
+        check=score_count(len(entries)),
+        task_name="Batch scoring"
+    )
+    confidence = result.confidence or [None] * len(entries)
+    return list(zip(result.scores, confidence))
+
+
+def _is_uncertain(result) -> bool:
+    score, confidence = result
+    return low_confidence(confidence) or near_threshold(score)
+
+
+def _score_entries(entries: list) -> list:
+    """Cascade-score (fingerprint, job) entries -> [(score, confidence)]."""
+    return cascade_items("batch_scoring", entries, _run, _is_uncertain)
+
+
+def score_jobs_in_batch(resume_fingerprint: dict, jobs: list, batch_size: int = 5, use_llm: bool = True) -> list:
+    """
+    Score multiple jobs in batches using AI with resume fingerprint.
+    PHASE 1: Uses fingerprint instead of full resume text (saves ~1500 tokens/batch).
+    
+    Each batch is scored by the 8B model first; only jobs with low confidence
+    or a score near the match threshold are re-scored by the 70B model.
+    With LLM_BATCHER_ENABLED, jobs go through the shared cross-session batcher
+    instead and may share a prompt with other hunts.
+    
+    Args:
+        resume_fingerprint: Compact resume fingerprint from Node 0
+        jobs: List of job dicts
+        batch_size: Number of jobs per batch (default 5)
+        use_llm: False scores every job lexically (hunts over the user's daily budget)
         
-        try:
-            response = llm.invoke(prompt)
-            content = response.content.strip()
-            
-            # Extract JSON
-            json_match = re.search(r'\{.*?\}', content, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group(0))
-                scores = result.get("scores", [])
-                
-                # Assign scores to jobs
-                for idx, job in enumerate(batch):
-                    if idx < len(scores):
-                        # Use AI score
-                        job["matchScore"] = scores[idx]
-                    else:
-                        # AI didn't return enough scores - use fallback
-                        print(f"[BatchScoring] Warning: AI returned {len(scores)} scores for {len(batch)} jobs, using fallback for job {idx+1}")
-                        job["matchScore"] = 50  # Fallback score
-                    scored_jobs.append(job)
+    Returns:
+        List of jobs with matchScore added (lexical score if the LLM batch fails)
+    """
+    if not use_llm:
+        for job in jobs:
+            job["matchScore"] = _lexical_score(resume_fingerprint, job)
+        return list(jobs)
+
+    if BATCHER_ENABLED:
+        batcher = get_batcher(
+            "batch_scoring", _score_entries, max_items=SHARED_BATCH_ITEMS,
+            item_text=lambda entry: entry[1].get("description", "")[:300]
+        )
+        results = wait_all(batcher.submit_many([(resume_fingerprint, job) for job in jobs]))
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                print(f"[BatchScoring] Error scoring job: {result}, using lexical score")
+                job["matchScore"] = _lexical_score(resume_fingerprint, job)
             else:
-                # Fallback: assign default scores
-                print(f"[BatchScoring] Warning: No JSON found in AI response, using fallback scores")
-                for job in batch:
-                    job["matchScore"] = 50
-                    scored_jobs.append(job)
+                job["matchScore"] = result[0]
+        return list(jobs)
+
+    scored_jobs = []
+    total_jobs = len(jobs)
+    
+    for i in range(0, total_jobs, batch_size):
+        batch = jobs[i:i+batch_size]
+        
+        try:
+            # JSON mode + schema validation; a wrong score count is re-asked, not padded
+            results = _score_entries([(resume_fingerprint, job) for job in batch])
+            for job, (score, _) in zip(batch, results):
+                job["matchScore"] = score
+                scored_jobs.append(job)
                     
         except Exception as e:
-            print(f"[BatchScoring] Error scoring batch: {e}")
-            # Fallback: assign default scores
+            print(f"[BatchScoring] Error scoring batch: {e}, using lexical scores")
+            # Fallback: deterministic lexical score instead of a flat default
             for job in batch:
-                job["matchScore"] = 50
+                job["matchScore"] = _lexical_score(resume_fingerprint, job)
                 scored_jobs.append(job)
     
     return scored_jobs
+
+
+def _lexical_score(resume_fingerprint: dict, job: dict) -> int:
+    """Score a job from the fingerprint's skills/YoE without an LLM call."""
+    skills = (resume_fingerprint.get("expert_skills") or []) + (resume_fingerprint.get("proficient_skills") or [])
+    profile_text = f"{resume_fingerprint.get('yoe', '')} years\n{', '.join(skills)}"
+    jd_text = f"{job.get('title', '')}\n{job.get('description', '')}"
+    return score_match(profile_text, jd_text)["score"]
@@ -0,0 +1,502 @@
+"""
+HTTP Cassettes - record/replay of every external call a run makes
+
+Reproducing a production hunt locally meant guessing what Adzuna, Tavily,
+HiringCafe, Gemini and Groq had returned. A cassette captures those
+interactions once and serves them back, so job_hunter_graph can be profiled
+and benchmarked on real traffic shapes without network or API keys.
+
+Hooks are installed at the client library boundary, which covers every
+caller without touching it:
+
+- requests: HTTPAdapter.send (tier1_adzuna, tools/adzuna, tier2_tavily,
+  tier2_hiringcafe, TavilyClient, link validation)
+- aiohttp: ClientSession._request (utils/async_adzuna)
+- httpx: HTTPTransport / AsyncHTTPTransport (ChatGroq through
+  llm_client._http_clients, google-genai embeddings)
+
+The active cassette lives in a contextvar, like the usage scope, so
+concurrent runs record to their own cassette; use_cassette(process_wide=True)
+also covers threads that don't carry the context. Outside a cassette the hooks
+call straight through.
+
+Modes (CASSETTE_MODE, default off):
+- record: the live response is returned and saved. Credentials (Adzuna
+  app_id/app_key, api_key fields, Authorization / x-goog-api-key headers) are
+  redacted before anything is written. The cassette is written gzipped to
+  CASSETTE_DIR/<name>.json.gz when the block exits.
+- replay: requests are matched on method, URL (without credentials) and body
+  hash, and repeats are served in recorded order. If there is no exact match,
+  the next interaction recorded for the same method and URL is served (LLM
+  prompts that embed volatile data). Anything else raises CassetteMiss.
+  CASSETTE_LATENCY scales the recorded latency (0 = instant, 1 = as recorded).
+
+Recording reads response bodies in full, so streamed LLM responses arrive in
+one piece while recording and on replay. Failed calls (timeouts, connection
+errors) are not recorded.
+
+Usage:
+    with use_cassette("hunt-<sessionId>", mode="record"):
+        ...
+
+    @use_cassette("hunt-<sessionId>", mode="replay")   # pytest test / fixture
+    def test_hunt(): ...
+
+The worker records each hunt / JD analysis when CASSETTE_MODE=record;
+testing/benchmark_hunt.py --cassette replays one.
+"""
+
+import os
+import json
+import gzip
+import time
+import asyncio
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off").lower()
+CASSETTE_DIR = os.getenv("CASSETTE_DIR", "cassettes")
+CASSETTE_LATENCY = float(os.getenv("CASSETTE_LATENCY", "0"))
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+REDACTED = "<redacted>"
+_SECRET_PARAMS = {"app_id", "app_key", "api_key", "apikey", "key", "token", "access_token"}
+_SECRET_HEADERS = {"authorization", "proxy-authorization", "x-api-key", "x-goog-api-key", "api-key", "cookie"}
+_SECRET_FIELDS = {"api_key", "apikey", "token", "access_token"}
+# Bodies are stored decoded, so encoding/length headers no longer apply
+_DROP_RESPONSE_HEADERS = {"set-cookie", "content-encoding", "content-length", "transfer-encoding"}
+
+_SERVICES = {
+    "api.adzuna.com": "adzuna",
+    "api.tavily.com": "tavily",
+    "hiring.cafe": "hiringcafe",
+    "api.groq.com": "groq",
+    "generativelanguage.googleapis.com": "gemini",
+}
+
+
+class CassetteMiss(Exception):
+    """Replay found no recorded interaction for a request."""
+
+
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name))[:120]
+
+
+# ============================================================
+# REQUEST NORMALISATION / REDACTION
+# ============================================================
+
+def _redact_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = [
+        (k, REDACTED if k.lower() in _SECRET_PARAMS else v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def _redact_headers(headers) -> Dict[str, str]:
+    return {
+        str(k): REDACTED if str(k).lower() in _SECRET_HEADERS else str(v)
+        for k, v in (headers or {}).items()
+    }
+
+
+def _redact_fields(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: REDACTED if str(k).lower() in _SECRET_FIELDS else _redact_fields(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact_fields(v) for v in value]
+    return value
+
+
+def _redact_body(body: Any) -> str:
+    if body is None:
+        return ""
+    if isinstance(body, (bytes, bytearray)):
+        body = bytes(body).decode("utf-8", errors="replace")
+    elif not isinstance(body, str):
+        return json.dumps(_redact_fields(body), sort_keys=True, default=str)
+    try:
+        return json.dumps(_redact_fields(json.loads(body)), sort_keys=True)
+    except ValueError:
+        return body
+
+
+def describe_request(method: str, url: str, headers=None, body: Any = None) -> Dict[str, Any]:
+    """Redacted request record; `key` (method, sorted query, body hash) is what replay matches on."""
+    url = _redact_url(url)
+    body = _redact_body(body)
+    parts = urlsplit(url)
+    route = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    digest = hashlib.sha1(body.encode("utf-8")).hexdigest()[:16] if body else "-"
+    method = method.upper()
+    return {
+        "method": method,
+        "url": url,
+        "service": _SERVICES.get(parts.hostname or "", parts.hostname),
+        "headers": _redact_headers(headers),
+        "body": body,
+        "route": f"{method} {route}",
+        "key": f"{method} {route}?{query} {digest}",
+    }
+
+
+def _response_record(status: int, reason: Optional[str], headers, content: bytes) -> Dict[str, Any]:
+    return {
+        "status": status,
+        "reason": reason,
+        "headers": {str(k): str(v) for k, v in (headers or {}).items() if str(k).lower() not in _DROP_RESPONSE_HEADERS},
+        "body": content.decode("utf-8", errors="replace"),
+    }
+
+
+# ============================================================
+# CASSETTE
+# ============================================================
+
+class Cassette:
+    """Recorded interactions for one run, loaded from / saved to CASSETTE_DIR/<name>.json.gz."""
+
+    def __init__(self, name: str, mode: str = MODE_REPLAY, directory: str = CASSETTE_DIR,
+                 latency: float = CASSETTE_LATENCY):
+        self.name = name
+        self.mode = mode
+        self.latency = latency
+        self.path = name if name.endswith(".json.gz") else os.path.join(directory, f"{_safe(name)}.json.gz")
+        self.interactions: List[Dict[str, Any]] = []
+        self.played = 0
+        self.fuzzy = 0
+        self.misses = 0
+        self._by_key: Dict[str, List[int]] = {}
+        self._by_route: Dict[str, List[int]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if mode == MODE_REPLAY:
+            self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            self.interactions = json.load(f)["interactions"]
+        for index, interaction in enumerate(self.interactions):
+            request = interaction["request"]
+            self._by_key.setdefault(request["key"], []).append(index)
+            self._by_route.setdefault(request["route"], []).append(index)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            document = {
+                "version": 1,
+                "name": self.name,
+                "recorded_at": datetime.now().isoformat(),
+                "interactions": list(self.interactions),
+            }
+        tmp = f"{self.path}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(document, f)
+        os.replace(tmp, self.path)
+        print(f"[cassette] Saved {len(document['interactions'])} interactions to {self.path}")
+
+    def record(self, request: Dict[str, Any], response: Dict[str, Any], seconds: float):
+        with self._lock:
+            self.interactions.append({"request": request, "response": response, "seconds": round(seconds, 4)})
+
+    def _next(self, cursor: str, indices: List[int]) -> int:
+        # Repeats are served in recorded order; the last one is reused once they run out
+        position = self._cursors.get(cursor, 0)
+        self._cursors[cursor] = position + 1
+        return indices[min(position, len(indices) - 1)]
+
+    def play(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        """(recorded response, delay to apply) for a request; raises CassetteMiss."""
+        with self._lock:
+            if request["key"] in self._by_key:
+                index = self._next(request["key"], self._by_key[request["key"]])
+            elif request["route"] in self._by_route:
+                index = self._next(f"route:{request['route']}", self._by_route[request["route"]])
+                self.fuzzy += 1
+            else:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded response in {self.path} for {request['key']}")
+            self.played += 1
+        interaction = self.interactions[index]
+        return interaction["response"], interaction.get("seconds", 0) * self.latency
+
+    def stats(self) -> Dict[str, Any]:
+        services: Dict[str, int] = {}
+        for interaction in self.interactions:
+            service = interaction["request"].get("service") or "other"
+            services[service] = services.get(service, 0) + 1
+        return {
+            "name": self.name,
+            "mode": self.mode,
+            "interactions": len(self.interactions),
+            "services": services,
+            "played": self.played,
+            "fuzzy": self.fuzzy,
+            "misses": self.misses,
+        }
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("cassette", default=None)
+_process_cassette: Optional[Cassette] = None
+
+
+def current_cassette() -> Optional[Cassette]:
+    return _current.get() or _process_cassette
+
+
+@contextmanager
+def use_cassette(name: Optional[str], mode: str = CASSETTE_MODE, directory: str = CASSETTE_DIR,
+                 latency: float = CASSETTE_LATENCY, process_wide: bool = False) -> Iterator[Optional[Cassette]]:
+    """
+    Record or replay the block's external calls; yields None when mode is off.
+
+    Args:
+        name: Cassette name (hunt-<sessionId>, jd_analysis-<runId>) or a .json.gz path
+        mode: "record" / "replay" / "off"
+        latency: Replay: fraction of the recorded latency to sleep
+        process_wide: Also serve threads that don't carry this context
+    """
+    global _process_cassette
+    if not name or mode not in (MODE_RECORD, MODE_REPLAY):
+        yield None
+        return
+
+    install_hooks()
+    cassette = Cassette(name, mode, directory, latency)
+    token = _current.set(cassette)
+    if process_wide:
+        _process_cassette = cassette
+    try:
+        yield cassette
+    finally:
+        _current.reset(token)
+        if process_wide:
+            _process_cassette = None
+        if mode == MODE_RECORD:
+            try:
+                cassette.save()
+            except OSError as e:
+                print(f"[cassette] Failed to save {cassette.path}: {e}")
+
+
+# ============================================================
+# LIBRARY HOOKS
+# ============================================================
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def _install_requests():
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+    except ImportError:
+        return
+    live_send = HTTPAdapter.send
+
+    def build(recorded: Dict[str, Any], request, seconds: float):
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = recorded["body"].encode("utf-8")
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=seconds)
+        return response
+
+    def send(self, request, *args, **kwargs):
+        cassette = current_cassette()
+        if cassette is None:
+            return live_send(self, request, *args, **kwargs)
+        described = describe_request(request.method, request.url, request.headers, request.body)
+        if cassette.mode == MODE_REPLAY:
+            recorded, delay = cassette.play(described)
+            if delay:
+                time.sleep(delay)
+            return build(recorded, request, delay)
+        start = time.monotonic()
+        response = live_send(self, request, *args, **kwargs)
+        cassette.record(
+            described,
+            _response_record(response.status_code, response.reason, response.headers, response.content),
+            time.monotonic() - start,
+        )
+        return response
+
+    HTTPAdapter.send = send
+
+
+class _ReplayedClientResponse:
+    """The parts of aiohttp.ClientResponse callers use, served from a cassette."""
+
+    def __init__(self, recorded: Dict[str, Any], method: str, url: str):
+        self.status = recorded["status"]
+        self.reason = recorded.get("reason")
+        self.headers = dict(recorded["headers"])
+        self.method = method
+        self.url = url
+        self._body = recorded["body"].encode("utf-8")
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    def raise_for_status(self):
+        if not self.ok:
+            import aiohttp
+            raise aiohttp.ClientResponseError(None, (), status=self.status, message=self.reason or "")
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None, errors: str = "strict") -> str:
+        return self._body.decode(encoding or "utf-8", errors)
+
+    async def json(self, *, encoding: Optional[str] = None, loads=json.loads, content_type: Optional[str] = None):
+        return loads(self._body.decode(encoding or "utf-8"))
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def wait_for_close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+def _install_aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        return
+    live_request = aiohttp.ClientSession._request
+
+    async def _request(self, method, str_or_url, *args, **kwargs):
+        cassette = current_cassette()
+        if cassette is None:
+            return await live_request(self, method, str_or_url, *args, **kwargs)
+        url = str(str_or_url)
+        params = kwargs.get("params")
+        if params:
+            url += ("&" if "?" in url else "?") + urlencode(
+                [(k, str(v)) for k, v in (params.items() if hasattr(params, "items") else params)]
+            )
+        body = kwargs["json"] if kwargs.get("json") is not None else kwargs.get("data")
+        described = describe_request(method, url, kwargs.get("headers"), body)
+        if cassette.mode == MODE_REPLAY:
+            recorded, delay = cassette.play(described)
+            if delay:
+                await asyncio.sleep(delay)
+            return _ReplayedClientResponse(recorded, method, url)
+        start = time.monotonic()
+        response = await live_request(self, method, str_or_url, *args, **kwargs)
+        content = await response.read()  # Cached on the response for the caller
+        cassette.record(
+            described, _response_record(response.status, response.reason, response.headers, content),
+            time.monotonic() - start,
+        )
+        return response
+
+    aiohttp.ClientSession._request = _request
+
+
+def _install_httpx():
+    try:
+        import httpx
+    except ImportError:
+        return
+    live_handle = httpx.HTTPTransport.handle_request
+    live_handle_async = httpx.AsyncHTTPTransport.handle_async_request
+
+    def build(recorded: Dict[str, Any], request) -> "httpx.Response":
+        return httpx.Response(
+            recorded["status"], headers=recorded["headers"], content=recorded["body"].encode("utf-8"), request=request
+        )
+
+    def describe(request) -> Dict[str, Any]:
+        return describe_request(request.method, str(request.url), request.headers, request.content)
+
+    def handle_request(self, request):
+        cassette = current_cassette()
+        if cassette is None:
+            return live_handle(self, request)
+        request.read()
+        described = describe(request)
+        if cassette.mode == MODE_REPLAY:
+            recorded, delay = cassette.play(described)
+            if delay:
+                time.sleep(delay)
+            return build(recorded, request)
+        start = time.monotonic()
+        response = live_handle(self, request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        recorded = _response_record(response.status_code, response.reason_phrase, response.headers, content)
+        cassette.record(described, recorded, time.monotonic() - start)
+        return build(recorded, request)
+
+    async def handle_async_request(self, request):
+        cassette = current_cassette()
+        if cassette is None:
+            return await live_handle_async(self, request)
+        await request.aread()
+        described = describe(request)
+        if cassette.mode == MODE_REPLAY:
+            recorded, delay = cassette.play(described)
+            if delay:
+                await asyncio.sleep(delay)
+            return build(recorded, request)
+        start = time.monotonic()
+        response = await live_handle_async(self, request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        recorded = _response_record(response.status_code, response.reason_phrase, response.headers, content)
+        cassette.record(described, recorded, time.monotonic() - start)
+        return build(recorded, request)
+
+    httpx.HTTPTransport.handle_request = handle_request
+    httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+
+
+def install_hooks():
+    """Patch requests / aiohttp / httpx once; unaffected calls pass straight through."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _install_requests()
+        _install_aiohttp()
+        _install_httpx()
+        _installed = True
@@ -142,7 +142,7 @@ def assign_badges(job: Dict, rank: int, company_tier: str) -> List[str]:
         badges.append(f"🎯 {company_tier}-Tier")
     
     # High salary badge
-    salary_min = job.get("salary_min", 0)
+    salary_min = job.get("salary_min") or 0  # present but null in some Adzuna results
     if salary_min > 2500000:
         badges.append("💰 High Salary")
     
@@ -206,7 +206,7 @@ def generate_gap_analysis(job: Dict, fingerprint: Dict, match_score: int) -> str
     
     # Check salary expectation
     expected_min = fingerprint.get("expected_salary_min", 0)
-    job_salary = job.get("salary_min", 0)
+    job_salary = job.get("salary_min") or 0
     if expected_min > 0 and job_salary > 0 and job_salary < expected_min * 0.8:
         gaps.append("Salary below expectation")
     
@@ -2,6 +2,7 @@
 import os
 from google import genai
 from google.genai import types
+from utils.usage_tracker import track_http
 
 # Lazy-load client to ensure environment variables are loaded first
 _client = None
@@ -35,14 +36,15 @@ def generate_embedding(text: str, output_dim=768) -> list:
         print(f"   [embedding] Generating {output_dim}-dim embedding for: '{text[:100]}...'")
         
         client = get_client()
-        result = client.models.embed_content(
-            model="gemini-embedding-001",
-            contents=text,
-            config=types.EmbedContentConfig(
-                task_type="RETRIEVAL_DOCUMENT",
-                output_dimensionality=output_dim
+        with track_http("gemini"):
+            result = client.models.embed_content(
+                model="gemini-embedding-001",
+                contents=text,
+                config=types.EmbedContentConfig(
+                    task_type="RETRIEVAL_DOCUMENT",
+                    output_dimensionality=output_dim
+                )
             )
-        )
         
         # Extract embedding values
         embedding = result.embeddings[0].values
@@ -116,14 +118,15 @@ def generate_chat_embedding(message: str) -> list:
             return []
         
         client = get_client()
-        result = client.models.embed_content(
-            model="gemini-embedding-001",
-            contents=message,
-            config=types.EmbedContentConfig(
-                task_type="RETRIEVAL_QUERY",  # Use RETRIEVAL_QUERY for search queries
-                output_dimensionality=768
+        with track_http("gemini"):
+            result = client.models.embed_content(
+                model="gemini-embedding-001",
+                contents=message,
+                config=types.EmbedContentConfig(
+                    task_type="RETRIEVAL_QUERY",  # Use RETRIEVAL_QUERY for search queries
+                    output_dimensionality=768
+                )
             )
-        )
         
         return list(result.embeddings[0].values)
     except Exception as e:
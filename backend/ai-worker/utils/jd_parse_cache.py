@@ -0,0 +1,178 @@
+"""
+JD Parse Cache - cross-user parsed JD memoisation
+
+Popular postings are analysed by many users, and each run used to repeat the
+70B parse_jd call on the same text. Parsed JDs are cached by a hash of the
+normalised JD text, so copies that differ only in whitespace, casing, HTML
+tags or known boilerplate ("Equal Opportunity Employer", "Apply now", job-board
+"Job ID:" lines, ...) share an entry. Only those exact phrases and line formats
+are dropped; any other text, even on the same line, still counts towards the
+hash, so two genuinely different JDs never share a parse.
+
+Two layers:
+- In-process LRU (JD_PARSE_CACHE_SIZE entries, default 512)
+- MongoDB collection jd_parse_cache with a TTL index (JD_PARSE_CACHE_TTL_DAYS, default 14)
+
+MongoDB is optional; without MONGODB_URI only the LRU is used.
+"""
+
+from pymongo import MongoClient
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, Dict
+
+from utils.metrics import record_cache
+
+PROMPT_VERSION = "v1"
+LRU_SIZE = int(os.getenv("JD_PARSE_CACHE_SIZE", "512"))
+CACHE_TTL_DAYS = int(os.getenv("JD_PARSE_CACHE_TTL_DAYS", "14"))
+
+# Exact phrases that carry no information about the role itself
+BOILERPLATE_PHRASES = [
+    "we are an equal opportunity employer",
+    "is an equal opportunity employer",
+    "equal opportunity employer",
+    "click here to apply",
+    "apply now",
+    "apply here",
+    "apply today",
+    "share this job",
+]
+# Whole-line job-board metadata (the line must match entirely)
+BOILERPLATE_LINES = [
+    r"(?:posted|date posted)\s*:\s*[\w ,./-]*",
+    r"job id\s*:\s*[\w-]+",
+    r"\d+\+?\s+(?:applicants|views)",
+]
+_PHRASE_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(p) for p in sorted(BOILERPLATE_PHRASES, key=len, reverse=True)) + r")\b[.!]?"
+)
+_LINE_RES = [re.compile(pattern) for pattern in BOILERPLATE_LINES]
+_HAS_WORD_RE = re.compile(r"\w")
+_TAG_RE = re.compile(r"<[^>]+>")
+_ENTITY_RE = re.compile(r"&(?:nbsp|amp|quot|#39|lt|gt);")
+
+
+def normalize_jd_text(jd_text: str) -> str:
+    """Lowercase, strip HTML and boilerplate phrases/lines, collapse whitespace and bullets."""
+    text = _ENTITY_RE.sub(" ", _TAG_RE.sub("\n", jd_text or ""))
+    lines = []
+    for line in text.lower().splitlines():
+        line = re.sub(r"^[\s•●▪◦‣\-\*–]+", "", line)
+        line = re.sub(r"\s+", " ", line).strip()
+        if any(regex.fullmatch(line) for regex in _LINE_RES):
+            continue
+        line = re.sub(r"\s+", " ", _PHRASE_RE.sub(" ", line)).strip()
+        if _HAS_WORD_RE.search(line):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def calculate_jd_hash(jd_text: str) -> str:
+    """SHA-256 of the normalised JD text."""
+    return hashlib.sha256(normalize_jd_text(jd_text).encode("utf-8")).hexdigest()
+
+
+class JDParseCache:
+    """LRU + MongoDB cache for parse_jd output"""
+
+    def __init__(self, max_entries: int = LRU_SIZE):
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.collection = None
+
+        mongo_uri = os.getenv("MONGODB_URI") or os.getenv("MONGO_URI")
+        if not mongo_uri:
+            print("[JDParseCache] MONGODB_URI not set, using in-process cache only")
+            return
+
+        try:
+            client = MongoClient(mongo_uri)
+            self.collection = client["career_os"]["jd_parse_cache"]
+            self.collection.create_index([("jd_hash", 1), ("prompt_version", 1)], unique=True)
+            self.collection.create_index("created_at", expireAfterSeconds=CACHE_TTL_DAYS * 24 * 3600)
+        except Exception as e:
+            print(f"[JDParseCache] MongoDB unavailable, using in-process cache only: {e}")
+
+    def _remember(self, jd_hash: str, parsed: Dict):
+        with self._lock:
+            self._lru[jd_hash] = parsed
+            self._lru.move_to_end(jd_hash)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def peek(self, jd_text: str) -> Optional[Dict]:
+        """In-process lookup only (no network) - for hot paths like lexical scoring."""
+        jd_hash = calculate_jd_hash(jd_text)
+        with self._lock:
+            parsed = self._lru.get(jd_hash)
+            if parsed is not None:
+                self._lru.move_to_end(jd_hash)
+            return parsed
+
+    def get(self, jd_text: str) -> Optional[Dict]:
+        """Get parsed JD for this text from the LRU, then MongoDB. None on miss."""
+        jd_hash = calculate_jd_hash(jd_text)
+        with self._lock:
+            parsed = self._lru.get(jd_hash)
+            if parsed is not None:
+                self._lru.move_to_end(jd_hash)
+                print(f"[JDParseCache] ✅ HIT (memory) jd_hash={jd_hash[:8]}")
+                record_cache("jd_parse", True)
+                return parsed
+
+        if self.collection is None:
+            record_cache("jd_parse", False)
+            return None
+
+        try:
+            doc = self.collection.find_one({"jd_hash": jd_hash, "prompt_version": PROMPT_VERSION})
+            if not doc:
+                print(f"[JDParseCache] Miss for jd_hash={jd_hash[:8]}")
+                record_cache("jd_parse", False)
+                return None
+            print(f"[JDParseCache] ✅ HIT (mongo) jd_hash={jd_hash[:8]}")
+            record_cache("jd_parse", True)
+            self._remember(jd_hash, doc["parsed_jd"])
+            return doc["parsed_jd"]
+        except Exception as e:
+            print(f"[JDParseCache] Error reading cache: {e}")
+            return None
+
+    def save(self, jd_text: str, parsed: Dict):
+        """Store a parsed JD (upsert). Empty results are not cached."""
+        if not parsed:
+            return
+        jd_hash = calculate_jd_hash(jd_text)
+        self._remember(jd_hash, parsed)
+
+        if self.collection is None:
+            return
+        try:
+            self.collection.update_one(
+                {"jd_hash": jd_hash, "prompt_version": PROMPT_VERSION},
+                {"$set": {"parsed_jd": parsed, "created_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+            print(f"[JDParseCache] ✅ Saved jd_hash={jd_hash[:8]}")
+        except Exception as e:
+            print(f"[JDParseCache] Error saving cache: {e}")
+            # Don't raise - caching is optional
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_jd_parse_cache() -> JDParseCache:
+    """Get the shared cache instance."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = JDParseCache()
+    return _cache
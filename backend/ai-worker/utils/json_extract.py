@@ -0,0 +1,225 @@
+"""
+JSON Extraction - one shared parser for LLM responses
+
+Replaces the per-module copies (matcher_graph.clean_json's shrinking loop,
+worker.clean_json_response, and the regex extractors in batch_scorer and the
+job hunter nodes). Everything runs in a single linear pass:
+
+1. If the response has a ``` fence, scanning starts at the fence body, so
+   preamble text before it is ignored. The closing fence only bounds the fast
+   path: a value may itself contain ``` inside a string
+2. json.JSONDecoder.raw_decode parses from the next { or [ in place, so
+   trailing text is ignored. Only the first few candidates get this: a failed
+   raw_decode computes its error line/column from the start of the response,
+   so trying it at every candidate would be quadratic
+3. Otherwise a balanced-bracket scanner (skipping over strings, so braces
+   inside values don't confuse it) bounds the region, which is parsed on its
+   own and, if that fails, repaired once - single-quoted strings, trailing
+   commas, Python True/False/None - and parsed again
+4. Otherwise scanning resumes after the region (e.g. "{name} is: {...}")
+
+Regions never overlap and at most RAW_DECODE_ATTEMPTS full-length decodes
+are tried, so cost is linear in the response length.
+"""
+
+import re
+import json
+from typing import Any, Optional, Tuple
+
+_decoder = json.JSONDecoder()
+
+# Candidates tried with raw_decode on the whole response before falling back
+# to the region scanner (see module docstring)
+RAW_DECODE_ATTEMPTS = 4
+
+# RecursionError: pathologically deep nesting ("[[[[...")
+_PARSE_ERRORS = (ValueError, RecursionError)
+
+_OPENERS = {"{": "}", "[": "]"}
+_START_RE = re.compile(r"[\[{]")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class JSONExtractionError(ValueError):
+    """Raised when no valid JSON value can be extracted from a response."""
+
+
+def _fence_bounds(text: str) -> Tuple[int, int]:
+    """
+    (body_start, closing_fence) of the first ```json (or plain ```) fence.
+
+    Without a fence the whole text is the body. The closing fence is the next
+    ``` after the opener, which may sit inside a string value; callers only
+    trust it for the whole-body fast path.
+    """
+    start = text.find("```json")
+    if start != -1:
+        body_start = start + len("```json")
+    else:
+        start = text.find("```")
+        if start == -1:
+            return 0, len(text)
+        body_start = start + 3
+        # Skip a language tag on the fence line (```JSON, ```javascript, ...)
+        newline = text.find("\n", body_start)
+        if newline != -1 and text[body_start:newline].strip().isalpha():
+            body_start = newline + 1
+    end = text.find("```", body_start)
+    return body_start, end if end != -1 else len(text)
+
+
+def _scan_region(text: str, start: int) -> Tuple[int, bool]:
+    """
+    Find the end of the bracketed region opening at text[start].
+
+    Returns (end_index_exclusive, complete). Strings in either quote style are
+    skipped. If the text ends first, returns (len(text), False).
+    """
+    stack = [_OPENERS[text[start]]]
+    quote = None
+    i = start + 1
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if quote:
+            if ch == "\\":
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+        elif ch == '"' or (ch == "'" and not text[i - 1].isalnum()):
+            quote = ch
+        elif ch in _OPENERS:
+            stack.append(_OPENERS[ch])
+        elif ch == "}" or ch == "]":
+            if ch != stack[-1]:
+                return i + 1, False
+            stack.pop()
+            if not stack:
+                return i + 1, True
+        i += 1
+    return n, False
+
+
+def repair_json(candidate: str) -> str:
+    """
+    Fix common LLM JSON quirks in one pass:
+    - 'single quoted' strings -> "double quoted"
+    - trailing commas before } or ]
+    - Python True/False/None -> true/false/null
+    """
+    out = []
+    quote = None
+    i = 0
+    n = len(candidate)
+    while i < n:
+        ch = candidate[i]
+        if quote:
+            if ch == "\\" and i + 1 < n:
+                nxt = candidate[i + 1]
+                if quote == "'" and nxt == "'":
+                    out.append("'")  # \' is not a valid JSON escape
+                else:
+                    out.append(ch + nxt)
+                i += 2
+                continue
+            if ch == quote:
+                out.append('"')
+                quote = None
+            elif ch == '"' and quote == "'":
+                out.append('\\"')
+            else:
+                out.append(ch)
+        elif ch == '"' or ch == "'":
+            quote = ch
+            out.append('"')
+        elif ch == "}" or ch == "]":
+            # Drop a trailing comma (and whitespace) before the closer
+            j = len(out) - 1
+            while j >= 0 and out[j].isspace():
+                j -= 1
+            if j >= 0 and out[j] == ",":
+                del out[j]
+            out.append(ch)
+        elif ch.isalpha():
+            j = i
+            while j < n and candidate[j].isalnum():
+                j += 1
+            word = candidate[i:j]
+            out.append(_PY_LITERALS.get(word, word))
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def extract_json(text: str, expect: Optional[type] = None) -> Any:
+    """
+    Extract the first JSON object/array from an LLM response.
+
+    Args:
+        text: Raw model output (may include fences, preamble, trailing prose)
+        expect: dict or list to skip values of the other type
+
+    Returns:
+        Parsed JSON value
+
+    Raises:
+        JSONExtractionError: No valid JSON of the expected type found
+    """
+    if not text:
+        raise JSONExtractionError("Empty response.")
+    text = text.strip()
+    start, fence_end = _fence_bounds(text)
+
+    # Fast path: the (fenced) body is clean JSON
+    try:
+        value = json.loads(text[start:fence_end])
+        if expect is None or isinstance(value, expect):
+            return value
+    except _PARSE_ERRORS:
+        pass
+
+    n = len(text)
+    attempts = 0
+    match = _START_RE.search(text, start)
+    while match:
+        i = match.start()
+        value = None
+        if attempts < RAW_DECODE_ATTEMPTS:
+            attempts += 1
+            try:
+                value, end = _decoder.raw_decode(text, i)
+                complete = True
+            except _PARSE_ERRORS:
+                pass
+        if value is None:
+            end, complete = _scan_region(text, i)
+            # Repairs never add or balance brackets, so an unbalanced region
+            # cannot be saved; skip both parses for it
+            if complete:
+                region = text[i:end]
+                try:
+                    value = json.loads(region)
+                except _PARSE_ERRORS:
+                    try:
+                        value = json.loads(repair_json(region))
+                    except _PARSE_ERRORS:
+                        value = None
+        if value is not None and (expect is None or isinstance(value, expect)):
+            return value
+        if not complete and end == n:
+            break
+        match = _START_RE.search(text, end)
+
+    raise JSONExtractionError("Could not extract valid JSON from text.")
+
+
+def try_extract_json(text: str, default: Any = None, expect: Optional[type] = None) -> Any:
+    """extract_json that returns `default` instead of raising."""
+    try:
+        return extract_json(text, expect=expect)
+    except JSONExtractionError:
+        return default
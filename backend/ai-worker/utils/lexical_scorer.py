@@ -0,0 +1,249 @@
+"""
+Lexical Match Scorer - deterministic resume/JD fast score
+
+Computes a preliminary 0-100 match score locally, in milliseconds, so callers
+that only need a number never pay for the LLM matcher graph:
+- Skill overlap (55%): JD skills found in the resume / fingerprint
+- YoE fit (20%): candidate years vs. the JD's minimum requirement
+- Keyword coverage (25%): top JD content words present in the resume
+
+JD skills come from the parsed JD (mandatory/optional) when available, otherwise
+from TECH_TERMS found in the raw JD text. Components that cannot be computed
+(no skills, no YoE on either side) are dropped and the weights renormalised.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Any
+
+WEIGHTS = {"skills": 0.55, "yoe": 0.20, "keywords": 0.25}
+
+# Mandatory skills count more than optional ones inside the skill component
+MANDATORY_WEIGHT = 0.7
+OPTIONAL_WEIGHT = 0.3
+
+# Number of most frequent JD content words checked for keyword coverage
+TOP_KEYWORDS = 25
+
+TECH_TERMS = [
+    # Languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "golang", "rust", "kotlin",
+    "swift", "ruby", "php", "scala", "sql", "bash", "dart", "matlab",
+    # Frontend
+    "react", "react native", "next.js", "angular", "vue", "redux", "html", "css", "tailwind",
+    "flutter",
+    # Backend
+    "node.js", "express", "django", "flask", "fastapi", "spring", "spring boot", ".net",
+    "graphql", "rest", "grpc", "microservices",
+    # Data / ML
+    "pandas", "numpy", "pytorch", "tensorflow", "scikit-learn", "machine learning",
+    "deep learning", "nlp", "computer vision", "llm", "langchain", "spark", "hadoop",
+    "airflow", "kafka", "tableau", "power bi", "etl",
+    # Databases
+    "postgresql", "postgres", "mysql", "mongodb", "redis", "elasticsearch", "dynamodb",
+    "cassandra", "sqlite", "oracle",
+    # Cloud / DevOps
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "ci/cd",
+    "linux", "git", "github actions", "ansible", "rabbitmq",
+    # Practices
+    "system design", "data structures", "algorithms", "agile", "unit testing", "selenium",
+]
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "for", "on", "with", "as", "at", "by",
+    "is", "are", "be", "will", "you", "your", "we", "our", "us", "this", "that", "from",
+    "have", "has", "who", "what", "can", "should", "must", "able", "work", "working",
+    "team", "teams", "role", "job", "experience", "years", "year", "skills", "strong",
+    "good", "knowledge", "ability", "responsibilities", "requirements", "candidate",
+    "company", "including", "etc", "using", "use", "plus", "preferred", "required",
+    "looking", "join", "other", "all", "any", "more", "new", "across", "within", "about",
+    "their", "they", "it", "its", "not", "but", "if", "into", "also", "well", "such",
+}
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#./-]*[a-z0-9+#]|[a-z]")
+_JD_YOE_PATTERNS = [
+    re.compile(r"(\d+)\+?\s*-?\s*(?:\d+)?\s*years?\s+(?:of\s+)?(?:\w+\s+)?experience"),
+    re.compile(r"minimum\s+(?:of\s+)?(\d+)\s+years?"),
+    re.compile(r"at\s+least\s+(\d+)\s+years?"),
+    re.compile(r"(\d+)\s*\+\s*years?"),
+]
+_RESUME_YOE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?|yoe)\b")
+
+
+def _contains(term: str, text: str) -> bool:
+    """Word-boundary match that tolerates symbols (c++, node.js, ci/cd)."""
+    return re.search(rf"(?<![\w]){re.escape(term)}(?![\w+#])", text) is not None
+
+
+def _tokens(text: str) -> List[str]:
+    return [w.strip("./-") for w in _WORD_RE.findall(text)]
+
+
+def parse_fingerprint(fingerprint: Optional[str]) -> Dict[str, Any]:
+    """
+    Parse the worker's plain-text fingerprint:
+    "[Seniority] | [X YOE] | [Skill1, Skill2, ...] | [Key achievement] | [Target roles]"
+
+    Returns {"yoe": float|None, "skills": [lowercased skills]}.
+    """
+    result = {"yoe": None, "skills": []}
+    if not fingerprint or not isinstance(fingerprint, str):
+        return result
+    parts = [p.strip(" []") for p in fingerprint.split("|")]
+    for part in parts:
+        match = _RESUME_YOE_RE.search(part.lower())
+        if match and result["yoe"] is None:
+            result["yoe"] = float(match.group(1))
+        elif "," in part and len(part) < 200:
+            result["skills"] = [s.strip().lower() for s in part.split(",") if s.strip()]
+            break
+    return result
+
+
+def extract_jd_requirements(jd_text: str, parsed_jd: Optional[Dict] = None) -> Dict[str, Any]:
+    """Return {"mandatory": [...], "optional": [...], "min_yoe": int|None} for a JD."""
+    jd_lower = (jd_text or "").lower()
+    parsed_jd = parsed_jd or {}
+
+    mandatory = [str(s).lower().strip() for s in parsed_jd.get("mandatory_skills") or [] if s]
+    optional = [str(s).lower().strip() for s in parsed_jd.get("optional_skills") or [] if s]
+    if not mandatory and not optional and jd_lower:
+        mandatory = [term for term in TECH_TERMS if _contains(term, jd_lower)]
+
+    min_yoe = parsed_jd.get("min_experience_years")
+    if not isinstance(min_yoe, (int, float)):
+        min_yoe = None
+        for pattern in _JD_YOE_PATTERNS:
+            match = pattern.search(jd_lower)
+            if match:
+                min_yoe = int(match.group(1))
+                break
+
+    return {"mandatory": mandatory, "optional": optional, "min_yoe": min_yoe}
+
+
+def _resume_profile(resume_text: str, fingerprint: Optional[str] = None) -> Dict[str, Any]:
+    """Lowercased text, token set and YoE for one resume (cached per batch)."""
+    resume_lower = (resume_text or "").lower()
+    fp = parse_fingerprint(fingerprint)
+    if fp["skills"]:
+        # Fingerprint skills are matched like resume text
+        resume_lower = f"{resume_lower}\n{', '.join(fp['skills'])}"
+    yoe = fp["yoe"]
+    if yoe is None:
+        match = _RESUME_YOE_RE.search(resume_lower[:3000])
+        if match:
+            yoe = float(match.group(1))
+    return {"text": resume_lower, "tokens": set(_tokens(resume_lower)), "yoe": yoe}
+
+
+def _skill_component(resume_lower: str, requirements: Dict) -> Tuple[Optional[float], List[str], List[str]]:
+    def coverage(skills):
+        if not skills:
+            return None, [], []
+        found = [s for s in skills if _contains(s, resume_lower)]
+        missing = [s for s in skills if s not in found]
+        return len(found) / len(skills), found, missing
+
+    mandatory, m_found, m_missing = coverage(requirements["mandatory"])
+    optional, o_found, o_missing = coverage(requirements["optional"])
+    if mandatory is None and optional is None:
+        return None, [], []
+    if mandatory is None:
+        value = optional
+    elif optional is None:
+        value = mandatory
+    else:
+        value = MANDATORY_WEIGHT * mandatory + OPTIONAL_WEIGHT * optional
+    return value, m_found + o_found, m_missing + o_missing
+
+
+def _yoe_component(candidate_yoe: Optional[float], min_yoe: Optional[int]) -> Optional[float]:
+    if min_yoe is None or candidate_yoe is None:
+        return None
+    if min_yoe <= 0 or candidate_yoe >= min_yoe:
+        # Heavily over-qualified candidates are a weaker fit for junior roles
+        return 0.8 if min_yoe > 0 and candidate_yoe >= min_yoe + 8 else 1.0
+    return max(0.0, candidate_yoe / min_yoe)
+
+
+def _keyword_component(resume_tokens: set, jd_lower: str) -> Optional[float]:
+    words = [w for w in _tokens(jd_lower) if len(w) > 2 and w not in STOPWORDS and not w.isdigit()]
+    if not words:
+        return None
+    top = [w for w, _ in Counter(words).most_common(TOP_KEYWORDS)]
+    return sum(1 for w in top if w in resume_tokens) / len(top)
+
+
+def _score(profile: Dict, jd_text: str, parsed_jd: Optional[Dict]) -> Dict[str, Any]:
+    jd_lower = (jd_text or "").lower()
+    requirements = extract_jd_requirements(jd_lower, parsed_jd)
+
+    skills, matched, missing = _skill_component(profile["text"], requirements)
+    components = {
+        "skills": skills,
+        "yoe": _yoe_component(profile["yoe"], requirements["min_yoe"]),
+        "keywords": _keyword_component(profile["tokens"], jd_lower),
+    }
+    available = {k: v for k, v in components.items() if v is not None}
+    if available:
+        total_weight = sum(WEIGHTS[k] for k in available)
+        score = int(round(sum(WEIGHTS[k] * v for k, v in available.items()) / total_weight * 100))
+    else:
+        score = 50  # Nothing to compare - neutral
+
+    return {
+        "score": max(0, min(100, score)),
+        "components": {k: (round(v, 3) if v is not None else None) for k, v in components.items()},
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "min_yoe": requirements["min_yoe"],
+        "candidate_yoe": profile["yoe"],
+    }
+
+
+def score_match(
+    resume_text: str,
+    jd_text: str = "",
+    parsed_jd: Optional[Dict] = None,
+    fingerprint: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Score one resume against one JD without any LLM call.
+
+    Args:
+        resume_text: Raw resume text
+        jd_text: Raw job description (may be empty if parsed_jd is given)
+        parsed_jd: Output of the matcher's PARSE_JD_PROMPT, if already available
+        fingerprint: Resume fingerprint string from partial_profiles/users
+
+    Returns:
+        Dict with score (0-100), per-component values, matched/missing skills
+    """
+    return _score(_resume_profile(resume_text, fingerprint), jd_text, parsed_jd)
+
+
+def score_batch(
+    pairs: List[Tuple[str, str]],
+    parsed_jds: Optional[List[Optional[Dict]]] = None,
+    fingerprints: Optional[List[Optional[str]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Score many (resume_text, jd_text) pairs.
+
+    parsed_jds and fingerprints, when given, are aligned with pairs (one entry
+    per pair, None where unknown), so pairs from different resumes each use
+    their own fingerprint. Resume preprocessing is done once per distinct
+    (resume, fingerprint), so scoring one resume against hundreds of JDs costs
+    little more than the JD tokenising.
+    """
+    profiles = {}
+    results = []
+    for i, (resume_text, jd_text) in enumerate(pairs):
+        fingerprint = fingerprints[i] if fingerprints and i < len(fingerprints) else None
+        profile = profiles.get((resume_text, fingerprint))
+        if profile is None:
+            profile = profiles[(resume_text, fingerprint)] = _resume_profile(resume_text, fingerprint)
+        parsed = parsed_jds[i] if parsed_jds and i < len(parsed_jds) else None
+        results.append(_score(profile, jd_text, parsed))
+    return results
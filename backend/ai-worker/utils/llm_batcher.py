@@ -0,0 +1,225 @@
+"""
+Cross-Session LLM Micro-Batcher
+
+Concurrent hunts each used to send their own small AI-cleanup and scoring
+prompts, repeating the long instruction preamble every time. With the batcher
+enabled, hunts submit individual (context, job) entries - context being the
+hunt's criteria or resume fingerprint - to a shared per-stage queue:
+
+- A dispatcher thread waits for the first entry, then lingers up to
+  LLM_BATCHER_LINGER_MS collecting more, until the stage's item limit or
+  token budget is reached
+- Entries from different sessions are packed into one prompt by the stage
+  handler; each distinct context is written once and jobs reference it
+- The handler returns one result per entry, which is routed back to the
+  waiting hunt through a Future
+- The batch's token/latency usage is split evenly over the submitting
+  hunts' usage scopes (utils/usage_tracker.py)
+
+Batches run on a small thread pool so the dispatcher keeps collecting while
+earlier batches are in flight. shutdown_batchers() (called on worker exit)
+dispatches whatever is queued, waits for in-flight batches and stops the
+threads. Disabled by default (LLM_BATCHER_ENABLED).
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.usage_tracker import current_scope, shared_scope
+
+BATCHER_ENABLED = os.getenv("LLM_BATCHER_ENABLED", "false").lower() == "true"
+LINGER_MS = int(os.getenv("LLM_BATCHER_LINGER_MS", "75"))
+TOKEN_BUDGET = int(os.getenv("LLM_BATCHER_TOKEN_BUDGET", "6000"))
+BATCH_WORKERS = int(os.getenv("LLM_BATCHER_WORKERS", "4"))
+
+# Rough chars-per-token ratio for budget estimates
+CHARS_PER_TOKEN = 4
+
+# Queued by stop(): everything submitted before it is still dispatched
+_STOP = object()
+
+
+def estimate_tokens(value: Any) -> int:
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def context_key(context: Any) -> str:
+    """Stable key for a hunt context (criteria dict / fingerprint dict)."""
+    return json.dumps(context, sort_keys=True, default=str)
+
+
+class MicroBatcher:
+    """
+    Coalesces entries from many callers into batched handler calls.
+
+    Args:
+        name: Stage name for logs
+        handler: handler(entries) -> one result per entry, in order
+        max_items: Max entries per batch
+        token_budget: Max estimated prompt tokens per batch
+        context_of: entry -> shared context (counted once per batch)
+        item_text: entry -> per-item text (counted for every entry)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[Any]], List[Any]],
+        max_items: int = 20,
+        token_budget: int = TOKEN_BUDGET,
+        linger_ms: int = LINGER_MS,
+        context_of: Callable[[Any], Any] = lambda entry: entry[0],
+        item_text: Callable[[Any], Any] = lambda entry: entry[1],
+    ):
+        self.name = name
+        self.handler = handler
+        self.max_items = max_items
+        self.token_budget = token_budget
+        self.linger = linger_ms / 1000
+        self.context_of = context_of
+        self.item_text = item_text
+
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._carry = None  # entry that didn't fit the previous batch
+        self._closed = False  # stop() called; submit() refuses new entries
+        self._stop_seen = False  # dispatcher reached the _STOP marker
+        self._close_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix=f"batcher-{name}")
+        self._thread = threading.Thread(target=self._dispatch_loop, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, entry: Any) -> Future:
+        future: Future = Future()
+        # The submitting hunt's usage scope and trace context ride along with the future
+        future.usage_scope = current_scope()
+        future.context = contextvars.copy_context()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError(f"batcher {self.name} is stopped")
+            self._queue.put((entry, future))
+        return future
+
+    def submit_many(self, entries: List[Any]) -> List[Future]:
+        return [self.submit(entry) for entry in entries]
+
+    def _collect(self) -> List[tuple]:
+        """Block for the first entry, then linger for more within the limits."""
+        if self._carry is not None:
+            batch, self._carry = [self._carry], None
+        else:
+            item = self._queue.get()
+            if item is _STOP:
+                self._stop_seen = True
+                return []
+            batch = [item]
+        seen_contexts = {context_key(self.context_of(batch[0][0]))}
+        tokens = estimate_tokens(self.context_of(batch[0][0])) + estimate_tokens(self.item_text(batch[0][0]))
+        deadline = time.monotonic() + self.linger
+
+        while len(batch) < self.max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._stop_seen = True
+                break
+            entry, future = item
+            cost = estimate_tokens(self.item_text(entry))
+            key = context_key(self.context_of(entry))
+            if key not in seen_contexts:
+                cost += estimate_tokens(self.context_of(entry))
+            if tokens + cost > self.token_budget:
+                # Doesn't fit: it opens the next batch
+                self._carry = (entry, future)
+                break
+            seen_contexts.add(key)
+            tokens += cost
+            batch.append((entry, future))
+
+        return batch
+
+    def _handle(self, entries: List[Any], owners: List[Any]) -> List[Any]:
+        with shared_scope(owners):
+            return self.handler(entries)
+
+    def _run(self, batch: List[tuple]):
+        entries = [entry for entry, _ in batch]
+        sessions = len({context_key(self.context_of(e)) for e in entries})
+        print(f"   [batcher] stage={self.name} items={len(entries)} contexts={sessions}")
+        try:
+            # LLM spans are recorded under the first submitter's trace
+            results = batch[0][1].context.run(self._handle, entries, [future.usage_scope for _, future in batch])
+            if len(results) != len(entries):
+                raise ValueError(f"handler returned {len(results)} results for {len(entries)} entries")
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _dispatch_loop(self):
+        while True:
+            batch = self._collect()
+            if batch:
+                self._executor.submit(self._run, batch)
+            if self._stop_seen and self._carry is None:
+                break
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop accepting entries, dispatch the queued ones and wait for them.
+
+        Args:
+            timeout: Max seconds to wait for the dispatcher thread (None = no limit)
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=True)
+
+
+_batchers: Dict[str, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(name: str, handler: Callable[[List[Any]], List[Any]], **kwargs) -> MicroBatcher:
+    """Get (or create) the process-wide batcher for a stage."""
+    with _batchers_lock:
+        if name not in _batchers:
+            _batchers[name] = MicroBatcher(name, handler, **kwargs)
+        return _batchers[name]
+
+
+def shutdown_batchers(timeout: Optional[float] = None):
+    """Stop every batcher (worker exit). A later get_batcher() starts a fresh one."""
+    with _batchers_lock:
+        batchers = list(_batchers.values())
+        _batchers.clear()
+    for batcher in batchers:
+        batcher.stop(timeout)
+
+
+def wait_all(futures: List[Future], timeout: Optional[float] = None) -> List[Any]:
+    """Collect results in order; failed entries come back as the raised exception."""
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=timeout))
+        except Exception as e:
+            results.append(e)
+    return results
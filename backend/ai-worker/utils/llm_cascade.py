@@ -0,0 +1,183 @@
+"""
+LLM Model Cascade - 8B first, 70B only for uncertain cases
+
+Hunt-time stages (AI cleanup, batch scoring, keyword generation) used to send
+every request to llama-3.3-70b-versatile. Most decisions are obvious, so each
+stage now runs llama-3.1-8b-instant first and escalates only:
+- Per-item stages: the items whose cheap result is uncertain (low confidence,
+  or a score within CASCADE_SCORE_MARGIN of CASCADE_SCORE_THRESHOLD)
+- Whole-response stages: responses that fail validation on the cheap model
+
+Escalation rates are logged per call and accumulated per stage
+(get_cascade_stats) so the thresholds can be tuned from worker logs.
+
+Env:
+- LLM_CASCADE_ENABLED: "false" sends everything to the strong model
+- CASCADE_CHEAP_MODEL / CASCADE_STRONG_MODEL
+- CASCADE_CONFIDENCE_THRESHOLD: 0.7
+- CASCADE_SCORE_THRESHOLD / CASCADE_SCORE_MARGIN: 70 / 8
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+
+from langchain_groq import ChatGroq
+from pydantic import BaseModel
+
+from utils.llm_client import get_chat_model, Priority
+from utils.structured_llm import invoke_structured, Check
+
+T = TypeVar("T", bound=BaseModel)
+
+CASCADE_ENABLED = os.getenv("LLM_CASCADE_ENABLED", "true").lower() == "true"
+CHEAP_MODEL = os.getenv("CASCADE_CHEAP_MODEL", "llama-3.1-8b-instant")
+STRONG_MODEL = os.getenv("CASCADE_STRONG_MODEL", "llama-3.3-70b-versatile")
+CONFIDENCE_THRESHOLD = float(os.getenv("CASCADE_CONFIDENCE_THRESHOLD", "0.7"))
+SCORE_THRESHOLD = int(os.getenv("CASCADE_SCORE_THRESHOLD", "70"))
+SCORE_MARGIN = int(os.getenv("CASCADE_SCORE_MARGIN", "8"))
+
+
+# ============================================================
+# MODELS
+# ============================================================
+
+_models: Dict[tuple, ChatGroq] = {}
+_models_lock = threading.Lock()
+
+
+def get_model(name: str, temperature: float = 0.1) -> ChatGroq:
+    """Shared ChatGroq instance per (model, temperature)."""
+    key = (name, temperature)
+    with _models_lock:
+        if key not in _models:
+            _models[key] = get_chat_model(name, temperature=temperature, priority=Priority.HUNT)
+        return _models[key]
+
+
+# ============================================================
+# ESCALATION STATS
+# ============================================================
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(stage: str, items: int, escalated: int, cheap_failed: bool = False):
+    with _stats_lock:
+        s = _stats.setdefault(stage, {"calls": 0, "items": 0, "escalated": 0, "cheap_failures": 0})
+        s["calls"] += 1
+        s["items"] += items
+        s["escalated"] += escalated
+        s["cheap_failures"] += int(cheap_failed)
+        total_rate = s["escalated"] / s["items"] * 100 if s["items"] else 0
+    rate = escalated / items * 100 if items else 0
+    print(
+        f"   [cascade] stage={stage} escalated={escalated}/{items} ({rate:.0f}%)"
+        f"{' cheap_failed' if cheap_failed else ''} | cumulative {total_rate:.1f}%"
+    )
+
+
+def get_cascade_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-stage counters with escalation rate, for logs and /metrics."""
+    with _stats_lock:
+        return {
+            stage: {**s, "escalation_rate": (s["escalated"] / s["items"]) if s["items"] else 0.0}
+            for stage, s in _stats.items()
+        }
+
+
+# ============================================================
+# UNCERTAINTY SIGNALS
+# ============================================================
+
+def low_confidence(confidence: Optional[float]) -> bool:
+    """Missing confidence counts as uncertain."""
+    return confidence is None or confidence < CONFIDENCE_THRESHOLD
+
+
+def near_threshold(score: Optional[int]) -> bool:
+    """Scores close to the 'good match' boundary are worth a second opinion."""
+    return score is None or abs(score - SCORE_THRESHOLD) <= SCORE_MARGIN
+
+
+# ============================================================
+# EXECUTORS
+# ============================================================
+
+def cascade_items(
+    stage: str,
+    items: List[Any],
+    run: Callable[[ChatGroq, List[Any]], List[Any]],
+    is_uncertain: Callable[[Any], bool]
+) -> List[Any]:
+    """
+    Run a per-item stage on the cheap model, re-running only uncertain items on the strong one.
+
+    Args:
+        stage: Name used in logs/stats
+        items: Inputs (e.g. a batch of jobs)
+        run: run(llm, items) -> one result per item, in order
+        is_uncertain: True if a cheap result should be escalated
+
+    Returns:
+        One result per item (strong-model result where escalated)
+    """
+    if not items:
+        return []
+    strong = get_model(STRONG_MODEL)
+    if not CASCADE_ENABLED:
+        return run(strong, items)
+
+    try:
+        results = list(run(get_model(CHEAP_MODEL), items))
+    except Exception as e:
+        print(f"   [cascade] stage={stage} cheap model failed ({e}), escalating all")
+        _record(stage, len(items), len(items), cheap_failed=True)
+        return run(strong, items)
+
+    uncertain = [i for i, result in enumerate(results) if is_uncertain(result)]
+    if uncertain:
+        strong_results = run(strong, [items[i] for i in uncertain])
+        for i, result in zip(uncertain, strong_results):
+            results[i] = result
+
+    _record(stage, len(items), len(uncertain))
+    return results
+
+
+def cascade_structured(
+    stage: str,
+    prompt: str,
+    model: Type[T],
+    check: Optional[Check] = None
+) -> T:
+    """
+    invoke_structured on the cheap model; escalate to the strong model if the
+    response is still invalid after one field-level repair.
+    """
+    if CASCADE_ENABLED:
+        try:
+            result = invoke_structured(get_model(CHEAP_MODEL), prompt, model, check=check, task_name=f"{stage} (8B)")
+            _record(stage, 1, 0)
+            return result
+        except Exception as e:
+            print(f"   [cascade] stage={stage} cheap model invalid ({e}), escalating")
+            _record(stage, 1, 1, cheap_failed=True)
+    return invoke_structured(get_model(STRONG_MODEL), prompt, model, check=check, task_name=stage)
+
+
+def cascade_invoke(stage: str, prompt: str, parse: Callable[[str], Any]) -> Any:
+    """
+    Free-form variant: parse(content) must return the value or raise; a raise
+    on the cheap model escalates to the strong model.
+    """
+    if CASCADE_ENABLED:
+        try:
+            value = parse(get_model(CHEAP_MODEL).invoke(prompt).content)
+            _record(stage, 1, 0)
+            return value
+        except Exception as e:
+            print(f"   [cascade] stage={stage} cheap model output rejected ({e}), escalating")
+            _record(stage, 1, 1, cheap_failed=True)
+    return parse(get_model(STRONG_MODEL).invoke(prompt).content)
@@ -0,0 +1,590 @@
+"""
+Managed Groq Client - global priority scheduler for every LLM call
+
+The mentor, JD matcher, resume extraction and hunt nodes used to call Groq
+independently, and the only 429 handling was the mentor's "high traffic"
+message. All ChatGroq instances are now created through get_chat_model(),
+which returns a ManagedChatGroq whose calls pass through one scheduler:
+
+Priority classes (lower runs first):
+    MENTOR (0)  interactive chat tokens
+    JD     (1)  JD analyses (user is waiting on a progress screen)
+    RESUME (2)  resume extraction
+    HUNT   (3)  background job hunts
+
+Admission control, per model:
+- Budget: remaining requests/tokens are read from Groq's x-ratelimit-* response
+  headers (via an httpx response hook) and decremented locally between
+  responses. Lower priorities must leave a reserve of the limit untouched, so
+  a hunt spike cannot drain the budget interactive calls need.
+- Concurrency: at most LLM_MAX_CONCURRENCY calls in flight; hunts may only
+  use LLM_MAX_CONCURRENCY - LLM_INTERACTIVE_SLOTS of them.
+- Ordering: queued calls for a model are admitted by (priority, arrival), so
+  waiting hunt calls are overtaken by any newer mentor/JD call.
+- 429s: retry-after blocks the model for everyone; the call is retried
+  (more patiently for background work).
+- Non-streaming calls are also wrapped by utils/llm_resilience.py (circuit
+  breaker, fallback model, p95 hedging, jittered backoff).
+
+In-flight HTTP requests are never cancelled; "preemption" means queued
+lower-priority work yields to higher-priority arrivals.
+"""
+
+import os
+import re
+import json
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, AsyncIterator, List, Optional
+
+import httpx
+from langchain_groq import ChatGroq
+
+from utils.llm_resilience import (
+    CircuitOpenError, FALLBACK_MODELS, is_retryable, backoff_delay,
+    get_breaker, get_latency, count, hedged_call
+)
+from utils.usage_tracker import record_llm
+from utils.tracing import span
+
+
+class Priority:
+    MENTOR = 0
+    JD = 1
+    RESUME = 2
+    HUNT = 3
+
+    NAMES = {0: "mentor", 1: "jd", 2: "resume", 3: "hunt"}
+
+
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+INTERACTIVE_SLOTS = int(os.getenv("LLM_INTERACTIVE_SLOTS", "2"))
+ACQUIRE_TIMEOUT = float(os.getenv("LLM_ACQUIRE_TIMEOUT", "120"))
+
+# Fraction of each rate limit a priority class must leave untouched
+RESERVE_FRACTION = {Priority.MENTOR: 0.0, Priority.JD: 0.10, Priority.RESUME: 0.15, Priority.HUNT: 0.30}
+
+# Retries of 429/5xx/timeouts per priority (interactive calls fail fast, background calls wait)
+MAX_RETRIES = {Priority.MENTOR: 1, Priority.JD: 2, Priority.RESUME: 3, Priority.HUNT: 4}
+MAX_RETRY_WAIT = {Priority.MENTOR: 5.0, Priority.JD: 20.0, Priority.RESUME: 60.0, Priority.HUNT: 60.0}
+
+# Expected completion size added to prompt tokens when reserving budget
+DEFAULT_COMPLETION_TOKENS = 800
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """Override the priority of every managed LLM call made inside this block."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+# ============================================================
+# RATE-LIMIT BUDGET
+# ============================================================
+
+_DURATION_RE = re.compile(r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m(?!s))?(?:(\d+(?:\.\d+)?)s)?(?:(\d+(?:\.\d+)?)ms)?")
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse Groq reset durations ("2m59.56s", "7.66s", "120ms") into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    match = _DURATION_RE.fullmatch(value.strip())
+    if not match or not any(match.groups()):
+        return None
+    h, m, s, ms = (float(g) if g else 0.0 for g in match.groups())
+    return h * 3600 + m * 60 + s + ms / 1000
+
+
+class ModelBudget:
+    """Last known request/token budget for one model."""
+
+    def __init__(self):
+        self.limit_requests: Optional[int] = None
+        self.limit_tokens: Optional[int] = None
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+        self.blocked_until = 0.0
+
+    def update_from_headers(self, headers: httpx.Headers):
+        now = time.monotonic()
+
+        def as_int(name):
+            try:
+                return int(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        self.limit_requests = as_int("x-ratelimit-limit-requests") or self.limit_requests
+        self.limit_tokens = as_int("x-ratelimit-limit-tokens") or self.limit_tokens
+        remaining_requests = as_int("x-ratelimit-remaining-requests")
+        remaining_tokens = as_int("x-ratelimit-remaining-tokens")
+        if remaining_requests is not None:
+            self.remaining_requests = remaining_requests
+            self.requests_reset_at = now + (parse_reset(headers.get("x-ratelimit-reset-requests")) or 0)
+        if remaining_tokens is not None:
+            self.remaining_tokens = remaining_tokens
+            self.tokens_reset_at = now + (parse_reset(headers.get("x-ratelimit-reset-tokens")) or 0)
+
+    def _refresh(self, now: float):
+        if self.remaining_tokens is not None and now >= self.tokens_reset_at and self.limit_tokens:
+            self.remaining_tokens = self.limit_tokens
+        if self.remaining_requests is not None and now >= self.requests_reset_at and self.limit_requests:
+            self.remaining_requests = self.limit_requests
+
+    def has_headroom(self, priority: int, est_tokens: int) -> bool:
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return False
+        self._refresh(now)
+        reserve = RESERVE_FRACTION.get(priority, 0.0)
+        if self.remaining_tokens is not None and self.limit_tokens:
+            if self.remaining_tokens - est_tokens < reserve * self.limit_tokens and not (
+                priority == Priority.MENTOR and self.remaining_tokens > 0
+            ):
+                return False
+        if self.remaining_requests is not None and self.limit_requests:
+            if self.remaining_requests - 1 < reserve * self.limit_requests and not (
+                priority == Priority.MENTOR and self.remaining_requests > 0
+            ):
+                return False
+        return True
+
+    def consume(self, est_tokens: int):
+        if self.remaining_tokens is not None:
+            self.remaining_tokens -= est_tokens
+        if self.remaining_requests is not None:
+            self.remaining_requests -= 1
+
+    def next_change_in(self) -> float:
+        """Seconds until blocking/budget could change (bounded for re-checks)."""
+        now = time.monotonic()
+        candidates = [t - now for t in (self.blocked_until, self.tokens_reset_at, self.requests_reset_at) if t > now]
+        return min(candidates + [0.5])
+
+
+# ============================================================
+# SCHEDULER
+# ============================================================
+
+class LLMScheduler:
+    """Admits LLM calls by priority, concurrency slots and rate-limit budget."""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, interactive_slots: int = INTERACTIVE_SLOTS):
+        self.max_concurrency = max_concurrency
+        self.interactive_slots = interactive_slots
+        self._cond = threading.Condition()
+        self._budgets: Dict[str, ModelBudget] = {}
+        self._waiting: Dict[str, List[tuple]] = {}
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._stats = {
+            name: {"calls": 0, "queued": 0, "wait_seconds": 0.0, "rate_limited": 0}
+            for name in Priority.NAMES.values()
+        }
+
+    def budget(self, model: str) -> ModelBudget:
+        if model not in self._budgets:
+            self._budgets[model] = ModelBudget()
+        return self._budgets[model]
+
+    def _slot_limit(self, priority: int) -> int:
+        if priority == Priority.HUNT:
+            return max(1, self.max_concurrency - self.interactive_slots)
+        return self.max_concurrency
+
+    def acquire(self, model: str, priority: int, est_tokens: int) -> float:
+        """Block until the call may run. Returns seconds spent waiting."""
+        start = time.monotonic()
+        ticket = (priority, next(self._seq))
+        name = Priority.NAMES.get(priority, "hunt")
+        with self._cond:
+            queue = self._waiting.setdefault(model, [])
+            heapq.heappush(queue, ticket)
+            budget = self.budget(model)
+            queued = False
+            while True:
+                if (
+                    queue[0] == ticket
+                    and self._in_flight < self._slot_limit(priority)
+                    and budget.has_headroom(priority, est_tokens)
+                ):
+                    break
+                if time.monotonic() - start > ACQUIRE_TIMEOUT:
+                    print(f"   [llm] ⚠️ {name} call waited {ACQUIRE_TIMEOUT:.0f}s for {model}, proceeding anyway")
+                    break
+                queued = True
+                self._cond.wait(timeout=budget.next_change_in())
+
+            queue.remove(ticket)
+            heapq.heapify(queue)
+            budget.consume(est_tokens)
+            self._in_flight += 1
+            waited = time.monotonic() - start
+            self._stats[name]["calls"] += 1
+            self._stats[name]["wait_seconds"] += waited
+            if queued:
+                self._stats[name]["queued"] += 1
+            self._cond.notify_all()
+        if waited > 1:
+            print(f"   [llm] {name} call to {model} queued {waited:.1f}s")
+        return waited
+
+    def try_acquire(self, model: str, priority: int, est_tokens: int) -> bool:
+        """Admit a call only if it could run right now without queueing (used for hedges)."""
+        with self._cond:
+            budget = self.budget(model)
+            if (
+                self._waiting.get(model)
+                or self._in_flight >= self._slot_limit(priority)
+                or not budget.has_headroom(priority, est_tokens)
+            ):
+                return False
+            budget.consume(est_tokens)
+            self._in_flight += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def record_headers(self, model: str, headers: httpx.Headers, status_code: int):
+        with self._cond:
+            budget = self.budget(model)
+            budget.update_from_headers(headers)
+            if status_code == 429:
+                retry_after = parse_reset(headers.get("retry-after")) or 1.0
+                budget.blocked_until = max(budget.blocked_until, time.monotonic() + retry_after)
+                print(f"   [llm] 429 from Groq for {model}, blocking for {retry_after:.1f}s")
+            self._cond.notify_all()
+
+    def record_rate_limited(self, priority: int):
+        with self._cond:
+            self._stats[Priority.NAMES.get(priority, "hunt")]["rate_limited"] += 1
+
+    def retry_delay(self, model: str) -> float:
+        with self._cond:
+            return max(0.5, self.budget(model).blocked_until - time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-priority counters and per-model budgets (for logs and /metrics)."""
+        with self._cond:
+            return {
+                "in_flight": self._in_flight,
+                "priorities": {k: dict(v) for k, v in self._stats.items()},
+                "models": {
+                    model: {
+                        "remaining_requests": b.remaining_requests,
+                        "remaining_tokens": b.remaining_tokens,
+                        "limit_requests": b.limit_requests,
+                        "limit_tokens": b.limit_tokens,
+                        "queued": len(self._waiting.get(model, [])),
+                    }
+                    for model, b in self._budgets.items()
+                },
+            }
+
+
+_scheduler = LLMScheduler()
+
+
+def get_scheduler() -> LLMScheduler:
+    return _scheduler
+
+
+# ============================================================
+# HTTP HOOKS (rate-limit headers)
+# ============================================================
+
+def _model_from_request(request: httpx.Request) -> Optional[str]:
+    try:
+        return json.loads(request.content or b"{}").get("model")
+    except (ValueError, httpx.RequestNotRead):
+        return None
+
+
+def _on_response(response: httpx.Response):
+    model = _model_from_request(response.request)
+    if model:
+        _scheduler.record_headers(model, response.headers, response.status_code)
+
+
+async def _on_response_async(response: httpx.Response):
+    _on_response(response)
+
+
+_http_client: Optional[httpx.Client] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _http_clients():
+    global _http_client, _http_async_client
+    if _http_client is None:
+        _http_client = httpx.Client(timeout=60, event_hooks={"response": [_on_response]})
+        _http_async_client = httpx.AsyncClient(timeout=60, event_hooks={"response": [_on_response_async]})
+    return _http_client, _http_async_client
+
+
+# ============================================================
+# MANAGED CHAT MODEL
+# ============================================================
+
+def _is_rate_limit(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429 or "429" in str(error) or "rate limit" in str(error).lower()
+
+
+def _token_usage(result) -> tuple:
+    """(prompt_tokens, completion_tokens) from a ChatResult's llm_output."""
+    usage = (getattr(result, "llm_output", None) or {}).get("token_usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def _add_chunk_usage(usage: list, chunk):
+    # Groq reports usage on the final stream chunk
+    metadata = getattr(getattr(chunk, "message", None), "usage_metadata", None) or {}
+    usage[0] += metadata.get("input_tokens", 0)
+    usage[1] += metadata.get("output_tokens", 0)
+
+
+def _estimate_tokens(messages: List[Any], kwargs: Dict[str, Any]) -> int:
+    chars = sum(len(str(getattr(m, "content", m))) for m in messages)
+    return chars // 4 + int(kwargs.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+
+async def _acquire_async(model: str, priority: int, est_tokens: int) -> float:
+    """
+    _scheduler.acquire() from a worker thread, for async callers.
+
+    A cancelled await (hedge loser, timeout) can't stop the thread, which may
+    already hold a slot or get one later; that slot is released as soon as
+    the thread returns instead of being leaked.
+    """
+    grant = asyncio.ensure_future(asyncio.to_thread(_scheduler.acquire, model, priority, est_tokens))
+    try:
+        return await asyncio.shield(grant)
+    except asyncio.CancelledError:
+        grant.add_done_callback(lambda f: f.cancelled() or f.exception() is not None or _scheduler.release())
+        raise
+
+
+class ManagedChatGroq(ChatGroq):
+    """ChatGroq whose calls are admitted by the global LLMScheduler."""
+
+    priority: int = Priority.HUNT
+
+    def _effective_priority(self) -> int:
+        override = _current_priority.get()
+        return self.priority if override is None else override
+
+    def _fallback(self) -> Optional["ManagedChatGroq"]:
+        fallback = FALLBACK_MODELS.get(self.model_name)
+        return self.model_copy(update={"model_name": fallback}) if fallback else None
+
+    def _admitted_generate(self, messages, stop, run_manager, priority, est, **kwargs):
+        queued = _scheduler.acquire(self.model_name, priority, est)
+        return self._timed_generate(messages, stop, run_manager, queued=queued, **kwargs)
+
+    def _timed_generate(self, messages, stop, run_manager, queued: float = 0.0, hedge: bool = False, **kwargs):
+        # Caller holds a scheduler slot; released here
+        with span(f"llm {self.model_name}", "llm", model=self.model_name, queued_ms=round(queued * 1000), hedge=hedge) as s:
+            start = time.monotonic()
+            try:
+                result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            finally:
+                _scheduler.release()
+            latency = time.monotonic() - start
+            prompt_tokens, completion_tokens = _token_usage(result)
+            if s is not None:
+                s.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        get_latency(self.model_name).record(latency)
+        record_llm(self.model_name, prompt_tokens, completion_tokens, latency)
+        return result
+
+    def _retry_delay(self, error: Exception, priority: int, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None if the error should propagate."""
+        if not is_retryable(error) or attempt == MAX_RETRIES[priority]:
+            return None
+        if _is_rate_limit(error):
+            _scheduler.record_rate_limited(priority)
+        delay = backoff_delay(attempt, floor=_scheduler.retry_delay(self.model_name) if _is_rate_limit(error) else 0)
+        if delay > MAX_RETRY_WAIT[priority]:
+            return None
+        count(self.model_name, "retries")
+        return delay
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.streaming:
+            # ChatGroq routes streaming invokes through _stream, which is admitted there
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        breaker = get_breaker(self.model_name)
+        if not breaker.allow():
+            fallback = self._fallback()
+            if fallback is None:
+                raise CircuitOpenError(f"circuit open for {self.model_name}")
+            count(self.model_name, "fallbacks")
+            print(f"   [resilience] {self.model_name} circuit open, using {fallback.model_name}")
+            return fallback._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        priority = self._effective_priority()
+        est = _estimate_tokens(messages, kwargs)
+
+        def try_hedge():
+            if not _scheduler.try_acquire(self.model_name, priority, est):
+                return None
+            return lambda: self._timed_generate(messages, stop, run_manager, hedge=True, **kwargs)
+
+        try:
+            for attempt in range(MAX_RETRIES[priority] + 1):
+                try:
+                    result = hedged_call(
+                        self.model_name,
+                        lambda: self._admitted_generate(messages, stop, run_manager, priority, est, **kwargs),
+                        try_hedge
+                    )
+                    breaker.record_success()
+                    return result
+                except Exception as e:
+                    # A non-retryable error (400, validation) still means the model answered
+                    if is_retryable(e):
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    delay = self._retry_delay(e, priority, attempt)
+                    if delay is None:
+                        raise
+                time.sleep(delay)
+        finally:
+            # A half-open probe must never stay claimed (e.g. interrupted mid-call)
+            breaker.release_probe()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        # Async calls get breaker/fallback/backoff; hedging is sync-only
+        if self.streaming:
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        breaker = get_breaker(self.model_name)
+        if not breaker.allow():
+            fallback = self._fallback()
+            if fallback is None:
+                raise CircuitOpenError(f"circuit open for {self.model_name}")
+            count(self.model_name, "fallbacks")
+            return await fallback._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        priority = self._effective_priority()
+        est = _estimate_tokens(messages, kwargs)
+        try:
+            for attempt in range(MAX_RETRIES[priority] + 1):
+                queued = await _acquire_async(self.model_name, priority, est)
+                start = time.monotonic()
+                try:
+                    with span(f"llm {self.model_name}", "llm", model=self.model_name, queued_ms=round(queued * 1000)) as s:
+                        result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+                        prompt_tokens, completion_tokens = _token_usage(result)
+                        if s is not None:
+                            s.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+                    latency = time.monotonic() - start
+                    get_latency(self.model_name).record(latency)
+                    record_llm(self.model_name, prompt_tokens, completion_tokens, latency)
+                    breaker.record_success()
+                    return result
+                except Exception as e:
+                    if is_retryable(e):
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    delay = self._retry_delay(e, priority, attempt)
+                    if delay is None:
+                        raise
+                finally:
+                    _scheduler.release()
+                await asyncio.sleep(delay)
+        finally:
+            # Also covers cancellation (CancelledError is not an Exception)
+            breaker.release_probe()
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator:
+        # Streams hold their slot until the last chunk; no retry once tokens were emitted
+        queued = _scheduler.acquire(self.model_name, self._effective_priority(), _estimate_tokens(messages, kwargs))
+        start = time.monotonic()
+        usage = [0, 0]
+        with span(f"llm {self.model_name}", "llm", model=self.model_name, stream=True, queued_ms=round(queued * 1000)) as s:
+            try:
+                for chunk in super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    _add_chunk_usage(usage, chunk)
+                    yield chunk
+            finally:
+                _scheduler.release()
+                record_llm(self.model_name, usage[0], usage[1], time.monotonic() - start)
+                if s is not None:
+                    s.set(prompt_tokens=usage[0], completion_tokens=usage[1])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator:
+        queued = await _acquire_async(self.model_name, self._effective_priority(), _estimate_tokens(messages, kwargs))
+        start = time.monotonic()
+        usage = [0, 0]
+        with span(f"llm {self.model_name}", "llm", model=self.model_name, stream=True, queued_ms=round(queued * 1000)) as s:
+            try:
+                async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    _add_chunk_usage(usage, chunk)
+                    yield chunk
+            finally:
+                _scheduler.release()
+                record_llm(self.model_name, usage[0], usage[1], time.monotonic() - start)
+                if s is not None:
+                    s.set(prompt_tokens=usage[0], completion_tokens=usage[1])
+
+
+# Offline runs (testing/benchmark_hunt.py) route get_chat_model() to a fake
+_model_factory: Optional[Callable[..., Any]] = None
+
+
+def set_model_factory(factory: Optional[Callable[..., Any]]):
+    """Use factory(model, temperature=, priority=, **kwargs) instead of Groq; None restores Groq."""
+    global _model_factory
+    _model_factory = factory
+
+
+def get_chat_model(
+    model: str = "llama-3.3-70b-versatile",
+    temperature: float = 0.1,
+    priority: int = Priority.HUNT,
+    **kwargs
+) -> ManagedChatGroq:
+    """
+    Create a scheduler-managed Groq chat model.
+
+    Args:
+        model: Groq model name
+        temperature: Sampling temperature
+        priority: Default Priority class (overridable with llm_priority())
+        **kwargs: Passed to ChatGroq (streaming, max_tokens, ...)
+    """
+    if _model_factory is not None:
+        return _model_factory(model, temperature=temperature, priority=priority, **kwargs)
+    http_client, http_async_client = _http_clients()
+    return ManagedChatGroq(
+        model=model,
+        temperature=temperature,
+        api_key=kwargs.pop("api_key", None) or os.getenv("GROQ_API_KEY"),
+        priority=priority,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        **kwargs
+    )
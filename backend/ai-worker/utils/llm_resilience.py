@@ -0,0 +1,256 @@
+"""
+LLM Resilience - circuit breakers, hedged requests, fallback model, backoff
+
+A slow or failing Groq model used to stall a node until its HTTP timeout, after
+which the node fell back to defaults. ManagedChatGroq (utils/llm_client.py)
+now wraps every non-streaming call with:
+
+- Circuit breaker per model: LLM_BREAKER_FAILURES consecutive retryable
+  failures (429, 5xx, timeouts) open it for LLM_BREAKER_COOLDOWN seconds, then
+  a single half-open probe decides whether it closes again
+- Fallback: while a model's breaker is open, calls go to FALLBACK_MODELS[model]
+  (70B -> 8B) instead of waiting on it
+- Hedging: once a model has LLM_HEDGE_MIN_SAMPLES latencies, a call still
+  running after the model's p95 fires a second identical request (only if the
+  scheduler can admit it immediately) and the first response wins
+- Jittered exponential backoff between retries, never shorter than Groq's
+  retry-after
+
+get_resilience_stats() exposes latency percentiles, breaker state, and hedge
+launches/wins with the seconds saved on the tail.
+"""
+
+import os
+import time
+import random
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Optional
+
+BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+HEDGE_WORKERS = int(os.getenv("LLM_HEDGE_WORKERS", "16"))
+
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+BACKOFF_CAP = float(os.getenv("LLM_BACKOFF_CAP", "20"))
+
+LATENCY_WINDOW = 200
+
+FALLBACK_MODELS = {
+    "llama-3.3-70b-versatile": os.getenv("LLM_FALLBACK_MODEL", "llama-3.1-8b-instant"),
+}
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a model's breaker is open and no fallback is available."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """429s, 5xx, timeouts and connection errors are worth retrying; 4xx are not."""
+    if getattr(error, "status_code", None) in _RETRYABLE_STATUS:
+        return True
+    if type(error).__name__ in ("APITimeoutError", "APIConnectionError", "TimeoutException", "ConnectError"):
+        return True
+    text = str(error).lower()
+    return "429" in text or "rate limit" in text or "timed out" in text
+
+
+def backoff_delay(attempt: int, floor: float = 0.0) -> float:
+    """Full-jitter exponential backoff, at least `floor` (e.g. retry-after)."""
+    return max(floor, random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+
+
+# ============================================================
+# CIRCUIT BREAKER
+# ============================================================
+
+class CircuitBreaker:
+    """closed -> open after N consecutive failures -> half_open probe -> closed/open."""
+
+    def __init__(self, model: str, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.model = model
+        self.threshold = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                print(f"   [resilience] breaker for {self.model} closed")
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.opens += 1
+                    print(f"   [resilience] breaker for {self.model} OPEN after {self.failures} failures")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+    def release_probe(self):
+        """Let another call probe if this one ended without recording an outcome."""
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = False
+
+
+# ============================================================
+# LATENCY / STATS
+# ============================================================
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one model."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_latencies: Dict[str, LatencyTracker] = {}
+_counters: Dict[str, Dict[str, float]] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(model: str) -> CircuitBreaker:
+    with _registry_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker(model)
+        return _breakers[model]
+
+
+def get_latency(model: str) -> LatencyTracker:
+    with _registry_lock:
+        if model not in _latencies:
+            _latencies[model] = LatencyTracker()
+        return _latencies[model]
+
+
+def count(model: str, name: str, value: float = 1):
+    with _registry_lock:
+        counters = _counters.setdefault(
+            model, {"hedges": 0, "hedge_wins": 0, "hedge_seconds_saved": 0.0, "fallbacks": 0, "retries": 0}
+        )
+        counters[name] += value
+
+
+def get_resilience_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-model latency percentiles, breaker state and hedge/fallback counters."""
+    with _registry_lock:
+        models = set(_breakers) | set(_latencies) | set(_counters)
+    stats = {}
+    for model in models:
+        latency = get_latency(model)
+        breaker = get_breaker(model)
+        stats[model] = {
+            "p50": latency.percentile(0.50),
+            "p95": latency.percentile(0.95),
+            "p99": latency.percentile(0.99),
+            "samples": latency.count(),
+            "breaker": breaker.state,
+            "breaker_opens": breaker.opens,
+            **_counters.get(model, {}),
+        }
+    return stats
+
+
+# ============================================================
+# HEDGED CALL
+# ============================================================
+
+_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+
+
+def _submit(fn: Callable[[], Any]):
+    # Carry contextvars (priority, usage scope, trace span) into the pool thread
+    return _executor.submit(contextvars.copy_context().run, fn)
+
+
+def hedged_call(model: str, call: Callable[[], Any], try_hedge: Callable[[], Optional[Callable[[], Any]]]) -> Any:
+    """
+    Run call(); if it outlives the model's p95, start a hedge and return whichever finishes first.
+
+    Args:
+        model: Model name (selects the latency window)
+        call: The primary request
+        try_hedge: Returns a hedge callable if the scheduler admits one right now, else None
+    """
+    latency = get_latency(model)
+    p95 = latency.percentile(0.95)
+    if not HEDGE_ENABLED or latency.count() < HEDGE_MIN_SAMPLES or p95 is None:
+        return call()
+
+    primary = _submit(call)
+    done, _ = wait([primary], timeout=max(HEDGE_MIN_DELAY, p95))
+    if done:
+        return primary.result()
+
+    hedge_fn = try_hedge()
+    if hedge_fn is None:
+        return primary.result()
+
+    count(model, "hedges")
+    hedge_started = time.monotonic()
+    hedge = _submit(hedge_fn)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None:
+                error = future.exception()
+                continue
+            if future is hedge:
+                count(model, "hedge_wins")
+                hedge_done = time.monotonic()
+                # Saved time is only known once the abandoned primary finishes
+                primary.add_done_callback(
+                    lambda _f: count(model, "hedge_seconds_saved", time.monotonic() - hedge_done)
+                )
+                print(f"   [resilience] hedge won for {model} after {hedge_done - hedge_started:.1f}s")
+            return future.result()
+    raise error
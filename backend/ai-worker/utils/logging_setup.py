@@ -0,0 +1,218 @@
+"""
+Logging Setup - structured, leveled, non-blocking logging for the worker
+
+Hot paths (AdzunaClient.search_jobs, relevance_ranker_node, async_adzuna)
+printed several lines per page/job straight to stdout, which blocks under load
+and can't be filtered. setup_logging() configures one pipeline instead:
+
+- Records go through a QueueHandler; a QueueListener thread does the actual
+  stdout I/O, so callers never block on it
+- LOG_FORMAT=json (default) emits one JSON object per line, including any
+  `extra={...}` fields; LOG_FORMAT=text keeps a human-readable line
+- LOG_LEVEL sets the default level, LOG_LEVELS overrides per module:
+  LOG_LEVELS="tier1_adzuna=DEBUG,agent.job_hunter_graph=WARNING"
+- Per-job debug lines pass `extra={"sample": True}` and only LOG_SAMPLE_RATE
+  of them are kept
+
+User-visible hunt logs (hunt_orchestrator.LogPublisher) are logged to the
+"hunt.events" logger. Its RabbitMQ sink publishes them to
+job_hunt_logs_queue; they also propagate to the operator sink above.
+LogPublisher attaches the sink itself (attach_hunt_events_sink), so the
+stream doesn't depend on an entry point having called setup_logging(); until
+it has, the records are also printed as "[LEVEL] message".
+
+Entry points (worker.py, standalone scripts) call setup_logging() once at
+startup; library code never does.
+"""
+
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+import logging.handlers
+from datetime import datetime, timezone
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.05"))
+
+HUNT_EVENTS_LOGGER = "hunt.events"
+HUNT_LOG_QUEUE = "job_hunt_logs_queue"
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+# ============================================================
+# FORMATTERS / FILTERS
+# ============================================================
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, extra fields, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SampleFilter(logging.Filter):
+    """Keeps only `rate` of the records logged with extra={"sample": True}."""
+
+    def __init__(self, rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "sample", False):
+            return random.random() < self.rate
+        return True
+
+
+_plain = logging.Formatter()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Resolves msg % args and the traceback on the caller, keeping them separate."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = _plain.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# ============================================================
+# RABBITMQ SINK
+# ============================================================
+
+class RabbitMQLogHandler(logging.Handler):
+    """
+    Publishes hunt.events records to job_hunt_logs_queue for real-time streaming.
+
+    The channel travels on the record (extra={"_channel": ch}). pika channels
+    are not thread-safe, so this handler runs on the emitting thread rather
+    than behind the QueueListener; basic_publish only buffers, so it's cheap.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        channel = getattr(record, "_channel", None)
+        if channel is None:
+            return
+        import pika
+
+        entry = {
+            "sessionId": getattr(record, "session_id", None),
+            "userId": getattr(record, "user_id", None),
+            "level": getattr(record, "user_level", record.levelname.lower()),
+            "message": record.getMessage(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+        }
+        try:
+            channel.basic_publish(
+                exchange='',
+                routing_key=HUNT_LOG_QUEUE,
+                body=json.dumps(entry),
+                properties=pika.BasicProperties(delivery_mode=2),  # Make message persistent
+            )
+        except Exception:
+            self.handleError(record)
+
+
+# ============================================================
+# SETUP
+# ============================================================
+
+class _FallbackHandler(logging.StreamHandler):
+    """stdout for hunt.events while setup_logging() hasn't run (nothing else would show them)."""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    def format(self, record: logging.LogRecord) -> str:
+        return f"[{str(getattr(record, 'user_level', record.levelname)).upper()}] {record.getMessage()}"
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.RLock()
+
+
+def attach_hunt_events_sink():
+    """Make sure hunt.events records reach job_hunt_logs_queue (idempotent)."""
+    with _setup_lock:
+        events = logging.getLogger(HUNT_EVENTS_LOGGER)
+        events.setLevel(logging.INFO)
+        if not any(isinstance(h, RabbitMQLogHandler) for h in events.handlers):
+            events.addHandler(RabbitMQLogHandler())
+        if _listener is None and not any(isinstance(h, _FallbackHandler) for h in events.handlers):
+            events.addHandler(_FallbackHandler())
+
+
+def _parse_levels(spec: str):
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            yield name.strip(), level.strip().upper()
+
+
+def setup_logging(level: str = LOG_LEVEL, levels: str = LOG_LEVELS, fmt: str = LOG_FORMAT):
+    """Install the queue-backed root handler and the hunt.events sink (idempotent)."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(
+            JsonFormatter() if fmt == "json"
+            else logging.Formatter("%(asctime)s %(levelname)-7s [%(name)s] %(message)s")
+        )
+
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = _QueueHandler(records)
+        # Sampling runs before enqueueing so dropped records cost nothing downstream
+        queue_handler.addFilter(SampleFilter())
+
+        root = logging.getLogger()
+        root.handlers[:] = [queue_handler]
+        root.setLevel(level)
+        for name, module_level in _parse_levels(levels):
+            logging.getLogger(name).setLevel(module_level)
+
+        _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+        _listener.start()
+        attach_hunt_events_sink()
+        events = logging.getLogger(HUNT_EVENTS_LOGGER)
+        # Records now propagate to the operator sink; drop the stdout fallback
+        events.handlers[:] = [h for h in events.handlers if not isinstance(h, _FallbackHandler)]
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
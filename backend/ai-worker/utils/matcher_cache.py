@@ -0,0 +1,111 @@
+"""
+Matcher Resume Cache - JD-independent analysis memoisation
+
+The JD matcher graph produces some outputs that depend only on the resume:
+- Bullet feedback and the ATS compatibility section (formatting/readability
+  risks), both produced by one FEEDBACK_PROMPT call and stored as two entries
+
+Users typically analyse 10-20 JDs against one resume, so these are cached per
+resume hash (same MD5 as UserConfigCache) and reused until the resume changes.
+PROMPT_VERSION is part of the key so prompt edits invalidate old entries.
+"""
+
+from pymongo import MongoClient
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Any
+
+from utils.metrics import record_cache
+
+PROMPT_VERSION = "v2"
+CACHE_TTL_DAYS = 30
+
+
+class MatcherResumeCache:
+    """MongoDB cache for resume-only matcher outputs"""
+
+    def __init__(self):
+        mongo_uri = os.getenv("MONGODB_URI") or os.getenv("MONGO_URI")
+        if not mongo_uri:
+            raise ValueError("MONGODB_URI environment variable not set")
+
+        self.client = MongoClient(mongo_uri)
+        self.db = self.client["career_os"]
+        self.collection = self.db["matcher_resume_cache"]
+
+        try:
+            self.collection.create_index([
+                ("resume_hash", 1),
+                ("kind", 1),
+                ("prompt_version", 1)
+            ], unique=True)
+        except:
+            pass  # Index might already exist
+
+    def get(self, resume_hash: str, kind: str) -> Optional[Any]:
+        """
+        Get a cached output ("bullet_feedback" or "ats_compatibility").
+
+        Returns None on miss, stale entry (>30 days) or error.
+        """
+        try:
+            doc = self.collection.find_one({
+                "resume_hash": resume_hash,
+                "kind": kind,
+                "prompt_version": PROMPT_VERSION
+            })
+            if not doc:
+                print(f"[MatcherCache] Miss for {kind}, resume_hash={resume_hash[:8]}")
+                record_cache("matcher_resume", False)
+                return None
+
+            created_at = doc.get("created_at")
+            if created_at and datetime.now() - created_at > timedelta(days=CACHE_TTL_DAYS):
+                print(f"[MatcherCache] Stale {kind} entry, invalidating")
+                record_cache("matcher_resume", False)
+                return None
+
+            print(f"[MatcherCache] ✅ HIT for {kind}, resume_hash={resume_hash[:8]}")
+            record_cache("matcher_resume", True)
+            return doc.get("data")
+
+        except Exception as e:
+            print(f"[MatcherCache] Error reading cache: {e}")
+            return None
+
+    def save(self, resume_hash: str, kind: str, data: Any):
+        """Save an output for this resume (upsert)."""
+        try:
+            self.collection.update_one(
+                {
+                    "resume_hash": resume_hash,
+                    "kind": kind,
+                    "prompt_version": PROMPT_VERSION
+                },
+                {"$set": {"data": data, "created_at": datetime.now()}},
+                upsert=True
+            )
+            print(f"[MatcherCache] ✅ Saved {kind} for resume_hash={resume_hash[:8]}")
+        except Exception as e:
+            print(f"[MatcherCache] Error saving cache: {e}")
+            # Don't raise - caching is optional
+
+
+_cache = None
+_cache_disabled = False  # construction failed once; don't retry on every node
+_cache_lock = threading.Lock()
+
+
+def get_matcher_cache() -> Optional[MatcherResumeCache]:
+    """Get the shared cache instance, or None if MongoDB is not configured."""
+    global _cache, _cache_disabled
+    if _cache is None and not _cache_disabled:
+        with _cache_lock:
+            if _cache is None and not _cache_disabled:
+                try:
+                    _cache = MatcherResumeCache()
+                except Exception as e:
+                    print(f"[MatcherCache] Disabled: {e}")
+                    _cache_disabled = True
+    return _cache
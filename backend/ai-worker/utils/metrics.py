@@ -0,0 +1,202 @@
+"""
+Prometheus Metrics - exposed by the worker's FastAPI app at /metrics
+
+Used for autoscaling worker replicas and catching regressions:
+- worker_queue_*: messages, outcome (ack/nack) and in-flight per RabbitMQ queue
+- pipeline_node_seconds: per-node latency for hunts, JD analyses and the mentor
+  (observed by utils/tracing.traced_node)
+- llm_call_seconds / llm_tokens_total: by model (via usage_tracker.record_llm)
+- cache_requests_total: hits/misses per cache (user_config, matcher_resume, jd_parse).
+  Adzuna searches and Gemini embeddings are not cached, so they have no hit
+  ratio; their call volume shows up under external_api_*
+- external_api_*: latency and status per service (via usage_tracker.track_http)
+- external_api_quota_remaining: Groq budgets from rate-limit headers, Adzuna
+  from ADZUNA_DAILY_LIMIT minus this process's calls today
+- mentor_ttft_seconds: time to the first streamed mentor token
+- llm_cascade_escalation_ratio, llm_scheduler_queued: read at scrape time
+
+prometheus_client is optional; without it every helper is a no-op and
+/metrics answers 503.
+"""
+
+import os
+import time
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Tuple
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+    from prometheus_client.core import GaugeMetricFamily
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+ADZUNA_DAILY_LIMIT = int(os.getenv("ADZUNA_DAILY_LIMIT", "250"))
+
+_FAST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+_SLOW_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 90, 120, 180, 300, 600)
+
+if PROMETHEUS_AVAILABLE:
+    QUEUE_MESSAGES = Counter("worker_queue_messages_total", "Messages consumed", ["queue", "outcome"])
+    QUEUE_IN_FLIGHT = Gauge("worker_queue_in_flight", "Messages currently being processed", ["queue"])
+    QUEUE_SECONDS = Histogram("worker_queue_message_seconds", "Message processing time", ["queue"], buckets=_SLOW_BUCKETS)
+    NODE_SECONDS = Histogram("pipeline_node_seconds", "Graph node latency", ["pipeline", "node"], buckets=_FAST_BUCKETS)
+    LLM_SECONDS = Histogram("llm_call_seconds", "LLM call latency", ["model"], buckets=_FAST_BUCKETS)
+    LLM_TOKENS = Counter("llm_tokens_total", "LLM tokens", ["model", "kind"])
+    CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups", ["cache", "result"])
+    EXTERNAL_CALLS = Counter("external_api_calls_total", "External API calls", ["service", "status"])
+    EXTERNAL_SECONDS = Histogram("external_api_seconds", "External API latency", ["service"], buckets=_FAST_BUCKETS)
+    MENTOR_TTFT = Histogram("mentor_ttft_seconds", "Mentor time to first token", buckets=_FAST_BUCKETS)
+
+_daily_calls = {}
+_daily_lock = threading.Lock()
+
+
+def _count_daily(service: str):
+    day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    with _daily_lock:
+        key = (service, day)
+        _daily_calls[key] = _daily_calls.get(key, 0) + 1
+
+
+def _calls_today(service: str) -> int:
+    day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    with _daily_lock:
+        return _daily_calls.get((service, day), 0)
+
+
+# ============================================================
+# RECORDING HELPERS
+# ============================================================
+
+def observe_llm(model: str, seconds: float, prompt_tokens: int, completion_tokens: int):
+    if not PROMETHEUS_AVAILABLE:
+        return
+    LLM_SECONDS.labels(model).observe(seconds)
+    LLM_TOKENS.labels(model, "prompt").inc(prompt_tokens or 0)
+    LLM_TOKENS.labels(model, "completion").inc(completion_tokens or 0)
+
+
+def observe_http(service: str, seconds: float, ok: bool):
+    _count_daily(service)
+    if not PROMETHEUS_AVAILABLE:
+        return
+    EXTERNAL_SECONDS.labels(service).observe(seconds)
+    EXTERNAL_CALLS.labels(service, "ok" if ok else "error").inc()
+
+
+def observe_node(pipeline: str, node: str, seconds: float):
+    if PROMETHEUS_AVAILABLE:
+        NODE_SECONDS.labels(pipeline, node).observe(seconds)
+
+
+def observe_ttft(seconds: float):
+    if PROMETHEUS_AVAILABLE:
+        MENTOR_TTFT.observe(seconds)
+
+
+def record_cache(cache: str, hit: bool):
+    if PROMETHEUS_AVAILABLE:
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+# ============================================================
+# QUEUE CONSUMERS
+# ============================================================
+
+class _OutcomeChannel:
+    """Channel proxy that remembers whether the callback acked or nacked."""
+
+    def __init__(self, channel):
+        self._channel = channel
+        self.outcome = "unacked"
+
+    def basic_ack(self, *args, **kwargs):
+        self.outcome = "ack"
+        return self._channel.basic_ack(*args, **kwargs)
+
+    def basic_nack(self, *args, **kwargs):
+        self.outcome = "nack"
+        return self._channel.basic_nack(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._channel, name)
+
+
+def instrument_consumer(queue: str, callback: Callable) -> Callable:
+    """Wrap a pika on_message_callback with throughput / in-flight / latency metrics."""
+    if not PROMETHEUS_AVAILABLE:
+        return callback
+
+    def wrapper(ch, method, properties, body):
+        channel = _OutcomeChannel(ch)
+        QUEUE_IN_FLIGHT.labels(queue).inc()
+        start = time.monotonic()
+        try:
+            return callback(channel, method, properties, body)
+        except Exception:
+            channel.outcome = "error"
+            raise
+        finally:
+            QUEUE_IN_FLIGHT.labels(queue).dec()
+            QUEUE_SECONDS.labels(queue).observe(time.monotonic() - start)
+            QUEUE_MESSAGES.labels(queue, channel.outcome).inc()
+    return wrapper
+
+
+# ============================================================
+# SCRAPE-TIME GAUGES
+# ============================================================
+
+class _StatsCollector:
+    """Reads scheduler, cascade and quota state when /metrics is scraped."""
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        from utils.llm_client import get_scheduler
+        from utils.llm_cascade import get_cascade_stats
+
+        quota = GaugeMetricFamily(
+            "external_api_quota_remaining", "Remaining external API quota", labels=["service", "kind"]
+        )
+        queued = GaugeMetricFamily("llm_scheduler_queued", "LLM calls waiting for admission", labels=["model"])
+        stats = get_scheduler().stats()
+        for model, budget in stats["models"].items():
+            queued.add_metric([model], budget["queued"])
+            if budget["remaining_requests"] is not None:
+                quota.add_metric([f"groq:{model}", "requests"], budget["remaining_requests"])
+            if budget["remaining_tokens"] is not None:
+                quota.add_metric([f"groq:{model}", "tokens"], budget["remaining_tokens"])
+        quota.add_metric(["adzuna", "requests"], max(0, ADZUNA_DAILY_LIMIT - _calls_today("adzuna")))
+        yield quota
+        yield queued
+
+        escalation = GaugeMetricFamily(
+            "llm_cascade_escalation_ratio", "Share of cascade items escalated to the strong model", labels=["stage"]
+        )
+        for stage, s in get_cascade_stats().items():
+            escalation.add_metric([stage], s["escalation_rate"])
+        yield escalation
+
+        in_flight = GaugeMetricFamily("llm_in_flight", "LLM calls currently running")
+        in_flight.add_metric([], stats["in_flight"])
+        yield in_flight
+
+
+_collector_registered = False
+_collector_lock = threading.Lock()
+
+
+def render() -> Tuple[bytes, str]:
+    """Prometheus exposition payload and content type."""
+    global _collector_registered
+    if not PROMETHEUS_AVAILABLE:
+        return b"prometheus_client not installed\n", "text/plain"
+    with _collector_lock:
+        if not _collector_registered:
+            REGISTRY.register(_StatsCollector())
+            _collector_registered = True
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,291 @@
+"""
+On-demand Profiler - cProfile + tracemalloc per LangGraph node for selected runs
+
+A slow hunt in production could only be guessed at from its trace. Profiling
+is now armed per run, without a redeploy:
+
+- Message flag: {"profile": true} on a job_hunter_queue / jd_analysis_queue message
+- Admin endpoint (worker.py): POST /admin/profile {"count": N} profiles the
+  next N runs, {"target": "<sessionId|runId>"} profiles that run when it arrives.
+  Requires an X-Admin-Token header matching ADMIN_TOKEN; with ADMIN_TOKEN
+  unset the admin endpoints refuse every request
+
+While a run is profiled, every traced_node() gets its own cProfile and a
+tracemalloc snapshot diff. Artifacts go to PROFILE_DIR/<kind>-<id>/
+(node-<name>.prof for pstats/snakeviz, node-<name>-alloc.txt) and a line is
+appended to PROFILE_DIR/index.jsonl. ProfileRun.summary() (top functions,
+top allocation sites, per-node wall time and peak memory) is stored on the
+session / analysis document.
+
+tracemalloc is process-wide, so allocation diffs include any concurrent runs.
+cProfile only sees the thread a node runs on; work a node hands to thread
+pools shows up as waiting time.
+"""
+
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "15"))
+
+# Allocations made by the profiler itself
+_IGNORED_FILES = {tracemalloc.__file__, __file__, pstats.__file__, cProfile.__file__}
+
+
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name))[:80]
+
+
+class ProfileRun:
+    """Per-node profiles and allocation diffs for one hunt / JD analysis."""
+
+    def __init__(self, kind: str, run_id: str):
+        self.kind = kind
+        self.run_id = run_id
+        self.directory = os.path.join(PROFILE_DIR, f"{_safe(kind)}-{_safe(run_id)}")
+        self.started = time.monotonic()
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.stats: Optional[pstats.Stats] = None
+        self.allocations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add_node(self, node: str, seconds: float, profile: Optional[cProfile.Profile],
+                 alloc_diff: List[tracemalloc.StatisticDiff], peak_bytes: int):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            # A node can run more than once per run (retries, loops)
+            runs = sum(1 for n in self.nodes if n == node or n.startswith(f"{node}#"))
+            key = node if runs == 0 else f"{node}#{runs + 1}"
+            self.nodes[key] = {
+                "seconds": round(seconds, 3),
+                "peak_kb": round(peak_bytes / 1024, 1),
+                "profiled": profile is not None,
+            }
+            if profile is not None:
+                profile.dump_stats(os.path.join(self.directory, f"node-{_safe(key)}.prof"))
+                stats = pstats.Stats(profile, stream=io.StringIO())
+                if self.stats is None:
+                    self.stats = stats
+                else:
+                    self.stats.add(stats)
+            for stat in alloc_diff:
+                frame = stat.traceback[0]
+                site = self.allocations.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                site[0] += stat.size_diff
+                site[1] += stat.count_diff
+
+        if alloc_diff:
+            with open(os.path.join(self.directory, f"node-{_safe(key)}-alloc.txt"), "w", encoding="utf-8") as f:
+                for stat in alloc_diff[:50]:
+                    f.write(f"{stat}\n")
+
+    def top_functions(self, limit: int = PROFILE_TOP_N) -> List[Dict[str, Any]]:
+        if self.stats is None:
+            return []
+        rows = []
+        for (filename, lineno, func), (cc, nc, tottime, cumtime, _) in self.stats.stats.items():
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{lineno}({func})",
+                "calls": nc,
+                "tottime": round(tottime, 4),
+                "cumtime": round(cumtime, 4),
+            })
+        rows.sort(key=lambda r: r["tottime"], reverse=True)
+        return rows[:limit]
+
+    def top_allocations(self, limit: int = PROFILE_TOP_N) -> List[Dict[str, Any]]:
+        sites = sorted(self.allocations.items(), key=lambda kv: kv[1][0], reverse=True)
+        return [
+            {"site": site, "size_kb": round(size / 1024, 1), "count": int(count)}
+            for site, (size, count) in sites[:limit] if size > 0
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON/BSON-safe summary for the session / analysis document."""
+        with self._lock:
+            nodes = dict(self.nodes)
+        return {
+            "kind": self.kind,
+            "id": self.run_id,
+            "createdAt": datetime.now().isoformat(),
+            "wallSeconds": round(time.monotonic() - self.started, 3),
+            "artifacts": self.directory,
+            # Node names are used as keys; dots aren't allowed in MongoDB field names
+            "nodes": {name.replace(".", "_"): n for name, n in nodes.items()},
+            "topFunctions": self.top_functions(),
+            "topAllocations": self.top_allocations(),
+        }
+
+
+# ============================================================
+# ARMING
+# ============================================================
+
+class Profiler:
+    """Decides which runs get profiled; shared by queue callbacks and the admin endpoint."""
+
+    def __init__(self):
+        self.remaining = 0
+        self.targets: set = set()
+        self._lock = threading.Lock()
+        self._tracemalloc_users = 0
+
+    def arm(self, count: int = 0, target: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            if count:
+                self.remaining += count
+            if target:
+                self.targets.add(str(target))
+            print(f"[profiler] Armed: next {self.remaining} runs, targets={sorted(self.targets)}")
+            return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        return {"remaining": self.remaining, "targets": sorted(self.targets)}
+
+    def should_profile(self, run_id: Optional[str], flag: bool = False) -> bool:
+        with self._lock:
+            if run_id and str(run_id) in self.targets:
+                self.targets.discard(str(run_id))
+                return True
+            if flag:
+                return True
+            if self.remaining > 0:
+                self.remaining -= 1
+                return True
+            return False
+
+    def _start_tracemalloc(self):
+        with self._lock:
+            self._tracemalloc_users += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def _stop_tracemalloc(self):
+        with self._lock:
+            self._tracemalloc_users -= 1
+            if self._tracemalloc_users == 0 and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Profiler:
+    """Get the shared profiler instance."""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = Profiler()
+    return _profiler
+
+
+# ============================================================
+# RUN / NODE HOOKS
+# ============================================================
+
+_current_run: contextvars.ContextVar = contextvars.ContextVar("profile_run", default=None)
+
+
+@contextmanager
+def profile_run(kind: str, run_id: Optional[str], flag: bool = False) -> Iterator[Optional[ProfileRun]]:
+    """
+    Profile the block's graph nodes if this run is armed; yields None otherwise.
+
+    Args:
+        kind: "hunt" / "jd_analysis"
+        run_id: sessionId / runId
+        flag: The message's "profile" flag
+    """
+    profiler = get_profiler()
+    if not run_id or not profiler.should_profile(run_id, flag):
+        yield None
+        return
+
+    run = ProfileRun(kind, run_id)
+    print(f"[profiler] Profiling {kind}={run_id} -> {run.directory}")
+    profiler._start_tracemalloc()
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        profiler._stop_tracemalloc()
+        _write_index(run)
+
+
+def _write_index(run: ProfileRun):
+    entry = {
+        "kind": run.kind,
+        "id": run.run_id,
+        "created": datetime.now().isoformat(),
+        "directory": run.directory,
+        "wall_seconds": round(time.monotonic() - run.started, 3),
+        "nodes": list(run.nodes),
+    }
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(os.path.join(PROFILE_DIR, "index.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        print(f"[profiler] Failed to write index: {e}")
+
+
+def load_index(limit: int = 50) -> List[Dict[str, Any]]:
+    """Most recent profiled runs, newest first."""
+    path = os.path.join(PROFILE_DIR, "index.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return entries[::-1][:limit]
+
+
+@contextmanager
+def profile_node(node: str) -> Iterator[None]:
+    """Profile one graph node when the current run is being profiled (used by traced_node)."""
+    run = _current_run.get()
+    if run is None:
+        yield
+        return
+
+    # Snapshot before enabling cProfile so snapshot work isn't attributed to the node
+    before = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+    if before is not None:
+        tracemalloc.reset_peak()
+    profile: Optional[cProfile.Profile] = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Another profiler is already active on this interpreter (3.12+ sys.monitoring)
+        profile = None
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        seconds = time.monotonic() - start
+        if profile is not None:
+            profile.disable()
+        diff: List[tracemalloc.StatisticDiff] = []
+        peak = 0
+        if before is not None and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            diff = [
+                stat for stat in after.compare_to(before, "lineno")[:PROFILE_TOP_N * 8]
+                if stat.traceback[0].filename not in _IGNORED_FILES
+            ][:PROFILE_TOP_N * 4]
+        try:
+            run.add_node(node, seconds, profile, diff, peak)
+        except Exception as e:
+            print(f"[profiler] Failed to record node {node}: {e}")
@@ -0,0 +1,192 @@
+"""
+Heuristic Resume Pre-Classifier
+
+Scores extracted document text locally before the LLM verification call:
+- Section headers (Experience, Education, Skills, Projects, ...)
+- Date ranges ("Jan 2021 - Present", "2019 – 2022")
+- Contact signals (email, phone, LinkedIn/GitHub URLs)
+- Bullet density and document length
+- Negative signals (invoices, cover letters, papers)
+
+Documents that score clearly high are accepted locally. A low score alone is
+not enough to reject: a document is only rejected locally when it also has
+neither contact details nor date ranges, so a sparse or oddly formatted resume
+still reaches the LLM. Every decision is logged so agreement with the LLM can
+be measured.
+"""
+
+import os
+import re
+import random
+from typing import Dict
+
+# Score bands (0-100). These are hand-picked starting points, not fitted to a
+# labelled corpus: by the weights below a one-page resume with email, phone,
+# 3-4 sections and a few dated roles should score well above 60, and an invoice
+# or article with none of those well below 25. Tune them via env once the
+# logged `[classifier]` agreement data says where the bands really sit.
+ACCEPT_THRESHOLD = int(os.getenv("RESUME_CLASSIFIER_ACCEPT", "60"))
+REJECT_THRESHOLD = int(os.getenv("RESUME_CLASSIFIER_REJECT", "25"))
+
+# Fraction of confident decisions that are still sent to the LLM for auditing
+AUDIT_RATE = float(os.getenv("RESUME_CLASSIFIER_AUDIT_RATE", "0"))
+
+SECTION_PATTERNS = {
+    "experience": r"(?:work|professional|relevant)?\s*experience|work history|employment(?: history)?|internships?",
+    "education": r"education(?:al background)?|academic(?:s| background| qualifications)?",
+    "skills": r"(?:technical |core |key )?skills|technologies|tech stack|competencies",
+    "projects": r"(?:personal |academic |key )?projects",
+    "certifications": r"certifications?|licenses?(?: & certifications)?|courses",
+    "achievements": r"achievements|awards(?: & honors)?|honors|accomplishments",
+    "summary": r"(?:professional )?summary|objective|profile|about me",
+    "publications": r"publications|research",
+    "responsibility": r"positions? of responsibility|leadership|extra[- ]?curricular(?: activities)?|volunteer(?:ing)?",
+}
+
+_SECTION_RE = {
+    name: re.compile(rf"^\W*(?:{pattern})\W*$", re.IGNORECASE)
+    for name, pattern in SECTION_PATTERNS.items()
+}
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*'?\d{{2,4}}|\d{{1,2}}/\d{{4}}|(?:19|20)\d{{2}})"
+_DATE_RANGE_RE = re.compile(
+    rf"{_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|present|current|now|ongoing)",
+    re.IGNORECASE,
+)
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{8,16}\d")
+_PROFILE_URL_RE = re.compile(r"linkedin\.com/|github\.com/|gitlab\.com/|leetcode\.com/", re.IGNORECASE)
+_BULLET_RE = re.compile(r"^\s*(?:[•●▪◦‣➢➤✓✔■□\-\*–]|\d{1,2}[.)])\s+")
+
+NEGATIVE_PHRASES = [
+    "invoice", "receipt", "purchase order", "amount due", "gst number",
+    "table of contents", "chapter 1", "abstract", "references cited",
+    "terms and conditions", "privacy policy", "lorem ipsum",
+    "dear hiring manager", "dear sir", "yours sincerely", "yours faithfully",
+]
+
+
+def classify_resume(text: str) -> Dict:
+    """
+    Score a document and decide whether it is a resume without calling the LLM.
+
+    Args:
+        text: Raw extracted document text
+
+    Returns:
+        Dict with:
+            decision: "accept" | "reject" | "uncertain"
+            score: 0-100 heuristic score
+            signals: Raw signal counts used for the score
+            reasons: Short human-readable reasons (same shape as the LLM output)
+    """
+    text = text or ""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    lowered = text.lower()
+    words = len(text.split())
+
+    # 1. Section headers (short lines that are just a known heading)
+    sections = set()
+    for line in lines:
+        if len(line) > 40:
+            continue
+        for name, regex in _SECTION_RE.items():
+            if regex.match(line):
+                sections.add(name)
+                break
+
+    # 2. Date ranges
+    date_ranges = len(_DATE_RANGE_RE.findall(text))
+
+    # 3. Contact signals (only look at the header region for phones to avoid IDs)
+    has_email = bool(_EMAIL_RE.search(text))
+    has_phone = any(
+        10 <= sum(ch.isdigit() for ch in match) <= 13
+        for match in _PHONE_RE.findall(text[:1500])
+    )
+    has_profile_url = bool(_PROFILE_URL_RE.search(text))
+
+    # 4. Bullet density
+    bullet_lines = sum(1 for line in lines if _BULLET_RE.match(line))
+    bullet_ratio = bullet_lines / len(lines) if lines else 0.0
+
+    # 5. Negative phrases
+    negative_hits = [phrase for phrase in NEGATIVE_PHRASES if phrase in lowered]
+
+    score = 0
+    score += min(len(sections), 5) * 8          # up to 40
+    score += min(date_ranges, 4) * 5            # up to 20
+    score += 8 if has_email else 0
+    score += 6 if has_phone else 0
+    score += 6 if has_profile_url else 0        # contact up to 20
+    if bullet_ratio >= 0.15:
+        score += 10
+    elif bullet_ratio >= 0.05:
+        score += 5
+    if 150 <= words <= 2500:
+        score += 10
+    elif words < 80 or words > 6000:
+        score -= 15
+    score -= min(len(negative_hits), 3) * 10
+    score = max(0, min(100, score))
+
+    reasons = []
+    if sections:
+        reasons.append(f"Found sections: {', '.join(sorted(sections))}")
+    if date_ranges:
+        reasons.append(f"{date_ranges} date ranges")
+    if has_email or has_phone:
+        reasons.append("Contact details present")
+    if negative_hits:
+        reasons.append(f"Non-resume phrases: {', '.join(negative_hits[:3])}")
+    if words < 80:
+        reasons.append("Document is very short")
+
+    has_contact = has_email or has_phone or has_profile_url
+    if score >= ACCEPT_THRESHOLD and has_contact and len(sections) >= 2:
+        decision = "accept"
+    elif score <= REJECT_THRESHOLD and not has_contact and not date_ranges:
+        decision = "reject"
+    else:
+        decision = "uncertain"
+
+    return {
+        "decision": decision,
+        "score": score,
+        "signals": {
+            "sections": sorted(sections),
+            "date_ranges": date_ranges,
+            "has_email": has_email,
+            "has_phone": has_phone,
+            "has_profile_url": has_profile_url,
+            "bullet_ratio": round(bullet_ratio, 3),
+            "words": words,
+            "negative_hits": negative_hits,
+        },
+        "reasons": reasons,
+    }
+
+
+def should_audit(decision: str) -> bool:
+    """Return True if a confident local decision should also be checked by the LLM."""
+    return decision != "uncertain" and AUDIT_RATE > 0 and random.random() < AUDIT_RATE
+
+
+def log_decision(result: Dict, llm_is_resume=None, user_id: str = "") -> None:
+    """
+    Log a classifier decision (and the LLM verdict when one was obtained).
+
+    The `[classifier]` lines are greppable so agreement with the LLM can be
+    measured from worker logs.
+    """
+    line = (
+        f"   [classifier] user={user_id} decision={result['decision']} score={result['score']} "
+        f"sections={len(result['signals']['sections'])} dates={result['signals']['date_ranges']} "
+        f"bullets={result['signals']['bullet_ratio']}"
+    )
+    if llm_is_resume is not None:
+        heuristic_says = result["decision"] == "accept" if result["decision"] != "uncertain" else None
+        agrees = "n/a" if heuristic_says is None else str(heuristic_says == bool(llm_is_resume)).lower()
+        line += f" llm_is_resume={str(bool(llm_is_resume)).lower()} agrees={agrees}"
+    print(line)
@@ -0,0 +1,261 @@
+"""
+Structured LLM Calls - typed JSON-mode responses with field-level repair
+
+Nodes used to parse free-form LLM text and, when it didn't parse, either
+re-run the whole prompt (negative keywords), keep everything (AI cleanup) or
+silently assign default scores (batch scoring). invoke_structured instead:
+
+1. Calls the model in Groq JSON mode (response_format=json_object) with the
+   Pydantic model's JSON schema appended to the prompt
+2. Validates the response against the model (plus an optional semantic check,
+   e.g. "one score per job")
+3. If some fields are invalid, re-asks for ONLY those fields - a short prompt
+   that quotes the validation errors - and merges them into the valid ones.
+   For list fields where only some entries are invalid (one bad decision out
+   of 20), only those entries are quoted and re-asked, and the answers are
+   put back at their positions
+
+Each prompt family has its own response model below.
+"""
+
+import json
+from typing import Annotated, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel, Field, ValidationError
+
+from utils.json_extract import extract_json, JSONExtractionError
+
+T = TypeVar("T", bound=BaseModel)
+
+# An invalid field ("decisions"), or one entry of a list field (("decisions", 3)).
+# An entry position at or past the end of the list stands for a missing entry.
+ErrorKey = Union[str, Tuple[str, int]]
+
+# Extra validation: returns {field_name or (field_name, position): error message}
+Check = Callable[[BaseModel], Dict[ErrorKey, str]]
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a valid response could not be obtained after repairs."""
+
+
+# ============================================================
+# RESPONSE MODELS
+# ============================================================
+
+class NegativeKeywords(BaseModel):
+    negative_keywords: List[str] = Field(min_length=5, description="Job types/titles to exclude, lowercase")
+
+
+class JobDecision(BaseModel):
+    id: int = Field(description="0-based job ID")
+    keep: bool = Field(description="True if the job passes all criteria")
+    confidence: float = Field(ge=0, le=1, description="How sure you are, 0-1")
+
+
+class CleanupDecisions(BaseModel):
+    decisions: List[JobDecision] = Field(description="One decision per job")
+
+
+class BatchScores(BaseModel):
+    scores: List[Annotated[int, Field(ge=0, le=100)]] = Field(description="One 0-100 score per job, in input order")
+    confidence: List[Annotated[float, Field(ge=0, le=1)]] = Field(
+        default_factory=list, description="One 0-1 confidence per score, in input order"
+    )
+
+
+def decisions_cover(count: int) -> Check:
+    """
+    Check for CleanupDecisions: exactly one decision for each ID 0..count-1.
+
+    Duplicate or out-of-range entries are reported per position, each to be
+    replaced by one of the missing IDs; IDs still missing after that are
+    reported as positions past the end (appended on repair).
+    """
+    def check(result: CleanupDecisions) -> Dict[ErrorKey, str]:
+        present = {d.id for d in result.decisions}
+        missing = [i for i in range(count) if i not in present]
+        seen = set()
+        bad = []
+        for pos, decision in enumerate(result.decisions):
+            if decision.id in seen or not 0 <= decision.id < count:
+                bad.append(pos)
+            seen.add(decision.id)
+        if not bad and not missing:
+            return {}
+        if len(bad) > len(missing):
+            # Extra entries can't be fixed by replacing positions
+            ids = sorted(d.id for d in result.decisions)
+            return {"decisions": f"expected one decision for each id 0-{count - 1}, got ids {ids}"}
+
+        errors = {}
+        for pos, job_id in zip(bad, missing):
+            errors[("decisions", pos)] = (
+                f"id {result.decisions[pos].id} is a duplicate or out of range; give the decision for id {job_id} instead"
+            )
+        end = len(result.decisions)
+        for offset, job_id in enumerate(missing[len(bad):]):
+            errors[("decisions", end + offset)] = f"missing; give the decision for id {job_id}"
+        return errors
+    return check
+
+
+def score_count(count: int) -> Check:
+    """Check for BatchScores: exactly one score (and confidence, if given) per job."""
+    def check(result: BatchScores) -> Dict[str, str]:
+        errors = {}
+        if len(result.scores) != count:
+            errors["scores"] = f"expected exactly {count} scores, got {len(result.scores)}"
+        if result.confidence and len(result.confidence) != count:
+            errors["confidence"] = f"expected exactly {count} confidences, got {len(result.confidence)}"
+        return errors
+    return check
+
+
+# ============================================================
+# HELPER
+# ============================================================
+
+REPAIR_PROMPT = """Your previous JSON response had invalid parts.
+{field_block}{item_block}
+Return a JSON object containing ONLY {wanted}.
+Schema for reference:
+{schema}
+"""
+
+
+def _field_errors(error: ValidationError, data: dict) -> Dict[ErrorKey, str]:
+    """Map pydantic errors to fields, or to list entries when the error is inside one."""
+    errors = {}
+    for item in error.errors():
+        loc = item.get("loc") or ()
+        msg = item.get("msg", "invalid")
+        field = str(loc[0]) if loc else "__root__"
+        if len(loc) >= 2 and isinstance(loc[1], int) and isinstance(data.get(field), list):
+            detail = ".".join(str(part) for part in loc[2:])
+            errors.setdefault((field, loc[1]), f"{detail}: {msg}" if detail else msg)
+        else:
+            errors.setdefault(field, msg)
+    return errors
+
+
+def _split_errors(errors: Dict[ErrorKey, str], model: Type[BaseModel]):
+    """
+    ({field: msg} to re-ask whole, {field: {position: msg}} to re-ask per entry).
+
+    A field with a whole-field error is re-asked whole, so its entry errors
+    are dropped. Unknown fields fall back to re-asking every field.
+    """
+    fields = {k: v for k, v in errors.items() if isinstance(k, str) and k in model.model_fields}
+    items: Dict[str, Dict[int, str]] = {}
+    for key, msg in errors.items():
+        if isinstance(key, tuple) and key[0] in model.model_fields and key[0] not in fields:
+            items.setdefault(key[0], {})[key[1]] = msg
+    if not fields and not items:
+        fields = {f: errors.get(f, "invalid") for f in model.model_fields}
+    return fields, items
+
+
+def _repair_prompt(data: dict, fields: Dict[str, str], items: Dict[str, Dict[int, str]], schema: str) -> str:
+    field_block = item_block = ""
+    wanted = []
+    if fields:
+        previous = json.dumps({f: data.get(f) for f in fields})[:2000]
+        field_block = f"\nInvalid fields (previous values: {previous}):\n" + "".join(
+            f"- {field}: {msg}\n" for field, msg in fields.items()
+        )
+        wanted.append("the corrected fields " + ", ".join(fields))
+    if items:
+        lines = []
+        for field, positions in items.items():
+            entries = data.get(field) or []
+            for pos in sorted(positions):
+                previous = json.dumps(entries[pos]) if pos < len(entries) else "(missing)"
+                lines.append(f"- {field}[{pos}] = {previous[:500]}: {positions[pos]}\n")
+            wanted.append(f"\"{field}\": a list of {len(positions)} corrected entries, one per listed {field} position in that order")
+        item_block = "\nInvalid entries:\n" + "".join(lines)
+    return REPAIR_PROMPT.format(field_block=field_block, item_block=item_block, wanted="; ".join(wanted), schema=schema)
+
+
+def _merge_repair(data: dict, patch: dict, fields: Dict[str, str], items: Dict[str, Dict[int, str]]) -> dict:
+    """Valid parts of the previous answer, with corrected fields and entries from the repair."""
+    merged = {**data, **{k: v for k, v in patch.items() if k in fields}}
+    for field, positions in items.items():
+        corrected = patch.get(field)
+        if not isinstance(corrected, list) or len(corrected) != len(positions):
+            continue  # unusable answer; the entries stay invalid and fail the next validation
+        entries = list(data.get(field) or [])
+        for pos, entry in zip(sorted(positions), corrected):
+            if pos < len(entries):
+                entries[pos] = entry
+            else:
+                entries.append(entry)
+        merged[field] = entries
+    return merged
+
+
+def _json_llm(llm):
+    """Bind Groq JSON mode; fall back to the plain model if binding is unsupported."""
+    try:
+        return llm.bind(response_format={"type": "json_object"})
+    except Exception:
+        return llm
+
+
+def invoke_structured(
+    llm,
+    prompt: str,
+    model: Type[T],
+    check: Optional[Check] = None,
+    max_repairs: int = 1,
+    task_name: str = "LLM call"
+) -> T:
+    """
+    Invoke the LLM in JSON mode and return a validated model instance.
+
+    Args:
+        llm: ChatGroq (or compatible) chat model
+        prompt: Prompt text; the model's JSON schema is appended
+        model: Pydantic response model
+        check: Optional semantic validation returning {field: error}
+        max_repairs: How many field-level re-asks to allow
+        task_name: Label for logs
+
+    Raises:
+        StructuredOutputError: Still invalid after max_repairs re-asks
+    """
+    schema = json.dumps(model.model_json_schema())
+    json_llm = _json_llm(llm)
+    response = json_llm.invoke(f"{prompt}\n\nRespond with a JSON object matching this schema:\n{schema}")
+
+    try:
+        data = extract_json(response.content, expect=dict)
+    except JSONExtractionError as e:
+        data = {}
+        print(f"   [structured] {task_name}: response was not JSON ({e})")
+
+    for attempt in range(max_repairs + 1):
+        try:
+            result = model.model_validate(data)
+            errors = check(result) if check else {}
+        except ValidationError as e:
+            result = None
+            errors = _field_errors(e, data)
+
+        if not errors:
+            if attempt:
+                print(f"   [structured] {task_name}: repaired after {attempt} re-ask(s)")
+            return result
+        if attempt == max_repairs:
+            break
+
+        fields, items = _split_errors(errors, model)
+        invalid = list(fields) + [f"{field}{sorted(positions)}" for field, positions in items.items()]
+        print(f"   [structured] {task_name}: invalid {invalid}, re-asking")
+        try:
+            patch = extract_json(json_llm.invoke(_repair_prompt(data, fields, items, schema)).content, expect=dict)
+        except JSONExtractionError:
+            patch = {}
+        data = _merge_repair(data, patch, fields, items)
+
+    raise StructuredOutputError(f"{task_name}: invalid fields after {max_repairs} repair(s): {errors}")
@@ -0,0 +1,297 @@
+"""
+Resume Text Extraction Engine
+
+Extracts text from uploaded PDF/DOCX resumes in child processes:
+- Runs in a shared ProcessPoolExecutor (pdfminer is CPU-bound and holds the GIL)
+- The consumer thread still blocks until its document is done, and the
+  resume queue is consumed with prefetch 1, so the pool does not let the
+  worker take more uploads at once. What it buys is a shorter wait per
+  document and crash/timeout isolation
+- PDFs are split by page: the first task opens the document, checks the page
+  limit and extracts the first RESUME_PAGES_PER_TASK pages; the remaining pages
+  are then extracted in parallel, one task per chunk. With 4 workers and
+  free cores a 10-page PDF takes about four pages' worth of time instead of
+  ten; with one core it is no faster. DOCX is one task
+- One deadline per document, covering all its tasks; a task that overruns it
+  has its pool killed and replaced, so a stuck pdfminer child does not keep a
+  worker slot forever
+- Children come from a forkserver (spawn on Windows), never a fork of the
+  multi-threaded worker process
+- Inputs above SPOOL_THRESHOLD_BYTES are written once to a temp file and the
+  workers open it by path, instead of pickling a copy of the bytes per task
+- Layout-aware: two-column resume pages are read column by column so the
+  sidebar (skills, contact) does not get interleaved with experience bullets
+
+Limits (env overridable):
+- RESUME_MAX_BYTES: 10 MB
+- RESUME_MAX_PAGES: 10
+- RESUME_EXTRACTION_WORKERS: min(4, cpu_count)
+- RESUME_EXTRACTION_TIMEOUT: 60s
+- RESUME_PAGES_PER_TASK: 2
+"""
+
+import os
+import io
+import re
+import sys
+import time
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple, Union
+
+MAX_FILE_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "10"))
+EXTRACTION_WORKERS = int(os.getenv("RESUME_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACTION_TIMEOUT = float(os.getenv("RESUME_EXTRACTION_TIMEOUT", "60"))
+PAGES_PER_TASK = max(1, int(os.getenv("RESUME_PAGES_PER_TASK", "2")))
+SPOOL_THRESHOLD_BYTES = 1 * 1024 * 1024
+
+# Minimum empty vertical band (in PDF points) that counts as a column gutter
+MIN_GUTTER_WIDTH = 12
+
+Source = Union[bytes, str]  # raw bytes (small files) or a temp-file path (spooled)
+
+
+class ExtractionError(Exception):
+    """Raised when a document cannot be extracted within the configured limits."""
+
+
+# ============================================================
+# PROCESS POOL
+# ============================================================
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Get or create the shared extraction process pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # The worker already runs consumer, logging and Mongo threads, so
+            # forking it directly can copy a lock some other thread holds.
+            # The forkserver is a clean single-threaded process that only has
+            # this module (and the PDF/DOCX parsers) preloaded.
+            if sys.platform != "win32":
+                ctx = multiprocessing.get_context("forkserver")
+                ctx.set_forkserver_preload([__name__, "pdfplumber", "docx"])
+            else:
+                ctx = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS, mp_context=ctx)
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """
+    Kill a pool whose task overran its deadline and stop handing it out.
+
+    Future.result(timeout) only stops waiting; the child keeps parsing. The
+    executor has no public way to stop a running task, so its processes are
+    terminated directly. Other documents in flight on the same pool fail with
+    BrokenProcessPool and surface as ExtractionError.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        try:
+            process.terminate()
+        except Exception:
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool():
+    """Shut down the extraction pool (used by benchmarks and on worker exit)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+# ============================================================
+# WORKER-SIDE FUNCTIONS (run in child processes)
+# ============================================================
+
+def _open_source(source: Source):
+    """Return something pdfplumber/python-docx can open: a path or a BytesIO."""
+    if isinstance(source, str):
+        return source
+    return io.BytesIO(source)
+
+
+def _find_gutter(words: List[dict], page_width: float):
+    """
+    Find the x position of a vertical gutter between two text columns.
+
+    Only the middle 25-75% of the page is considered, and both sides must hold
+    a meaningful share of the words. Returns None for single-column pages.
+    """
+    if len(words) < 40:
+        return None
+
+    lo, hi = int(page_width * 0.25), int(page_width * 0.75)
+    covered = bytearray(int(page_width) + 2)
+    for w in words:
+        for x in range(max(int(w["x0"]), lo), min(int(w["x1"]), hi) + 1):
+            covered[x] = 1
+
+    best_start, best_len, run_start = None, 0, None
+    for x in range(lo, hi + 1):
+        if not covered[x]:
+            if run_start is None:
+                run_start = x
+            run_len = x - run_start + 1
+            if run_len > best_len:
+                best_start, best_len = run_start, run_len
+        else:
+            run_start = None
+
+    if best_len < MIN_GUTTER_WIDTH:
+        return None
+
+    gutter = best_start + best_len / 2
+    left = sum(1 for w in words if w["x1"] <= gutter)
+    share = left / len(words)
+    if share < 0.15 or share > 0.85:
+        return None
+    return gutter
+
+
+def _page_text(page) -> str:
+    """Extract text from one pdfplumber page, column by column if needed."""
+    words = page.extract_words(x_tolerance=1.5, y_tolerance=3)
+    gutter = _find_gutter(words, float(page.width))
+    if gutter is None:
+        text = page.extract_text(x_tolerance=1.5, y_tolerance=3) or ""
+    else:
+        left = page.crop((0, 0, gutter, page.height)).extract_text(x_tolerance=1.5, y_tolerance=3) or ""
+        right = page.crop((gutter, 0, page.width, page.height)).extract_text(x_tolerance=1.5, y_tolerance=3) or ""
+        text = f"{left}\n{right}"
+    # Drop trailing spaces and collapse runs of blank lines
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _extract_pdf(source: Source, max_pages: int, start: int = 0, stop: Optional[int] = None) -> Tuple[int, List[str]]:
+    """
+    Open the PDF, enforce the page limit, then extract pages [start, stop).
+
+    Returns (page count, page texts) so the caller can schedule the rest.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(_open_source(source)) as pdf:
+        page_count = len(pdf.pages)
+        if page_count > max_pages:
+            raise ExtractionError(f"Too many pages: {page_count} (limit {max_pages})")
+        pages = []
+        for page in pdf.pages[start:stop]:
+            pages.append(_page_text(page))
+            page.flush_cache()
+    return page_count, pages
+
+
+def _extract_docx(source: Source) -> str:
+    import docx
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = docx.Document(_open_source(source))
+    parts = []
+    # Walk the body in order so tables (common in resume templates) stay in place
+    for child in document.element.body.iterchildren():
+        tag = child.tag.rsplit("}", 1)[-1]
+        if tag == "p":
+            para = Paragraph(child, document)
+            text = para.text.strip()
+            if not text:
+                continue
+            style = (para.style.name or "").lower() if para.style is not None else ""
+            parts.append(f"• {text}" if "list" in style else text)
+        elif tag == "tbl":
+            for row in Table(child, document).rows:
+                cells = []
+                for cell in row.cells:
+                    cell_text = cell.text.strip()
+                    if cell_text and cell_text not in cells:  # merged cells repeat
+                        cells.append(cell_text)
+                if cells:
+                    parts.append(" | ".join(cells))
+    return "\n".join(parts)
+
+
+# ============================================================
+# PUBLIC API
+# ============================================================
+
+def extract_text(file_content: bytes, file_name: str) -> str:
+    """
+    Extract text from a PDF or DOCX resume in the process pool.
+
+    Args:
+        file_content: Downloaded file bytes
+        file_name: Original file name (extension selects the parser)
+
+    Returns:
+        Extracted text with pages separated by blank lines
+
+    Raises:
+        ExtractionError: Unsupported type, limits exceeded, or timeout
+    """
+    name = (file_name or "").lower()
+    if not name.endswith((".pdf", ".docx")):
+        raise ExtractionError(f"Unsupported file type: {file_name}")
+    if len(file_content) > MAX_FILE_BYTES:
+        raise ExtractionError(
+            f"File too large: {len(file_content) / 1024 / 1024:.1f} MB (limit {MAX_FILE_BYTES / 1024 / 1024:.0f} MB)"
+        )
+
+    spooled_path = None
+    source: Source = file_content
+    if len(file_content) > SPOOL_THRESHOLD_BYTES:
+        with tempfile.NamedTemporaryFile(prefix="resume_", suffix=os.path.splitext(name)[1], delete=False) as f:
+            f.write(file_content)
+            spooled_path = f.name
+        source = spooled_path
+
+    pool = get_pool()
+    deadline = time.monotonic() + EXTRACTION_TIMEOUT
+
+    def wait(future):
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            _discard_pool(pool)
+            raise ExtractionError(f"Extraction timed out after {EXTRACTION_TIMEOUT:.0f}s")
+
+    try:
+        if name.endswith(".docx"):
+            return wait(pool.submit(_extract_docx, source))
+
+        page_count, pages = wait(pool.submit(_extract_pdf, source, MAX_PAGES, 0, PAGES_PER_TASK))
+        rest = [
+            pool.submit(_extract_pdf, source, MAX_PAGES, start, start + PAGES_PER_TASK)
+            for start in range(PAGES_PER_TASK, page_count, PAGES_PER_TASK)
+        ]
+        for future in rest:
+            pages.extend(wait(future)[1])
+        return "\n\n".join(text for text in pages if text)
+
+    except BrokenProcessPool:
+        # A child died (OOM, segfault in a parser, or another document's
+        # timeout killed the pool); the next call gets a fresh pool
+        _discard_pool(pool)
+        raise ExtractionError("Extraction worker crashed")
+    finally:
+        if spooled_path:
+            try:
+                os.unlink(spooled_path)
+            except OSError:
+                pass
@@ -0,0 +1,491 @@
+"""
+Span Tracing - per-node timing for LangGraph pipelines
+
+Nodes only reported progress with print, so nobody could say where the 60+
+seconds of a hunt went. A run (hunt session, JD runId, mentor thread) now
+opens a trace with start_trace(); inside it, spans nest automatically through
+a contextvar:
+
+- Graph nodes: traced_node() wrapper (job counts in/out, cache hits via annotate())
+- LLM calls: ManagedChatGroq (model, tokens, queue wait)
+- MongoDB commands: pymongo CommandListener (install_mongo_tracing)
+- External HTTP: usage_tracker.track_http (Adzuna, Tavily, HiringCafe, Gemini)
+
+Node durations also feed the pipeline_node_seconds histogram (utils/metrics.py),
+and armed runs are profiled per node (utils/profiler.py).
+
+Finished spans go to a pluggable exporter (set_exporter). The default queues
+them for a background writer thread, which appends JSON lines to
+TRACE_DIR/spans-YYYYMMDD.jsonl, starts a new part (spans-YYYYMMDD.N.jsonl) past
+TRACE_MAX_MB and deletes the oldest files beyond TRACE_MAX_FILES. Spans are
+dropped, not waited for, when the queue is full. Spans outside a trace are
+not recorded. Off by default; TRACING_ENABLED=true turns it on.
+
+Waterfall for one run:
+    python utils/tracing.py <trace_id> [--dir traces]
+    python utils/tracing.py --list
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import atexit
+import inspect
+import argparse
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+TRACE_MAX_MB = float(os.getenv("TRACE_MAX_MB", "50"))
+TRACE_MAX_FILES = int(os.getenv("TRACE_MAX_FILES", "20"))
+TRACE_QUEUE_SIZE = int(os.getenv("TRACE_QUEUE_SIZE", "10000"))
+
+
+class Span:
+    """One timed operation; parent_id links it into its trace's tree."""
+
+    def __init__(
+        self, name: str, kind: str, trace_id: str, parent_id: Optional[str] = None,
+        pipeline: Optional[str] = None, **attributes
+    ):
+        self.name = name
+        # Root span name (hunt / jd_analysis / mentor), inherited by descendants
+        self.pipeline = pipeline or name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.attributes: Dict[str, Any] = dict(attributes)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, error: BaseException):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"[:500]
+
+    def finish(self):
+        if self.end is None:
+            self.end = time.time()
+            _exporter.export(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.time()) - self.start) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "pipeline": self.pipeline,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+# ============================================================
+# EXPORTERS
+# ============================================================
+
+class SpanExporter:
+    """Receives every finished span. Subclass and pass to set_exporter()."""
+
+    def export(self, span: Span):
+        pass
+
+
+class JsonlExporter(SpanExporter):
+    """
+    Appends spans to TRACE_DIR/spans-YYYYMMDD[.N].jsonl from a writer thread.
+
+    export() only enqueues, so traced code (including every Mongo command)
+    never waits on file I/O.
+    """
+
+    def __init__(self, directory: str = TRACE_DIR, max_bytes: int = int(TRACE_MAX_MB * 1024 * 1024),
+                 max_files: int = TRACE_MAX_FILES, queue_size: int = TRACE_QUEUE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._file = None
+        self._path: Optional[str] = None
+        self._part = 0
+
+    def export(self, span: Span):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(json.dumps(span.to_dict(), default=str))
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def close(self, timeout: float = 5.0):
+        """Write the queued spans and stop the writer thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _write_loop(self):
+        while True:
+            lines = [self._queue.get()]
+            # Drain whatever else is queued into the same write
+            while len(lines) < 256:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in lines
+            try:
+                self._write([line for line in lines if line is not None])
+            except OSError as e:
+                print(f"[tracing] Failed to write spans: {e}")
+                self._close_file()
+            if stop:
+                self._close_file()
+                if self.dropped:
+                    print(f"[tracing] Dropped {self.dropped} spans (queue full)")
+                return
+
+    def _write(self, lines: List[str]):
+        if not lines:
+            return
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        if self._file is None or not os.path.basename(self._path).startswith(f"spans-{day}"):
+            self._open(day)
+        elif self._file.tell() >= self.max_bytes:
+            self._open(day, rotate=True)
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def _part_path(self, day: str, part: int) -> str:
+        name = f"spans-{day}.jsonl" if part == 0 else f"spans-{day}.{part}.jsonl"
+        return os.path.join(self.directory, name)
+
+    def _open(self, day: str, rotate: bool = False):
+        self._close_file()
+        os.makedirs(self.directory, exist_ok=True)
+        if rotate:
+            self._part += 1
+        else:
+            # Continue after the newest part already written today (e.g. after a restart)
+            parts = [name[len(f"spans-{day}"):-len(".jsonl")].lstrip(".") for name in os.listdir(self.directory)
+                     if name.startswith(f"spans-{day}") and name.endswith(".jsonl")]
+            self._part = max((int(p) if p.isdigit() else 0 for p in parts), default=0)
+            path = self._part_path(day, self._part)
+            if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+                self._part += 1
+        self._path = self._part_path(day, self._part)
+        self._file = open(self._path, "a", encoding="utf-8")
+        self._prune()
+
+    def _prune(self):
+        """Delete the oldest span files beyond max_files (the open one is never the oldest)."""
+        files = [os.path.join(self.directory, f) for f in os.listdir(self.directory)
+                 if f.startswith("spans-") and f.endswith(".jsonl")]
+        files.sort(key=os.path.getmtime)
+        for path in files[:max(0, len(files) - self.max_files)]:
+            if path != self._path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+_exporter: SpanExporter = JsonlExporter() if TRACING_ENABLED else SpanExporter()
+
+
+def set_exporter(exporter: SpanExporter):
+    global _exporter
+    _exporter = exporter
+
+
+# ============================================================
+# SPANS
+# ============================================================
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+# Run name for the node-latency metric; set by start_trace() even with tracing off
+_current_pipeline: contextvars.ContextVar = contextvars.ContextVar("trace_pipeline", default="untraced")
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def annotate(**attributes):
+    """Attach attributes (cache_hit=True, jobs_out=12, ...) to the current span."""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attributes)
+
+
+def _reset(token, var: contextvars.ContextVar = _current_span):
+    try:
+        var.reset(token)
+    except ValueError:
+        # Async generators (mentor SSE) can be closed from another context
+        pass
+
+
+@contextmanager
+def start_trace(name: str, trace_id: Optional[str] = None, **attributes) -> Iterator[Optional[Span]]:
+    """Open the root span of a run; trace_id defaults to a random id."""
+    pipeline_token = _current_pipeline.set(name)
+    if not TRACING_ENABLED:
+        try:
+            yield None
+        finally:
+            _reset(pipeline_token, _current_pipeline)
+        return
+    root = Span(name, "run", str(trace_id or uuid.uuid4().hex), **attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.fail(e)
+        raise
+    finally:
+        _reset(token)
+        _reset(pipeline_token, _current_pipeline)
+        root.finish()
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes) -> Iterator[Optional[Span]]:
+    """Child span of the current span; a no-op outside a trace."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, kind, parent.trace_id, parent.span_id, pipeline=parent.pipeline, **attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.fail(e)
+        raise
+    finally:
+        _reset(token)
+        child.finish()
+
+
+def _count_lists(prefix: str, values: Dict[str, Any], keys: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    keys = values.keys() if keys is None else keys
+    return {f"{prefix}.{k}": len(values[k]) for k in keys if isinstance(values.get(k), (list, tuple, dict))}
+
+
+def traced_node(name: str, inputs: Iterable[str] = ()) -> Callable:
+    """
+    Wrap a LangGraph node in a span.
+
+    Args:
+        name: Node name
+        inputs: State keys whose sizes are recorded as in.<key>; sizes of
+            every list/dict in the node's update are recorded as out.<key>
+    """
+    def decorate(fn: Callable) -> Callable:
+        # Imported here so `python utils/tracing.py` runs without utils on sys.path
+        from utils.metrics import observe_node
+        from utils.profiler import profile_node
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(state, *args, **kwargs):
+                start = time.monotonic()
+                with span(name, "node", **_count_lists("in", state, inputs)) as s:
+                    try:
+                        with profile_node(name):
+                            update = await fn(state, *args, **kwargs)
+                    finally:
+                        observe_node(_current_pipeline.get(), name, time.monotonic() - start)
+                    if s is not None and isinstance(update, dict):
+                        s.set(**_count_lists("out", update))
+                    return update
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(state, *args, **kwargs):
+            start = time.monotonic()
+            with span(name, "node", **_count_lists("in", state, inputs)) as s:
+                try:
+                    with profile_node(name):
+                        update = fn(state, *args, **kwargs)
+                finally:
+                    observe_node(_current_pipeline.get(), name, time.monotonic() - start)
+                if s is not None and isinstance(update, dict):
+                    s.set(**_count_lists("out", update))
+                return update
+        return wrapper
+    return decorate
+
+
+# ============================================================
+# MONGODB
+# ============================================================
+
+_mongo_installed = False
+
+
+def install_mongo_tracing():
+    """Register a pymongo CommandListener (affects MongoClients created afterwards)."""
+    global _mongo_installed
+    if _mongo_installed or not TRACING_ENABLED:
+        return
+    from pymongo import monitoring
+
+    class _CommandSpans(monitoring.CommandListener):
+        def __init__(self):
+            self._open: Dict[tuple, Span] = {}
+            self._lock = threading.Lock()
+
+        def started(self, event):
+            parent = _current_span.get()
+            if parent is None:
+                return
+            collection = event.command.get(event.command_name)
+            s = Span(
+                f"mongo {event.command_name}", "mongo", parent.trace_id, parent.span_id, pipeline=parent.pipeline,
+                db=event.database_name, collection=collection if isinstance(collection, str) else None
+            )
+            with self._lock:
+                self._open[(event.request_id, event.connection_id)] = s
+
+        def _close(self, event, error: Optional[str] = None):
+            with self._lock:
+                s = self._open.pop((event.request_id, event.connection_id), None)
+            if s is not None:
+                if error:
+                    s.status, s.error = "error", error[:500]
+                s.finish()
+
+        def succeeded(self, event):
+            self._close(event)
+
+        def failed(self, event):
+            self._close(event, str(event.failure))
+
+    monitoring.register(_CommandSpans())
+    _mongo_installed = True
+
+
+# ============================================================
+# WATERFALL CLI
+# ============================================================
+
+def load_spans(directory: str = TRACE_DIR, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    spans = []
+    if not os.path.isdir(directory):
+        return spans
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith("spans-") and filename.endswith(".jsonl")):
+            continue
+        with open(os.path.join(directory, filename), encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if trace_id is None or record.get("trace_id") == trace_id:
+                    spans.append(record)
+    return spans
+
+
+def render_waterfall(spans: List[Dict[str, Any]], width: int = 50) -> str:
+    """Indented span tree with offset/duration columns and a timeline bar."""
+    if not spans:
+        return "No spans found."
+    t0 = min(s["start"] for s in spans)
+    total = max((s["end"] or s["start"]) for s in spans) - t0 or 1e-9
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    ids = {s["span_id"] for s in spans}
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        children.setdefault(parent, []).append(s)
+
+    lines = [f"{'offset':>9s} {'duration':>10s}  {'span':<48s} timeline"]
+
+    def walk(parent: Optional[str], depth: int):
+        for s in sorted(children.get(parent, []), key=lambda x: x["start"]):
+            offset = s["start"] - t0
+            duration = (s["end"] or s["start"]) - s["start"]
+            left = int(offset / total * width)
+            bar = " " * left + "█" * max(1, int(duration / total * width))
+            attrs = " ".join(f"{k}={v}" for k, v in s.get("attributes", {}).items() if v is not None)
+            label = ("  " * depth + f"{s['name']}{' ✗' if s['status'] == 'error' else ''}")[:48]
+            lines.append(f"{offset * 1000:8.0f}ms {duration * 1000:8.0f}ms  {label:<48s} |{bar:<{width}s}| {attrs}")
+            walk(s["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def _summarise_by_kind(spans: List[Dict[str, Any]]) -> str:
+    totals: Dict[str, List[float]] = {}
+    for s in spans:
+        totals.setdefault(s["kind"], []).append(s["duration_ms"])
+    return "\n".join(
+        f"  {kind:<8s} {len(d):5d} spans  {sum(d) / 1000:8.2f}s total" for kind, d in sorted(totals.items())
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a per-run span waterfall from JSONL traces")
+    parser.add_argument("trace_id", nargs="?", help="sessionId / runId / thread_id")
+    parser.add_argument("--dir", default=TRACE_DIR, help="Trace directory (default: TRACE_DIR)")
+    parser.add_argument("--list", action="store_true", help="List recorded runs")
+    parser.add_argument("--width", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.list or not args.trace_id:
+        roots = [s for s in load_spans(args.dir) if s["parent_id"] is None]
+        for root in sorted(roots, key=lambda s: s["start"]):
+            started = datetime.fromtimestamp(root["start"]).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"{started}  {root['name']:<12s} {root['duration_ms'] / 1000:8.1f}s  {root['trace_id']}")
+        sys.exit(0)
+
+    spans = load_spans(args.dir, args.trace_id)
+    print(render_waterfall(spans, args.width))
+    if spans:
+        print("\nBy kind (nested spans overlap their parents):")
+        print(_summarise_by_kind(spans))
@@ -0,0 +1,80 @@
+"""
+Transport - how the worker's queue consumers get a broker connection
+
+worker.main() used to build a pika.BlockingConnection inline, so the queue
+callbacks could only be driven by a live RabbitMQ. The connection now comes
+from a Transport:
+
+- PikaTransport (default): BlockingConnection to RABBITMQ_URI with the
+  worker's heartbeat / blocked-connection timeouts. These are read from the
+  environment when the transport is created, not at import, so a .env
+  loaded after this module is imported still applies
+- Anything else with the same shape: connect() returns an object with
+  channel() and close(), whose channels implement the pika BlockingChannel
+  calls the worker uses (queue_declare, basic_qos, basic_consume,
+  basic_publish, basic_ack / basic_nack, start_consuming / stop_consuming).
+  testing/memory_broker.py provides an in-process one for load tests.
+
+set_transport() swaps it before worker.main() runs; get_transport() returns
+the current one.
+"""
+
+import os
+import threading
+from typing import Any, Optional
+
+DEFAULT_HEARTBEAT = 600
+DEFAULT_BLOCKED_TIMEOUT = 600
+
+
+class Transport:
+    """Opens broker connections for the worker's consumers."""
+
+    name = "transport"
+
+    def connect(self) -> Any:
+        """A new connection: .channel() opens a channel, .close() closes everything."""
+        raise NotImplementedError
+
+
+class PikaTransport(Transport):
+    """RabbitMQ through pika.BlockingConnection."""
+
+    name = "pika"
+
+    def __init__(self, uri: Optional[str] = None, heartbeat: Optional[int] = None,
+                 blocked_connection_timeout: Optional[int] = None):
+        self.uri = uri or os.getenv("RABBITMQ_URI")
+        self.heartbeat = heartbeat if heartbeat is not None else int(
+            os.getenv("RABBITMQ_HEARTBEAT", str(DEFAULT_HEARTBEAT)))
+        self.blocked_connection_timeout = blocked_connection_timeout if blocked_connection_timeout is not None else int(
+            os.getenv("RABBITMQ_BLOCKED_TIMEOUT", str(DEFAULT_BLOCKED_TIMEOUT)))
+
+    def connect(self):
+        import pika
+
+        if not self.uri:
+            raise RuntimeError("RABBITMQ_URI is not set")
+        params = pika.URLParameters(self.uri)
+        params.heartbeat = self.heartbeat
+        params.blocked_connection_timeout = self.blocked_connection_timeout
+        return pika.BlockingConnection(params)
+
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = PikaTransport()
+        return _transport
+
+
+def set_transport(transport: Optional[Transport]):
+    """Use `transport` for new worker connections; None restores RabbitMQ."""
+    global _transport
+    with _transport_lock:
+        _transport = transport
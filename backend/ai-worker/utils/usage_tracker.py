@@ -0,0 +1,334 @@
+"""
+Usage Tracker - token, latency and external-API accounting per run and per user
+
+Hunts and JD analyses only printed counts, so there was no way to tell what a
+run cost. Work now runs inside a usage scope (hunt session, JD runId, mentor
+thread) held in a contextvar:
+
+- LLM calls (utils/llm_client.py) record model, prompt/completion tokens from
+  the response metadata, and latency
+- External HTTP calls (Adzuna, Tavily, HiringCafe, Gemini embeddings) record
+  service, latency and errors via track_http(); a raised exception or a
+  4xx/5xx response passed to call.record() counts as an error
+- Cross-session batches (utils/llm_batcher.py) split their usage evenly over
+  the entries' scopes with shared_scope()
+
+When a scope closes - also when the run fails or raises - its summary is
+added to the user's daily totals (MongoDB collection usage_daily, or
+in-process without MONGODB_URI). Callers persist scope.summary() onto their
+own document (huntersessions / jd_analyses) through usage_scope(persist=...),
+which runs in the scope's finally, so failed runs keep their accounting too.
+
+Budgets (0 = unlimited): USAGE_DAILY_TOKEN_BUDGET, USAGE_DAILY_HTTP_BUDGET.
+pipeline_depth() returns "reduced" past USAGE_REDUCED_AT of either budget and
+"minimal" once it is spent; the hunt graph uses it to cut LLM work.
+"""
+
+from pymongo import MongoClient
+import os
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils.metrics import observe_llm, observe_http
+from utils.tracing import span
+
+DAILY_TOKEN_BUDGET = int(os.getenv("USAGE_DAILY_TOKEN_BUDGET", "0"))
+DAILY_HTTP_BUDGET = int(os.getenv("USAGE_DAILY_HTTP_BUDGET", "0"))
+REDUCED_AT = float(os.getenv("USAGE_REDUCED_AT", "0.8"))
+
+DEPTH_FULL = "full"
+DEPTH_REDUCED = "reduced"
+DEPTH_MINIMAL = "minimal"
+
+
+class UsageScope:
+    """Accumulated LLM and HTTP usage for one run."""
+
+    def __init__(self, kind: str, scope_id: Optional[str], user_id: Optional[str] = None):
+        self.kind = kind
+        self.scope_id = scope_id
+        self.user_id = user_id
+        self.llm: Dict[str, Dict[str, float]] = {}
+        self.http: Dict[str, Dict[str, float]] = {}
+        self.started = time.monotonic()
+        self.wall_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add_llm(self, model: str, prompt_tokens: float, completion_tokens: float, latency: float, calls: float = 1):
+        with self._lock:
+            entry = self.llm.setdefault(model, {"calls": 0, "promptTokens": 0, "completionTokens": 0, "seconds": 0.0})
+            entry["calls"] += calls
+            entry["promptTokens"] += prompt_tokens
+            entry["completionTokens"] += completion_tokens
+            entry["seconds"] += latency
+
+    def add_http(self, service: str, latency: float, ok: bool = True, calls: float = 1):
+        with self._lock:
+            entry = self.http.setdefault(service, {"calls": 0, "errors": 0, "seconds": 0.0})
+            entry["calls"] += calls
+            entry["errors"] += 0 if ok else calls
+            entry["seconds"] += latency
+
+    def merge(self, other: "UsageScope", weight: float = 1.0):
+        """Add `weight` x other's usage (used to split shared batches)."""
+        for model, e in other.llm.items():
+            self.add_llm(model, e["promptTokens"] * weight, e["completionTokens"] * weight,
+                         e["seconds"] * weight, calls=e["calls"] * weight)
+        for service, e in other.http.items():
+            with self._lock:
+                entry = self.http.setdefault(service, {"calls": 0, "errors": 0, "seconds": 0.0})
+                entry["calls"] += e["calls"] * weight
+                entry["errors"] += e["errors"] * weight
+                entry["seconds"] += e["seconds"] * weight
+
+    def totals(self) -> Dict[str, float]:
+        with self._lock:
+            prompt = sum(e["promptTokens"] for e in self.llm.values())
+            completion = sum(e["completionTokens"] for e in self.llm.values())
+            return {
+                "llmCalls": round(sum(e["calls"] for e in self.llm.values()), 2),
+                "promptTokens": round(prompt),
+                "completionTokens": round(completion),
+                "totalTokens": round(prompt + completion),
+                "llmSeconds": round(sum(e["seconds"] for e in self.llm.values()), 3),
+                "httpCalls": round(sum(e["calls"] for e in self.http.values()), 2),
+                "httpErrors": round(sum(e["errors"] for e in self.http.values()), 2),
+                "httpSeconds": round(sum(e["seconds"] for e in self.http.values()), 3),
+            }
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON/BSON-safe summary for persisting onto the run's document."""
+        def rounded(table):
+            return {name: {k: round(v, 3) for k, v in e.items()} for name, e in table.items()}
+
+        with self._lock:
+            llm, http = rounded(self.llm), rounded(self.http)
+        return {
+            "kind": self.kind,
+            "id": self.scope_id,
+            "userId": self.user_id,
+            "wallSeconds": round(self.wall_seconds if self.wall_seconds is not None else time.monotonic() - self.started, 3),
+            "totals": self.totals(),
+            # Model names contain dots, which MongoDB field names can't
+            "llm": {model.replace(".", "_"): e for model, e in llm.items()},
+            "http": http,
+        }
+
+
+_current_scope: contextvars.ContextVar = contextvars.ContextVar("usage_scope", default=None)
+
+
+def current_scope() -> Optional[UsageScope]:
+    return _current_scope.get()
+
+
+# ============================================================
+# RECORDING
+# ============================================================
+
+def record_llm(model: str, prompt_tokens: int, completion_tokens: int, latency: float):
+    observe_llm(model, latency, prompt_tokens, completion_tokens)
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.add_llm(model, prompt_tokens or 0, completion_tokens or 0, latency)
+
+
+class HttpCall:
+    """Yielded by track_http(); record() the response so 4xx/5xx count as errors."""
+
+    def __init__(self):
+        self.ok = True
+        self.status: Optional[int] = None
+
+    def record(self, response):
+        """Take the status from a requests (status_code) or aiohttp (status) response; returns it."""
+        status = getattr(response, "status_code", None)
+        if status is None:
+            status = getattr(response, "status", None)
+        if isinstance(status, int):
+            self.status = status
+            self.ok = status < 400
+        return response
+
+
+@contextmanager
+def track_http(service: str) -> Iterator[HttpCall]:
+    """Time an external API call, charge it to the current scope and trace it as a span."""
+    start = time.monotonic()
+    call = HttpCall()
+    try:
+        with span(f"http {service}", "http", service=service) as s:
+            yield call
+            if s is not None and call.status is not None:
+                s.set(status=call.status)
+                if not call.ok:
+                    s.status = "error"
+    except Exception:
+        call.ok = False
+        raise
+    finally:
+        elapsed = time.monotonic() - start
+        observe_http(service, elapsed, call.ok)
+        scope = _current_scope.get()
+        if scope is not None:
+            scope.add_http(service, elapsed, call.ok)
+
+
+# ============================================================
+# SCOPES
+# ============================================================
+
+@contextmanager
+def usage_scope(
+    kind: str, scope_id: Optional[str], user_id: Optional[str] = None,
+    persist: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Iterator[UsageScope]:
+    """
+    Run a block inside a usage scope.
+
+    Args:
+        kind: "hunt", "jd_analysis", "mentor", ...
+        scope_id: sessionId / runId / thread_id
+        user_id: Owner, for the daily per-user rollup
+        persist: Called with scope.summary() when the scope closes, also when
+            the block raises (e.g. to save it on the run's document)
+    """
+    scope = UsageScope(kind, scope_id, user_id)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        try:
+            _current_scope.reset(token)
+        except ValueError:
+            # Async generators (mentor SSE) can be closed from another context
+            pass
+        scope.wall_seconds = time.monotonic() - scope.started
+        totals = scope.totals()
+        print(
+            f"   [usage] {kind}={scope_id} tokens={totals['totalTokens']} llm_calls={totals['llmCalls']} "
+            f"llm_s={totals['llmSeconds']} http_calls={totals['httpCalls']} wall_s={scope.wall_seconds:.1f}"
+        )
+        if user_id:
+            get_usage_store().add(user_id, totals)
+        if persist is not None:
+            try:
+                persist(scope.summary())
+            except Exception as e:
+                print(f"   [usage] Failed to persist usage for {kind}={scope_id}: {e}")
+
+
+@contextmanager
+def shared_scope(owners: List[Optional[UsageScope]]) -> Iterator[UsageScope]:
+    """
+    Collect usage for work done on behalf of several entries (one owner scope
+    per entry, possibly None), then split it evenly across the entries.
+    """
+    shared = UsageScope("shared", None)
+    token = _current_scope.set(shared)
+    try:
+        yield shared
+    finally:
+        _current_scope.reset(token)
+        if owners:
+            weight = 1 / len(owners)
+            for owner in owners:
+                if owner is not None:
+                    owner.merge(shared, weight)
+
+
+# ============================================================
+# DAILY TOTALS / BUDGETS
+# ============================================================
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class UsageStore:
+    """Per-user daily totals: MongoDB usage_daily, or in-process only."""
+
+    def __init__(self):
+        self._local: Dict[tuple, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self.collection = None
+
+        mongo_uri = os.getenv("MONGODB_URI") or os.getenv("MONGO_URI")
+        if not mongo_uri:
+            print("[UsageStore] MONGODB_URI not set, keeping daily usage in-process only")
+            return
+        try:
+            client = MongoClient(mongo_uri)
+            self.collection = client["career_os"]["usage_daily"]
+            self.collection.create_index([("userId", 1), ("date", 1)], unique=True)
+        except Exception as e:
+            print(f"[UsageStore] MongoDB unavailable, keeping daily usage in-process only: {e}")
+
+    def add(self, user_id: str, totals: Dict[str, float]):
+        day = _today()
+        with self._lock:
+            local = self._local.setdefault((user_id, day), {})
+            for key, value in totals.items():
+                local[key] = local.get(key, 0) + value
+
+        if self.collection is None:
+            return
+        try:
+            self.collection.update_one(
+                {"userId": user_id, "date": day},
+                {"$inc": totals, "$set": {"updated_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"[UsageStore] Error saving daily usage: {e}")
+
+    def today(self, user_id: str) -> Dict[str, float]:
+        day = _today()
+        if self.collection is not None:
+            try:
+                doc = self.collection.find_one({"userId": user_id, "date": day}, {"_id": 0})
+                return doc or {}
+            except Exception as e:
+                print(f"[UsageStore] Error reading daily usage: {e}")
+        with self._lock:
+            return dict(self._local.get((user_id, day), {}))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_usage_store() -> UsageStore:
+    """Get the shared store instance."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UsageStore()
+    return _store
+
+
+def pipeline_depth(user_id: Optional[str]) -> str:
+    """Pipeline depth allowed by the user's remaining daily budget."""
+    if not user_id or not (DAILY_TOKEN_BUDGET or DAILY_HTTP_BUDGET):
+        return DEPTH_FULL
+
+    used = get_usage_store().today(user_id)
+    fractions = []
+    if DAILY_TOKEN_BUDGET:
+        fractions.append(used.get("totalTokens", 0) / DAILY_TOKEN_BUDGET)
+    if DAILY_HTTP_BUDGET:
+        fractions.append(used.get("httpCalls", 0) / DAILY_HTTP_BUDGET)
+    spent = max(fractions)
+
+    if spent >= 1:
+        depth = DEPTH_MINIMAL
+    elif spent >= REDUCED_AT:
+        depth = DEPTH_REDUCED
+    else:
+        return DEPTH_FULL
+    print(f"   [usage] user {user_id} at {spent:.0%} of daily budget, depth={depth}")
+    return depth
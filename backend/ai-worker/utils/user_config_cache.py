@@ -16,6 +16,8 @@ import hashlib
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 
+from utils.metrics import record_cache
+
 
 class UserConfigCache:
     """MongoDB cache for user-specific AI-generated configurations"""
@@ -72,6 +74,7 @@ class UserConfigCache:
             
             if not doc:
                 print(f"[Cache] Miss for user={user_id[:12]}..., role={role_normalized}")
+                record_cache("user_config", False)
                 return None
             
             # Check if stale (>30 days)
@@ -80,9 +83,11 @@ class UserConfigCache:
                 age = datetime.now() - created_at
                 if age > timedelta(days=30):
                     print(f"[Cache] Stale (age={age.days} days), invalidating")
+                    record_cache("user_config", False)
                     return None
             
             print(f"[Cache] ✅ HIT for user={user_id[:12]}..., role={role_normalized}")
+            record_cache("user_config", True)
             
             return {
                 "negative_keywords": doc.get("negative_keywords", []),
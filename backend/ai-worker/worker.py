@@ -4,26 +4,42 @@ import sys
 import time
 import json
 import requests
-# import pdfplumber  # Not needed - PDF extraction handled by uploadthing
-# import docx  # Not needed - DOCX extraction handled by uploadthing
-import io
-import re
 import threading
+import hashlib
+import hmac
 import asyncio
+from typing import Optional
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+
+# Before the utils imports: their env tunables (LOG_LEVEL, TRACING_ENABLED,
+# CASSETTE_MODE, LLM_*...) are read when the modules are imported
+load_dotenv()
+
 from pymongo import MongoClient
 from pymongo.server_api import ServerApi
-from fastapi import FastAPI
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
+from utils.resume_classifier import classify_resume, should_audit, log_decision
+from utils.user_config_cache import UserConfigCache
+from utils.text_extraction import extract_text, shutdown_pool
+from utils.llm_batcher import shutdown_batchers
+from utils.jd_parse_cache import get_jd_parse_cache
+from utils.json_extract import extract_json
+from utils.llm_client import get_chat_model, Priority
+from utils.usage_tracker import usage_scope, pipeline_depth
+from utils.tracing import start_trace, install_mongo_tracing
+from utils.metrics import instrument_consumer, observe_ttft, render as render_metrics, PROMETHEUS_AVAILABLE
+from utils.logging_setup import setup_logging
+from utils.profiler import profile_run, get_profiler, load_index
+from utils.cassette import use_cassette
+from utils.transport import get_transport
 
 # --- CONFIGURATION ---
-load_dotenv()
+setup_logging()
 MONGO_URI = os.getenv("MONGODB_URI") or os.getenv("MONGO_URI")
-RABBITMQ_URI = os.getenv("RABBITMQ_URI")
 RESUME_QUEUE_NAME = "resume_processing_queue"
 JD_QUEUE_NAME = "jd_analysis_queue"
 JOB_HUNTER_QUEUE_NAME = "job_hunter_queue"
@@ -70,6 +86,22 @@ Document:
 \"\"\"
 """
 
+FINGERPRINT_PROMPT = """
+You are a resume summarizer. Create a concise 200-token summary capturing:
+- Seniority level and years of experience
+- Top 5 technical skills
+- 1-2 key projects or achievements
+- Target roles/industries
+
+Resume:
+\"\"\"
+{resume_text}
+\"\"\"
+
+Output format (plain text, no JSON):
+[Seniority] | [X YOE] | [Skill1, Skill2, ...] | [Key achievement] | [Target roles]
+"""
+
 # --- GROQ AI SETUP ---
 try:
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -77,7 +109,7 @@ try:
         raise Exception("GROQ_API_KEY not found in .env file.")
     
     # Initialize Groq LLM (Llama 3.3) for general worker tasks (Resume Parsing)
-    worker_llm = ChatGroq(model="llama-3.3-70b-versatile", groq_api_key=GROQ_API_KEY, temperature=0.1)
+    worker_llm = get_chat_model("llama-3.3-70b-versatile", temperature=0.1, priority=Priority.RESUME, api_key=GROQ_API_KEY)
     
     print("✅ Groq AI Model configured (Llama 3.3).")
 except Exception as e:
@@ -85,6 +117,8 @@ except Exception as e:
     sys.exit(1)
 
 # --- MONGODB SETUP ---
+# Command spans for traced runs; must be registered before any MongoClient is created
+install_mongo_tracing()
 try:
     if not MONGO_URI:
         raise Exception("MONGO_URI (or MONGODB_URI) not found in .env file.")
@@ -96,30 +130,56 @@ try:
     jd_analysis_collection = mongo_db['jd_analyses']
     hunter_sessions_collection = mongo_db['huntersessions']
     job_results_collection = mongo_db['jobresults']
+    # Content-hash lookups for re-uploaded resumes
+    partial_profiles_collection.create_index([("user_id", 1), ("file_hash", 1)])
+    partial_profiles_collection.create_index([("user_id", 1), ("text_hash", 1)])
     print("✅ MongoDB connected and all collections accessed.")
 except Exception as e:
     print(f"❌ CRITICAL: Failed to connect to MongoDB. Check your connection string. Error: {e}")
     sys.exit(1)
 
 
-# --- HELPER: Clean JSON ---
-def clean_json_response(text):
+# --- HELPER: Resume Dedupe ---
+def find_previous_extraction(user_id, file_hash=None, text_hash=None):
+    """
+    Find this user's most recent validated extraction with the same content hash.
+
+    Matching on file bytes lets us skip text extraction too; matching on the
+    extracted text catches re-exports of the same resume with different bytes.
+    Scoped to the uploading user: another user's extraction is never reused.
+    """
+    if not user_id:
+        return None
+    query = {"user_id": user_id, "status": "validated", "extracted_data": {"$exists": True}}
+    if file_hash:
+        query["file_hash"] = file_hash
+    elif text_hash:
+        query["text_hash"] = text_hash
+    else:
+        return None
     try:
-        match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
-        if match: return match.group(1).strip()
-        match = re.search(r'```\s*(.*?)\s*```', text, re.DOTALL)
-        if match: return match.group(1).strip()
-        start_match = re.search(r'\{', text)
-        end_match = re.search(r'\}', text[::-1]) 
-        if start_match and end_match:
-            start_index = start_match.start()
-            end_index = len(text) - end_match.start()
-            return text[start_index:end_index].strip()
-        print(f"   [ai] ⚠️ Warning: Could not find JSON block. Returning raw text.")
-        return text.strip()
+        return partial_profiles_collection.find_one(query, sort=[("created_at", -1)])
     except Exception as e:
-        print(f"   [ai] Error cleaning JSON: {e}")
-        return text
+        print(f"   [dedupe] ⚠️ Lookup failed (continuing without dedupe): {e}")
+        return None
+
+def find_previous_text(user_id, previous):
+    """
+    Raw text for a file-hash hit, read from the user's profile.
+
+    partial_profiles only keeps the text hash; the text itself lives once, in
+    users.profile.raw_resume_text. It is only reused if it still hashes to the
+    previous extraction (the user may have uploaded a different resume since).
+    """
+    try:
+        user = users_collection.find_one({"clerkId": user_id}, {"profile.raw_resume_text": 1})
+    except Exception as e:
+        print(f"   [dedupe] ⚠️ Text lookup failed (re-extracting): {e}")
+        return None
+    raw_text = ((user or {}).get("profile") or {}).get("raw_resume_text")
+    if raw_text and UserConfigCache.calculate_resume_hash(raw_text) == previous.get("text_hash"):
+        return raw_text
+    return None
 
 # --- LLM HELPER ---
 def call_llm(prompt, task_name="Task"):
@@ -144,23 +204,6 @@ def call_llm_with_retry(prompt, task_name="Task", max_retries=2):
             else:
                 raise e
 
-# --- PARSING FUNCTIONS ---
-def extract_text_from_pdf(file_content):
-    with io.BytesIO(file_content) as f:
-        with pdfplumber.open(f) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-            return text
-
-def extract_text_from_docx(file_content):
-    with io.BytesIO(file_content) as f:
-        doc = docx.Document(f)
-        text = ""
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-        return text
-
 # --- CALLBACK 1: RESUME PROCESSING ---
 def resume_callback(ch, method, properties, body):
     print("\n---------------------------------")
@@ -178,38 +221,71 @@ def resume_callback(ch, method, properties, body):
 
         # 1. Download
         print(f"   [task] Downloading file from: {file_url}")
-        response = requests.get(file_url)
+        response = requests.get(file_url, timeout=30)
         response.raise_for_status()
         file_content = response.content
-        print(f"   [task] File downloaded.")
-
-        # 2. Extract Text
-        raw_text = ""
-        if file_name.endswith('.pdf'):
-            raw_text = extract_text_from_pdf(file_content)
-        elif file_name.endswith('.docx'):
-            raw_text = extract_text_from_docx(file_content)
+        file_hash = hashlib.sha256(file_content).hexdigest()
+        print(f"   [task] File downloaded ({len(file_content)} bytes, sha256={file_hash[:12]}).")
+
+        # 2. Extract Text (skipped if this exact file was processed before)
+        previous = find_previous_extraction(user_id, file_hash=file_hash)
+        raw_text = find_previous_text(user_id, previous) if previous else None
+        if raw_text:
+            print(f"   [dedupe] ✅ Same file bytes seen before, reusing extracted text")
         else:
-            raise Exception(f"Unsupported file type: {file_name}")
+            previous = None
+            # Runs in the extraction process pool (page-parallel, size/page limits)
+            raw_text = extract_text(file_content, file_name)
 
         if not raw_text or len(raw_text) < 50:
             raise Exception("Extracted text is too short or empty.")
         print(f"   [task] Text extracted successfully.")
 
-        # 3. AI Validation (Use Groq)
-        validation_prompt = VERIFICATION_PROMPT.format(document_text=raw_text[:4000])
-        validation_response_text = call_llm_with_retry(validation_prompt, task_name="Resume Validation")
-        validation_json = json.loads(clean_json_response(validation_response_text))
-        
-        print(f"   [ai] Validation complete: {validation_json.get('is_resume')}")
-        if not validation_json.get('is_resume'):
-            raise Exception(f"Document is not a resume. Reason: {validation_json.get('reasons')}")
+        # Same hash as UserConfigCache so downstream caches stay valid on re-upload
+        text_hash = UserConfigCache.calculate_resume_hash(raw_text)
+        if not previous:
+            previous = find_previous_extraction(user_id, text_hash=text_hash)
+
+        fingerprint = None
+        if previous:
+            # Re-upload of a known resume: reuse validation, extraction and fingerprint
+            print(f"   [dedupe] ✅ Reusing extraction from '{previous.get('file_name')}' (text_hash={text_hash[:8]}), skipping LLM calls")
+            classifier_record = previous.get("classifier", {"source": "dedupe"})
+            extracted_data = previous["extracted_data"]
+            fingerprint = previous.get("resume_fingerprint")
+        else:
+            # 3. Validation: local heuristic first, Groq only for ambiguous documents
+            classification = classify_resume(raw_text)
+            classifier_record = {
+                "decision": classification["decision"],
+                "score": classification["score"],
+                "source": "heuristic",
+            }
+
+            if classification["decision"] == "uncertain" or should_audit(classification["decision"]):
+                validation_prompt = VERIFICATION_PROMPT.format(document_text=raw_text[:4000])
+                validation_response_text = call_llm_with_retry(validation_prompt, task_name="Resume Validation")
+                validation_json = extract_json(validation_response_text, expect=dict)
+                log_decision(classification, llm_is_resume=validation_json.get('is_resume'), user_id=user_id)
+                classifier_record["llm_is_resume"] = bool(validation_json.get('is_resume'))
+                if classification["decision"] == "uncertain":
+                    classifier_record["source"] = "llm"
+                is_resume = validation_json.get('is_resume')
+                reasons = validation_json.get('reasons')
+            else:
+                log_decision(classification, user_id=user_id)
+                is_resume = classification["decision"] == "accept"
+                reasons = classification["reasons"]
+
+            print(f"   [ai] Validation complete: {is_resume} (via {classifier_record['source']})")
+            if not is_resume:
+                raise Exception(f"Document is not a resume. Reason: {reasons}")
 
-        # 4. AI Extraction (Use Groq)
-        extraction_prompt = EXTRACTION_PROMPT.format(document_text=raw_text)
-        extraction_response_text = call_llm_with_retry(extraction_prompt, task_name="Structured Extraction")
-        extracted_data = json.loads(clean_json_response(extraction_response_text))
-        print(f"   [ai] Extraction complete! Found name: {extracted_data.get('personal_info', {}).get('full_name')}")
+            # 4. AI Extraction (Use Groq)
+            extraction_prompt = EXTRACTION_PROMPT.format(document_text=raw_text)
+            extraction_response_text = call_llm_with_retry(extraction_prompt, task_name="Structured Extraction")
+            extracted_data = extract_json(extraction_response_text, expect=dict)
+            print(f"   [ai] Extraction complete! Found name: {extracted_data.get('personal_info', {}).get('full_name')}")
 
         # 5. Save to MongoDB
         print(f"   [db] Saving partial profile to MongoDB for user: {user_id}")
@@ -217,10 +293,16 @@ def resume_callback(ch, method, properties, body):
             "user_id": user_id,
             "file_url": file_url,
             "file_name": file_name,
+            "file_hash": file_hash,
+            "text_hash": text_hash,
             "status": "validated", 
+            "classifier": classifier_record,
             "extracted_data": extracted_data,
+            "deduplicated_from": previous.get("file_url") if previous else None,
             "created_at": time.time(),
         }
+        if fingerprint:
+            partial_profile["resume_fingerprint"] = fingerprint
         partial_profiles_collection.update_one(
             {"user_id": user_id, "file_url": file_url},
             {"$set": partial_profile},
@@ -235,30 +317,18 @@ def resume_callback(ch, method, properties, body):
             upsert=True 
         )
 
-        # --- Generate Resume Fingerprint ---
-        print(f"   [ai] Generating resume fingerprint for user: {user_id}")
-        
-        FINGERPRINT_PROMPT = """
-You are a resume summarizer. Create a concise 200-token summary capturing:
-- Seniority level and years of experience
-- Top 5 technical skills
-- 1-2 key projects or achievements
-- Target roles/industries
-
-Resume:
-\"\"\"
-{resume_text}
-\"\"\"
-
-Output format (plain text, no JSON):
-[Seniority] | [X YOE] | [Skill1, Skill2, ...] | [Key achievement] | [Target roles]
-"""
-        
+        # --- Generate Resume Fingerprint (reused on dedupe hit) ---
         try:
-            fingerprint_response = worker_llm.invoke(
-                FINGERPRINT_PROMPT.format(resume_text=raw_text[:8000])
-            )
-            fingerprint = fingerprint_response.content.strip()
+            if not fingerprint:
+                print(f"   [ai] Generating resume fingerprint for user: {user_id}")
+                fingerprint_response = worker_llm.invoke(
+                    FINGERPRINT_PROMPT.format(resume_text=raw_text[:8000])
+                )
+                fingerprint = fingerprint_response.content.strip()
+                partial_profiles_collection.update_one(
+                    {"user_id": user_id, "file_url": file_url},
+                    {"$set": {"resume_fingerprint": fingerprint}}
+                )
             
             # Save to users collection
             users_collection.update_one(
@@ -282,21 +352,44 @@ Output format (plain text, no JSON):
 
 
 # --- HELPER: Update JD Analysis Status ---
-def update_analysis_status(run_id, status, error=None, results=None):
+def update_analysis_status(run_id, status, error=None, results=None, partial=None, section_status=None, start=False):
+    """
+    Update a JD analysis document.
+
+    Args:
+        results: Full analysisResults (final write)
+        partial: Dict of analysisResults fields completed so far (progressive writes)
+        section_status: Dict of per-section flags ("pending"/"preliminary"/"complete")
+        start: First write of a run. Replaces analysisResults and sectionStatus
+            with fresh objects; the gateway creates documents with
+            analysisResults: null, and Mongo rejects a dotted $set into null.
+    """
     print(f"   [db] Updating job {run_id} to status: {status}")
     update_doc = {"$set": {"status": status, "updatedAt": time.time()}}
     if error:
         update_doc["$set"]["errorMessage"] = str(error)
-    if results:
-        update_doc["$set"]["analysisResults"] = results
+    if start:
+        update_doc["$set"]["analysisResults"] = dict(partial or {})
+        update_doc["$set"]["sectionStatus"] = dict(section_status or {})
+    else:
+        if results:
+            update_doc["$set"]["analysisResults"] = results
+        for key, value in (partial or {}).items():
+            update_doc["$set"][f"analysisResults.{key}"] = value
+        for key, value in (section_status or {}).items():
+            update_doc["$set"][f"sectionStatus.{key}"] = value
     jd_analysis_collection.update_one({"runId": run_id}, update_doc)
 
 # --- IMPORTS for LangGraph ---
-from matcher_graph import build_matcher_graph
+from matcher_graph import build_matcher_graph, progressive_update, PROGRESSIVE_SECTIONS, JD_SUBGRAPH
 
 # --- IMPORTS for Job Hunter ---
 from hunt_orchestrator import HuntOrchestrator
 
+def _persist_usage(collection, query):
+    """usage_scope(persist=...) callback saving the run's usage on its document, success or not."""
+    return lambda summary: collection.update_one(query, {"$set": {"usage": summary}})
+
 # --- CALLBACK 2: JD ANALYSIS ---
 def jd_analysis_callback(ch, method, properties, body):
     print("\n---------------------------------")
@@ -327,56 +420,100 @@ def jd_analysis_callback(ch, method, properties, body):
              print("   [warn] No raw resume text found! Using blank string.")
              user_raw_resume = "No raw resume text available."
 
-        # 3. Invoke LangGraph
-        update_analysis_status(run_id, "analyzing_with_graph")
-        print("   [worker] Invoking Matcher Graph...")
+        # 3. Invoke LangGraph (LLM/HTTP usage is accounted to this runId; CASSETTE_MODE=record saves its calls)
+        with start_trace("jd_analysis", run_id, user_id=clerk_id), \
+                usage_scope("jd_analysis", run_id, clerk_id, persist=_persist_usage(jd_analysis_collection, {"runId": run_id})), \
+                profile_run("jd_analysis", run_id, bool(job_data.get("profile"))) as profile, \
+                use_cassette(f"jd_analysis-{run_id}"):
+            update_analysis_status(
+                run_id, "analyzing_with_graph", start=True,
+                section_status={key: "pending" for key in PROGRESSIVE_SECTIONS + ["match_score"]}
+            )
+            print("   [worker] Invoking Matcher Graph...")
         
-        matcher_app = build_matcher_graph()
-        initial_state = {
-            "resume_text": user_raw_resume,
-            "jd_text": jd_text,
-            "parsed_jd": {},
-            "section_scores": {},
-            "keyword_gaps": {},
-            "actionable_todos": {},
-            "bullet_feedback": [],
-            "final_result": {},
-            "errors": []
-        }
+            matcher_app = build_matcher_graph()
+            initial_state = {
+                "resume_text": user_raw_resume,
+                "resume_hash": UserConfigCache.calculate_resume_hash(user_raw_resume),
+                "jd_text": jd_text,
+                # Duplicate JDs (same normalised text) skip the parse stage entirely
+                "parsed_jd": get_jd_parse_cache().get(jd_text) or {},
+                "section_scores": {},
+                "ats_section": {},
+                "keyword_gaps": {},
+                "actionable_todos": {},
+                "bullet_feedback": [],
+                "final_result": {},
+                "errors": []
+            }
         
-        # Invoke the graph
-        final_state = matcher_app.invoke(initial_state)
+            # Stream the graph so each section is persisted as its branch completes
+            final_state = dict(initial_state)
+            if initial_state["parsed_jd"]:
+                partial = progressive_update("parse_jd", {"parsed_jd": initial_state["parsed_jd"]}, user_raw_resume)
+                update_analysis_status(
+                    run_id, "analyzing_with_graph", partial=partial,
+                    section_status={key: "preliminary" if key == "match_score" else "complete" for key in partial}
+                )
+            # subgraphs=True also yields the JD subgraph's per-branch updates (namespace != ())
+            for namespace, chunk in matcher_app.stream(initial_state, stream_mode="updates", subgraphs=True):
+                for node_name, update in chunk.items():
+                    if not update:
+                        continue
+                    if not namespace:
+                        # Top-level updates carry the merged state, including the JD subgraph's output
+                        for key, value in update.items():
+                            if key == "errors":
+                                final_state["errors"] = final_state.get("errors", []) + value
+                            else:
+                                final_state[key] = value
+                        if node_name == JD_SUBGRAPH:
+                            continue  # its sections were written as each branch finished
+
+                    partial = progressive_update(node_name, update, user_raw_resume)
+                    if partial:
+                        flags = {key: "complete" for key in partial}
+                        if "match_score" in partial:
+                            flags["match_score"] = "preliminary"
+                        print(f"   [worker] {node_name} done, writing partial results: {list(partial.keys())}")
+                        update_analysis_status(run_id, "analyzing_with_graph", partial=partial, section_status=flags)
         
-        # Check for errors
-        if final_state.get("errors"):
-            print(f"   [worker] ⚠️ Graph reported errors: {final_state['errors']}")
+            # Check for errors
+            if final_state.get("errors"):
+                print(f"   [worker] ⚠️ Graph reported errors: {final_state['errors']}")
 
-        final_result = final_state.get("final_result", {})
+            final_result = final_state.get("final_result", {})
         
-        print(f"   [ai] Graph execution complete. Match Score: {final_result.get('match_score')}%")
+            print(f"   [ai] Graph execution complete. Match Score: {final_result.get('match_score')}%")
 
-        # 4. Save final results to DB
-        update_analysis_status(run_id, "complete", results=final_result)
+            # 4. Save final results to DB
+            update_analysis_status(
+                run_id, "complete", results=final_result,
+                section_status={key: "complete" for key in PROGRESSIVE_SECTIONS + ["match_score"]}
+            )
         
-        # 5. Generate embedding for semantic search
-        try:
-            from utils.embeddings import generate_jd_embedding
+            # 5. Generate embedding for semantic search
+            try:
+                from utils.embeddings import generate_jd_embedding
             
-            # Fetch the complete document to ensure we have all fields
-            analysis_doc = jd_analysis_collection.find_one({"runId": run_id})
-            if analysis_doc:
-                print(f"   [embedding] Generating embedding for analysis {run_id}...")
-                embedding = generate_jd_embedding(analysis_doc)
-                if embedding:
-                    jd_analysis_collection.update_one(
-                        {"runId": run_id},
-                        {"$set": {"embedding": embedding}}
-                    )
-                    print(f"   [embedding] ✅ Helper embedding saved for JD analysis")
-                else:
-                    print(f"   [embedding] ⚠️ Generated empty embedding")
-        except Exception as e:
-            print(f"   [embedding] ⚠️ Failed to generate embedding: {e}")
+                # Fetch the complete document to ensure we have all fields
+                analysis_doc = jd_analysis_collection.find_one({"runId": run_id})
+                if analysis_doc:
+                    print(f"   [embedding] Generating embedding for analysis {run_id}...")
+                    embedding = generate_jd_embedding(analysis_doc)
+                    if embedding:
+                        jd_analysis_collection.update_one(
+                            {"runId": run_id},
+                            {"$set": {"embedding": embedding}}
+                        )
+                        print(f"   [embedding] ✅ Helper embedding saved for JD analysis")
+                    else:
+                        print(f"   [embedding] ⚠️ Generated empty embedding")
+            except Exception as e:
+                print(f"   [embedding] ⚠️ Failed to generate embedding: {e}")
+
+        if profile is not None:
+            jd_analysis_collection.update_one({"runId": run_id}, {"$set": {"profile": profile.summary()}})
         
         ch.basic_ack(delivery_tag=method.delivery_tag)
         print("✅ [worker] JD ANALYSIS job finished and acknowledged.")
@@ -418,12 +555,20 @@ def job_hunter_callback(ch, method, properties, body):
         # Pass worker_llm for AI query generation
         orchestrator = HuntOrchestrator(rabbitmq_channel=ch, llm_client=worker_llm)
         
-        print(f"   [hunter] Starting tiered job hunt...")
-        hunt_result = orchestrator.execute_hunt(
-            session_id=session_id,
-            user_id=user_id,
-            criteria=criteria
-        )
+        # Users over their daily usage budget get a shallower (cheaper) hunt
+        depth = pipeline_depth(user_id)
+        
+        print(f"   [hunter] Starting tiered job hunt (depth={depth})...")
+        with start_trace("hunt", session_id, user_id=user_id, depth=depth), \
+                usage_scope("hunt", session_id, user_id, persist=_persist_usage(hunter_sessions_collection, {"sessionId": session_id})), \
+                profile_run("hunt", session_id, bool(job_data.get("profile"))) as profile, \
+                use_cassette(f"hunt-{session_id}"):
+            hunt_result = orchestrator.execute_hunt(
+                session_id=session_id,
+                user_id=user_id,
+                criteria=criteria,
+                depth=depth
+            )
         
         # 3. Save valid jobs to JobResult collection
         valid_jobs = hunt_result.get("jobs", [])
@@ -476,7 +621,9 @@ def job_hunter_callback(ch, method, properties, body):
             {"sessionId": session_id},
             {
                 "$set": {
-                    "status": "completed"
+                    "status": "completed",
+                    "depth": depth,
+                    **({"profile": profile.summary()} if profile is not None else {})
                 },
                 "$push": {
                     "logs": f"Hunt completed: {len(valid_jobs)} jobs found using tiers: {', '.join(hunt_result.get('tierUsed', []))}"
@@ -504,31 +651,44 @@ def job_hunter_callback(ch, method, properties, body):
 
 
 # --- RABBITMQ WORKER ---
+def setup_consumers(channel):
+    """Declare the worker's queues and attach the three callbacks (one unacked message per consumer)."""
+    channel.queue_declare(queue=RESUME_QUEUE_NAME, durable=True)
+    channel.queue_declare(queue=JD_QUEUE_NAME, durable=True)
+    channel.queue_declare(queue=JOB_HUNTER_QUEUE_NAME, durable=True)
+    channel.basic_qos(prefetch_count=1)
+    channel.basic_consume(
+        queue=RESUME_QUEUE_NAME, on_message_callback=instrument_consumer(RESUME_QUEUE_NAME, resume_callback)
+    )
+    channel.basic_consume(
+        queue=JD_QUEUE_NAME, on_message_callback=instrument_consumer(JD_QUEUE_NAME, jd_analysis_callback)
+    )
+    channel.basic_consume(
+        queue=JOB_HUNTER_QUEUE_NAME,
+        on_message_callback=instrument_consumer(JOB_HUNTER_QUEUE_NAME, job_hunter_callback)
+    )
+
+
 def main():
     print("🚀 [worker] Starting CareerCLI AI Worker...")
     
     while True:
         try:
-            params = pika.URLParameters(RABBITMQ_URI)
-            params.heartbeat = 600 
-            params.blocked_connection_timeout = 600
-            connection = pika.BlockingConnection(params)
+            # RabbitMQ unless a test swapped the transport (utils/transport.py)
+            connection = get_transport().connect()
             channel = connection.channel()
-            channel.queue_declare(queue=RESUME_QUEUE_NAME, durable=True)
-            channel.queue_declare(queue=JD_QUEUE_NAME, durable=True)
-            channel.queue_declare(queue=JOB_HUNTER_QUEUE_NAME, durable=True)
+            setup_consumers(channel)
             
-            print("✅ Python Worker connected to RabbitMQ.")
+            print(f"✅ Python Worker connected to {get_transport().name}.")
             print(f"[*] Subscribed to queue: {RESUME_QUEUE_NAME}")
             print(f"[*] Subscribed to queue: {JD_QUEUE_NAME}")
             print(f"[*] Subscribed to queue: {JOB_HUNTER_QUEUE_NAME}")
             print("[*] Waiting for messages. To exit press CTRL+C")
 
-            channel.basic_qos(prefetch_count=1) 
-            channel.basic_consume(queue=RESUME_QUEUE_NAME, on_message_callback=resume_callback)
-            channel.basic_consume(queue=JD_QUEUE_NAME, on_message_callback=jd_analysis_callback)
-            channel.basic_consume(queue=JOB_HUNTER_QUEUE_NAME, on_message_callback=job_hunter_callback)
             channel.start_consuming()
+            # Only returns after stop_consuming(): a deliberate shutdown
+            connection.close()
+            return
 
         except pika.exceptions.AMQPConnectionError as e:
             print(f"❌ [worker] RabbitMQ Connection Error: {e}")
@@ -563,10 +723,40 @@ class ChatRequest(BaseModel):
     thread_id: str
     message: str
 
+class ProfileRequest(BaseModel):
+    count: int = 0
+    target: Optional[str] = None
+
 @app.get("/health")
 def health():
     return {"status": "ok", "service": "ai-worker"}
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint (queues, node latency, LLM, caches, quotas, mentor TTFT)."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type, status_code=200 if PROMETHEUS_AVAILABLE else 503)
+
+def _check_admin(token: Optional[str]):
+    """Admin endpoints fail closed: without ADMIN_TOKEN configured, every request is refused."""
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not token or not hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.post("/admin/profile")
+def arm_profiler(request: ProfileRequest, x_admin_token: Optional[str] = Header(None)):
+    """Profile the next `count` hunts / JD analyses, or the run with sessionId/runId `target`."""
+    _check_admin(x_admin_token)
+    return get_profiler().arm(count=request.count, target=request.target)
+
+@app.get("/admin/profile")
+def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """Pending profiling requests and the most recent profiled runs."""
+    _check_admin(x_admin_token)
+    return {**get_profiler().status(), "runs": load_index()}
+
 @app.post("/mentor/stream")
 async def stream_mentor_chat(request: ChatRequest):
     """Stream AI Mentor responses using SSE with token-by-token streaming."""
@@ -577,9 +767,16 @@ async def stream_mentor_chat(request: ChatRequest):
             print(f"[mentor] Processing request for user: {request.user_id}")
             
             # Stream events from mentor (now async)
-            async for event in invoke_mentor_v3(request.user_id, request.thread_id, request.message):
-                yield f"data: {json.dumps(event)}\n\n"
-                await asyncio.sleep(0.01)
+            with start_trace("mentor", request.thread_id, user_id=request.user_id), \
+                    usage_scope("mentor", request.thread_id, request.user_id):
+                started = time.monotonic()
+                first_token = True
+                async for event in invoke_mentor_v3(request.user_id, request.thread_id, request.message):
+                    if first_token and event.get("type") == "token":
+                        observe_ttft(time.monotonic() - started)
+                        first_token = False
+                    yield f"data: {json.dumps(event)}\n\n"
+                    await asyncio.sleep(0.01)
             print(f"[mentor] Stream complete")
             
         except Exception as e:
@@ -665,4 +862,6 @@ if __name__ == "__main__":
         main()
     except KeyboardInterrupt:
         print("\nInterrupted. Shutting down worker.")
+        shutdown_batchers(timeout=10)
+        shutdown_pool()
         sys.exit(0)
\ No newline at end of file
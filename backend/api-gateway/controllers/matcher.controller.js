@@ -71,7 +71,10 @@ export const getAnalysisStatus = async (req, res) => {
 
     res.status(200).json({ 
       status: analysis.status, 
-      error: analysis.errorMessage 
+      error: analysis.errorMessage,
+      // Sections finished so far; the full results come from /results once complete
+      sectionStatus: analysis.sectionStatus || {},
+      partialResults: analysis.status === 'analyzing_with_graph' ? (analysis.analysisResults || {}) : null
     });
 
   } catch (error) {
@@ -83,6 +86,7 @@ export const getAnalysisStatus = async (req, res) => {
 /**
  * @desc Get the final results of a completed analysis
  * @route GET /api/matcher/results/:runId
+ * @query partial=true - also serve an in-progress analysis, flagged partial with sectionStatus
  * @access Private
  */
 // ... imports
@@ -100,7 +104,12 @@ export const getAnalysisResults = async (req, res) => {
       return res.status(404).json({ error: "Analysis not found." });
     }
 
-    if (analysis.status !== 'complete') {
+    // Sections are written progressively, but clients that don't read the
+    // partial flag would take them for a finished result: in-flight analyses
+    // are only served to callers that opt in with ?partial=true
+    const isComplete = analysis.status === 'complete';
+    const wantsPartial = req.query.partial === 'true';
+    if (analysis.status === 'failed' || (!isComplete && !wantsPartial)) {
       return res.status(400).json({ error: "Analysis is not yet complete." });
     }
 
@@ -118,8 +127,10 @@ export const getAnalysisResults = async (req, res) => {
     }
 
     const responseData = {
-        ...analysis.analysisResults,
+        ...(analysis.analysisResults || {}),
         jdText: analysis.jdText || '',
+        partial: !isComplete,
+        sectionStatus: analysis.sectionStatus || {},
         meta: {
             fileName: profile?.file_name || "resume.pdf",
             // Use snake_case created_at if it comes from Python, or camelCase if from Mongoose
@@ -18,7 +18,7 @@ const JdAnalysisSchema = new Schema(
     status: {
       type: String,
       required: true,
-      enum: ['pending', 'validating', 'parsing_jd', 'analyzing', 'complete', 'failed'],
+      enum: ['pending', 'validating', 'parsing_jd', 'analyzing', 'analyzing_with_graph', 'complete', 'failed'],
       default: 'pending',
     },
     jdText: {
@@ -32,9 +32,15 @@ const JdAnalysisSchema = new Schema(
     analysisResults: {
       // This will store the final JSON output from the AI
       // e.g., { matchScore, jdSummary, comparisonMatrix, suggestions }
+      // The worker fills it section by section while status is 'analyzing_with_graph'
       type: Schema.Types.Mixed,
       default: null,
     },
+    sectionStatus: {
+      // Per-section progress written by the worker: { jd_summary: 'complete', match_score: 'preliminary', ... }
+      // Values are 'pending', 'preliminary' or 'complete'
+      type: Schema.Types.Mixed,
+    },
     embedding: {
       // Vector embedding for semantic search (768 dimensions for Gemini)
       type: [Number],